@@ -0,0 +1,100 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# api_key_pool.py
+
+
+import threading
+import time
+from quota import DAILY_QUOTA, QuotaLedger, seconds_until_reset
+from rate_limiter import QuotaExceededError
+
+
+def read_api_keys(file_path: str) -> [str]:
+    '''
+    This function returns the API keys in a text file, one per line, skipping
+    blank lines and lines starting with "#".
+    '''
+    with open(file_path) as key_file:
+        api_keys = [line.strip() for line in key_file]
+
+    return [api_key for api_key in api_keys if api_key != '' and not api_key.startswith('#')]
+
+
+def mask_api_key(api_key: str) -> str:
+    return '...' + api_key[-4:]
+
+
+class ApiKeyPool:
+    '''
+    Spreads requests over several API keys, each with its own daily quota. Every
+    request goes to the key with the most quota left, and is charged to that
+    key's QuotaLedger. A key the API reports as out of quota is taken out of
+    rotation until the quota resets at midnight Pacific Time. It is safe to
+    share between threads.
+    '''
+    def __init__(self, api_keys: [str], daily_quota: int = DAILY_QUOTA) -> None:
+        if not api_keys:
+            raise ValueError('an API key pool needs at least one key')
+
+        self._ledgers = {api_key: QuotaLedger(daily_quota) for api_key in dict.fromkeys(api_keys)}
+        self._exhausted_until = {}
+        self._lock = threading.Lock()
+
+
+    def api_keys(self) -> [str]:
+        return list(self._ledgers)
+
+
+    def take_key(self, url: str) -> str:
+        '''
+        This function picks the available key with the most quota left, charges it
+        for a request to the URL and returns it. It raises QuotaExceededError if
+        every key is out of quota.
+        '''
+        with self._lock:
+            available_keys = self._available_keys()
+
+            if not available_keys:
+                raise QuotaExceededError(url)
+
+            api_key = max(available_keys, key = lambda api_key: self._ledgers[api_key].remaining())
+            self._ledgers[api_key].record(url)
+
+        return api_key
+
+
+    def mark_exhausted(self, api_key: str) -> None:
+        with self._lock:
+            self._exhausted_until[api_key] = time.monotonic() + seconds_until_reset()
+
+
+    def is_exhausted(self) -> bool:
+        with self._lock:
+            return not self._available_keys()
+
+
+    def remaining(self) -> int:
+        '''
+        This function returns the quota units left today across the keys still in
+        rotation, so the pool can stand in for a QuotaLedger when choosing how to
+        spend quota.
+        '''
+        with self._lock:
+            return sum(self._ledgers[api_key].remaining() for api_key in self._available_keys())
+
+
+    def usage(self) -> [(str, int, bool)]:
+        '''
+        This function returns each key with the units it has spent today and
+        whether it is still in rotation.
+        '''
+        with self._lock:
+            available_keys = set(self._available_keys())
+
+            return [(api_key, ledger.spent(), api_key in available_keys) for api_key, ledger in self._ledgers.items()]
+
+
+    def _available_keys(self) -> [str]:
+        now = time.monotonic()
+
+        return [api_key for api_key in self._ledgers if self._exhausted_until.get(api_key, 0) <= now]
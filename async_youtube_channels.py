@@ -0,0 +1,259 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# async_youtube_channels.py
+
+
+import asyncio
+import threading
+import time
+import urllib.error
+import youtube_requests
+from async_youtube_client import AsyncYouTubeClient
+from channel import Channel
+from channel_store import ChannelStore
+from ingestion_queue import IngestionQueue
+from youtube_channels import DEFAULT_TOP_VID_COUNT, YouTubeChannels, parse_channel_url
+from youtube_client import BASE_YOUTUBE_URL
+
+
+class AsyncYouTubeChannels(YouTubeChannels):
+    '''
+    A YouTubeChannels for asyncio programs, whose requests never block the event
+    loop. Channels are kept in the same table and are the same Channel objects,
+    so sorting, lookups and aggregates are the inherited functions, while every
+    function that sends requests is a coroutine.
+
+    resolve_channel_id, add_channel, add_channels and refresh send their
+    requests directly from the event loop, concurrently up to the client's
+    max_in_flight, and cancelling them cancels their requests. The functions
+    that look up most popular videos follow the same steps as YouTubeChannels
+    in a worker thread, but send every request on the event loop and make
+    every change to the list there too, so coroutines never see the list half
+    changed. Cancelling one of them makes every one running on this object stop
+    at its next request.
+
+    A Channel's most popular video is never loaded behind the caller's back, so
+    call load_most_popular_vids before reading it.
+    '''
+    def __init__(self, api_key: object, client: AsyncYouTubeClient = None, resolver: object = None,
+                 store: ChannelStore = None, base_url: str = BASE_YOUTUBE_URL) -> None:
+        super().__init__(api_key, client = client or AsyncYouTubeClient(), resolver = resolver, store = store,
+                         base_url = base_url)
+        self._loop = None
+        self._thread_lock = threading.Lock()
+        self._running_thread_count = 0
+        self._stop_threads = threading.Event()
+
+
+    async def resolve_channel_id(self, channel_url: str) -> str:
+        '''
+        This function returns the ID of the channel a URL refers to, as
+        YouTubeChannels.resolve_channel_id does.
+        '''
+        kind, reference = parse_channel_url(channel_url)
+
+        if kind == 'id':
+            return reference
+        elif kind == 'username':
+            channel_data = await self._request_async(*youtube_requests.channel_by_username_request(reference))
+        elif kind == 'handle':
+            channel_data = await self._request_async(*youtube_requests.channel_by_handle_request(reference))
+        else:
+            search_data = await self._request_async(*youtube_requests.channel_search_request(reference))
+            return search_data['items'][0]['id']['channelId'] if search_data.get('items') else None
+
+        return channel_data['items'][0]['id'] if channel_data.get('items') else None
+
+
+    async def add_channel(self, channel_id: str) -> None:
+        start = self._metrics.start()
+        channel_data = await self._request_async(*youtube_requests.channels_request([channel_id]))
+        self._save_channels([channel_data['items'][0]])
+        self._metrics.observe_stage('add_channel', start)
+
+
+    async def add_channels(self, channel_ids: [str]) -> [str]:
+        '''
+        This function adds many channels at once, requesting channel data in batches
+        of up to 50 ids per call, all at once. It returns the ids that could not be
+        added, as YouTubeChannels.add_channels does.
+        '''
+        start = self._metrics.start()
+        new_ids = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id not in self._channels_by_id]
+        channel_items = await self._fetch_channel_items_async(new_ids)
+
+        self._save_channels([channel_items[channel_id] for channel_id in new_ids if channel_id in channel_items])
+        self._metrics.observe_stage('add_channels', start)
+
+        return [channel_id for channel_id in new_ids if channel_id not in channel_items]
+
+
+    async def refresh(self, stale_after: float) -> [str]:
+        '''
+        This function requests the channel data again for every channel fetched more
+        than stale_after seconds ago, as YouTubeChannels.refresh does.
+        '''
+        fetched_before = time.time() - stale_after
+
+        if self._store != None:
+            stale_ids = self._store.stale_channel_ids(fetched_before)
+        else:
+            stale_ids = [channel_id for channel_id, fetched_at in self._fetched_at.items() if fetched_at < fetched_before]
+
+        channel_items = await self._fetch_channel_items_async(stale_ids)
+        self._save_channels([channel_items[channel_id] for channel_id in stale_ids if channel_id in channel_items])
+
+        return [channel_id for channel_id in stale_ids if channel_id not in channel_items]
+
+
+    async def refresh_all(self) -> [str]:
+        return await self._run_in_thread(super().refresh_all)
+
+
+    async def load_most_popular_vids(self, channels: [Channel]) -> None:
+        await self._run_in_thread(super().load_most_popular_vids, channels)
+
+
+    async def load_top_vids(self, channels: [Channel], count: int = DEFAULT_TOP_VID_COUNT) -> None:
+        await self._run_in_thread(super().load_top_vids, channels, count)
+
+
+    async def ingest(self, queue: IngestionQueue, videos: bool = False, worker_id: str = None,
+                     on_done: callable = None) -> [str]:
+        return await self._run_in_thread(super().ingest, queue, videos, worker_id, on_done)
+
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+    def _most_popular_vid_loader(self) -> callable:
+        # Loading on first access would block the event loop
+        return None
+
+
+    def _save_channels(self, channel_items: [dict]) -> None:
+        self._call_on_loop(super()._save_channels, channel_items)
+
+
+    def _refresh_all_targets(self) -> ([str], dict):
+        return self._call_on_loop(super()._refresh_all_targets)
+
+
+    def _set_top_vid_items(self, channel_vid_items: [(Channel, [dict])]) -> None:
+        self._call_on_loop(super()._set_top_vid_items, channel_vid_items)
+
+
+    def _set_most_popular_vid_items(self, channel_vid_items: [(Channel, dict)], resolved: bool = True) -> None:
+        self._call_on_loop(super()._set_most_popular_vid_items, channel_vid_items, resolved)
+
+
+    def _add_ingested_channels(self, claimed: [(str, dict, dict)]) -> [Channel]:
+        return self._call_on_loop(super()._add_ingested_channels, claimed)
+
+
+    def _set_most_popular_vids_not_found(self, channels: [Channel]) -> None:
+        self._call_on_loop(super()._set_most_popular_vids_not_found, channels)
+
+
+    async def _fetch_channel_items_async(self, channel_ids: [str]) -> dict:
+        channel_items = {}
+
+        for items in await asyncio.gather(*[self._get_channel_items_async(batch)
+                                            for batch in self._split_into_batches(channel_ids)]):
+            channel_items.update(items)
+
+        return channel_items
+
+
+    async def _get_channel_items_async(self, channel_ids: [str]) -> dict:
+        try:
+            channel_data = await self._request_async(*youtube_requests.channels_request(channel_ids))
+        except urllib.error.HTTPError:
+            return {}
+
+        return {item['id']: item for item in channel_data.get('items', [])}
+
+
+    async def _request_async(self, endpoint: str, query_parameters: [(str, str)]) -> dict:
+        start = self._metrics.start()
+        url = youtube_requests.build_url(endpoint, query_parameters, base_url = self._base_url)
+        data = await self._client.get_data(url, self._key_pool)
+        self._metrics.observe_stage('get_data', start)
+
+        return data
+
+
+    async def _run_in_thread(self, function: callable, *arguments: object) -> object:
+        '''
+        This function runs one of the blocking YouTubeChannels functions in a worker
+        thread, where _get_data sends its requests on this event loop.
+        '''
+        self._loop = asyncio.get_running_loop()
+
+        try:
+            return await self._loop.run_in_executor(None, self._call_in_thread, function, arguments)
+
+        except asyncio.CancelledError:
+            # A call cancelled before its thread started never runs at all
+            with self._thread_lock:
+                if self._running_thread_count > 0:
+                    self._stop_threads.set()
+
+            raise
+
+
+    def _call_in_thread(self, function: callable, arguments: tuple) -> object:
+        with self._thread_lock:
+            self._running_thread_count += 1
+
+        try:
+            return function(*arguments)
+
+        finally:
+            with self._thread_lock:
+                self._running_thread_count -= 1
+
+                if self._running_thread_count == 0:
+                    self._stop_threads.clear()
+
+
+    def _call_on_loop(self, function: callable, *arguments: object) -> object:
+        '''
+        This function calls a function that reads or changes the channel list.
+        From a worker thread it is called on the event loop, and the thread waits
+        for it, so the list is only touched from the loop.
+        '''
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            return function(*arguments)
+
+        if self._loop == None:
+            return function(*arguments)
+
+        async def call() -> object:
+            return function(*arguments)
+
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+
+    def _get_data(self, url: str, revalidate: bool = False) -> dict:
+        '''
+        This function sends a request for the inherited blocking functions, which
+        run in a worker thread, on the event loop and waits for the response.
+        '''
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError('blocking requests cannot be sent from the event loop; await the coroutine instead')
+
+        if self._stop_threads.is_set():
+            raise asyncio.CancelledError()
+
+        return asyncio.run_coroutine_threadsafe(self._client.get_data(url, self._key_pool, revalidate),
+                                                self._loop).result()
@@ -0,0 +1,341 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# async_youtube_client.py
+
+
+import asyncio
+import gzip
+import http.client
+import io
+import json
+import ssl
+import urllib.error
+import urllib.parse
+from api_key_pool import ApiKeyPool
+from metrics import Metrics
+from quota import QuotaLedger
+from rate_limiter import (QuotaCircuitBreaker, QuotaExceededError, RetryPolicy, TokenBucket, classify_response,
+                          retry_after)
+from youtube_client import MAX_IDLE_CONNECTIONS, TIMEOUT
+
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+class AsyncYouTubeClient:
+    '''
+    The asyncio counterpart of YouTubeClient. Requests are sent over keep-alive
+    connections opened with asyncio.open_connection, so waiting for the API
+    never blocks the event loop. At most max_in_flight requests are sent at
+    once, and each one, including opening its connection, fails with
+    asyncio.TimeoutError after timeout seconds. A cancelled request closes its
+    connection rather than returning it to the pool.
+
+    Quota, metrics, rate limiting, retries and the quota circuit breaker work
+    as in YouTubeClient, with which the QuotaLedger, Metrics, TokenBucket and
+    QuotaCircuitBreaker may be shared. Responses are not cached. A client must
+    only be used from one event loop.
+    '''
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, timeout: float = TIMEOUT,
+                 ledger: QuotaLedger = None, metrics: Metrics = None, rate_limiter: TokenBucket = None,
+                 retry_policy: RetryPolicy = None, circuit_breaker: QuotaCircuitBreaker = None,
+                 max_idle_connections: int = MAX_IDLE_CONNECTIONS) -> None:
+        self._ledger = ledger or QuotaLedger()
+        self._metrics = metrics or Metrics()
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker or QuotaCircuitBreaker()
+        self._max_in_flight = max_in_flight
+        self._semaphore = None
+        self._timeout = timeout
+        self._max_idle_connections = max_idle_connections
+        self._idle_connections = {}
+        self._ssl_context = None
+
+
+    async def get_data(self, url: str, key_pool: ApiKeyPool = None, revalidate: bool = False) -> dict:
+        '''
+        This function takes a URL and returns a Python dictionary representing the
+        parsed JSON response. If a key pool is given, the URL is sent without a key
+        and each attempt adds the key the pool picks. Responses are not cached, so
+        revalidate is accepted only to match YouTubeClient.get_data. It raises
+        urllib.error.HTTPError if the response status is not 200 after any
+        retries, and QuotaExceededError if the daily quota has run out.
+        '''
+        status, headers, body = await self._request_with_retries(url, key_pool)
+
+        if status != 200:
+            raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ''), headers, io.BytesIO(body))
+
+        start = self._metrics.start()
+        data = json.loads(body)
+        self._metrics.observe_parse(url, start)
+
+        return data
+
+
+    def quota_ledger(self) -> QuotaLedger:
+        return self._ledger
+
+
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+
+    def rate_limiter(self) -> TokenBucket:
+        return self._rate_limiter
+
+
+    def circuit_breaker(self) -> QuotaCircuitBreaker:
+        return self._circuit_breaker
+
+
+    async def request(self, url: str, headers: dict = None) -> (int, dict, bytes):
+        '''
+        This function sends a GET request over a pooled connection, once one of the
+        max_in_flight slots is free, and returns the status, the response headers
+        and the decompressed body.
+        '''
+        parsed_url = urllib.parse.urlsplit(url)
+        host_key = (parsed_url.scheme, parsed_url.netloc)
+        path = urllib.parse.urlunsplit(('', '', parsed_url.path, parsed_url.query, ''))
+        request_headers = {'Host': parsed_url.netloc, 'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+        request_headers.update(headers or {})
+
+        # Before Python 3.10 a semaphore belongs to the event loop current when it
+        # is made, so it is made on the loop that sends the first request
+        if self._semaphore == None:
+            self._semaphore = asyncio.Semaphore(self._max_in_flight)
+
+        async with self._semaphore:
+            start = self._metrics.start()
+            self._ledger.record(url)
+
+            try:
+                status, response_headers, body = await asyncio.wait_for(self._send(host_key, path, request_headers),
+                                                                         self._timeout)
+            except BaseException:
+                self._metrics.observe_request(url, start, None, 0)
+                raise
+
+            self._metrics.observe_request(url, start, status, len(body))
+
+        if response_headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        return status, response_headers, body
+
+
+    async def close(self) -> None:
+        idle_connections, self._idle_connections = self._idle_connections, {}
+
+        for connections in idle_connections.values():
+            for reader, writer in connections:
+                writer.close()
+
+        for connections in idle_connections.values():
+            for reader, writer in connections:
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+
+    async def _request_with_retries(self, url: str, key_pool: ApiKeyPool = None) -> (int, dict, bytes):
+        '''
+        This function sends a request and retries it as
+        YouTubeClient._request_with_retries does, sleeping without blocking the
+        event loop between attempts.
+        '''
+        attempt = 0
+
+        while True:
+            if key_pool != None:
+                api_key = key_pool.take_key(url)
+                request_url = url + ('&' if '?' in url else '?') + urllib.parse.urlencode({'key': api_key})
+            else:
+                self._circuit_breaker.check(url)
+                request_url = url
+
+            if self._rate_limiter != None:
+                await self._acquire_rate_limit()
+
+            try:
+                status, response_headers, body = await self.request(request_url)
+
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, http.client.HTTPException):
+                if attempt + 1 >= self._retry_policy.max_attempts:
+                    raise
+
+                wait = self._retry_policy.delay(attempt)
+
+            else:
+                outcome = classify_response(status, body)
+
+                if outcome == 'ok':
+                    if self._rate_limiter != None:
+                        self._rate_limiter.speed_up()
+
+                    return status, response_headers, body
+
+                if outcome == 'quota' and key_pool != None:
+                    key_pool.mark_exhausted(api_key)
+                    continue
+
+                if outcome == 'quota':
+                    self._circuit_breaker.trip()
+                    raise QuotaExceededError(url, response_headers, body)
+
+                if outcome == 'fail' or attempt + 1 >= self._retry_policy.max_attempts:
+                    return status, response_headers, body
+
+                if outcome == 'throttled' and self._rate_limiter != None:
+                    self._rate_limiter.slow_down()
+
+                wait = self._retry_policy.delay(attempt, retry_after(response_headers))
+
+            self._metrics.observe_retry(url)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+
+    async def _acquire_rate_limit(self) -> None:
+        while True:
+            wait = self._rate_limiter.reserve()
+
+            if wait == 0:
+                return
+
+            await asyncio.sleep(wait)
+
+
+    async def _send(self, host_key: (str, str), path: str, headers: dict) -> (int, dict, bytes):
+        connection, reused = await self._acquire_connection(host_key)
+
+        try:
+            try:
+                status, response_headers, body, will_close = await self._exchange(connection, path, headers)
+
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+                    asyncio.IncompleteReadError):
+                connection[1].close()
+
+                if not reused:
+                    raise
+
+                # The server closed an idle connection; retry once on a fresh one
+                connection, reused = await self._new_connection(host_key), False
+                status, response_headers, body, will_close = await self._exchange(connection, path, headers)
+
+        except BaseException:
+            connection[1].close()
+            raise
+
+        if will_close:
+            connection[1].close()
+        else:
+            self._release_connection(host_key, connection)
+
+        return status, response_headers, body
+
+
+    async def _exchange(self, connection: (asyncio.StreamReader, asyncio.StreamWriter), path: str,
+                        headers: dict) -> (int, dict, bytes, bool):
+        '''
+        This function writes a GET request on the connection and reads the
+        response, returning its status, headers and body and whether the server
+        will close the connection.
+        '''
+        reader, writer = connection
+        writer.write(('GET ' + path + ' HTTP/1.1\r\n' +
+                      ''.join(name + ': ' + value + '\r\n' for name, value in headers.items()) +
+                      '\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+
+        if not status_line:
+            raise http.client.RemoteDisconnected('Remote end closed connection without response')
+
+        try:
+            version, status, *_ = status_line.decode('latin-1').split(None, 2)
+            status = int(status)
+        except ValueError:
+            raise http.client.BadStatusLine(status_line.decode('latin-1', 'replace'))
+
+        response_headers = {}
+
+        while True:
+            line = await reader.readline()
+
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().title()] = value.strip()
+
+        will_close = version == 'HTTP/1.0' or response_headers.get('Connection', '').lower() == 'close'
+
+        if status in (204, 304) or status < 200:
+            body = b''
+        elif response_headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = await self._read_chunked(reader)
+        elif 'Content-Length' in response_headers:
+            body = await reader.readexactly(int(response_headers['Content-Length']))
+        else:
+            body = await reader.read()
+            will_close = True
+
+        return status, response_headers, body, will_close
+
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+
+            if size == 0:
+                break
+
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+        # Skip any trailer headers
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+
+        return b''.join(chunks)
+
+
+    async def _acquire_connection(self, host_key: (str, str)) -> ((asyncio.StreamReader, asyncio.StreamWriter), bool):
+        connections = self._idle_connections.get(host_key)
+
+        while connections:
+            connection = connections.pop()
+
+            if not connection[1].is_closing():
+                return connection, True
+
+        return await self._new_connection(host_key), False
+
+
+    def _release_connection(self, host_key: (str, str), connection: (asyncio.StreamReader, asyncio.StreamWriter)) -> None:
+        connections = self._idle_connections.setdefault(host_key, [])
+
+        if len(connections) < self._max_idle_connections:
+            connections.append(connection)
+        else:
+            connection[1].close()
+
+
+    async def _new_connection(self, host_key: (str, str)) -> (asyncio.StreamReader, asyncio.StreamWriter):
+        scheme, netloc = host_key
+        parsed_netloc = urllib.parse.urlsplit('//' + netloc)
+        if scheme != 'https':
+            return await asyncio.open_connection(parsed_netloc.hostname, parsed_netloc.port or 80)
+
+        if self._ssl_context == None:
+            self._ssl_context = ssl.create_default_context()
+
+        return await asyncio.open_connection(parsed_netloc.hostname, parsed_netloc.port or 443, ssl = self._ssl_context)
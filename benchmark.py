@@ -0,0 +1,239 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# benchmark.py
+
+
+import argparse
+import time
+import tracemalloc
+import urllib.parse
+from mock_youtube_api import MockYouTubeAPI, synthetic_response
+from video_resolvers import SearchResolver
+from youtube_channels import DEFAULT_MAX_WORKERS, YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+SIMULATED_LATENCY = 0.05
+CHANNEL_COUNT = 200
+WORKER_COUNTS = [1, 2, 4, 8, 16, 32]
+# Channels are added to the sorted indexes a batch at a time, so each size takes
+# roughly ten times as long as the one before it; 10 ** 6 takes several minutes
+CHANNEL_COUNTS = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+MAX_HTTP_CHANNEL_COUNT = 10 ** 4
+TOP_K = 10
+SUITES = ['workers', 'http', 'scaling']
+
+
+class SimulatedYouTubeChannels(YouTubeChannels):
+    '''
+    A YouTubeChannels whose requests sleep for a fixed latency and return the
+    synthetic responses of mock_youtube_api instead of going over the network.
+    '''
+    def __init__(self, max_workers: int, latency: float) -> None:
+        super().__init__('benchmark', max_workers = max_workers, resolver = SearchResolver())
+        self._latency = latency
+
+
+    def _get_data(self, url: str, revalidate: bool = False) -> dict:
+        if self._latency > 0:
+            time.sleep(self._latency)
+
+        parsed_url = urllib.parse.urlsplit(url)
+        endpoint = parsed_url.path[parsed_url.path.rfind('/') + 1:]
+
+        return synthetic_response(endpoint, dict(urllib.parse.parse_qsl(parsed_url.query)))
+
+
+class TimedYouTubeClient(YouTubeClient):
+    '''
+    A YouTubeClient that records how many seconds each request takes.
+    '''
+    def __init__(self) -> None:
+        super().__init__()
+        self.latencies = []
+
+
+    def request(self, url: str, headers: dict = None) -> (int, dict, bytes):
+        start = time.perf_counter()
+
+        try:
+            return super().request(url, headers)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def run() -> None:
+    arguments = parse_arguments()
+
+    if arguments.suite in ('all', 'workers'):
+        benchmark_workers()
+
+    if arguments.suite in ('all', 'http'):
+        api = MockYouTubeAPI(latency = arguments.latency, error_rate = arguments.error_rate,
+                             payload_bytes = arguments.payload_bytes).start()
+
+        try:
+            benchmark_http(api, [count for count in arguments.channel_counts if count <= arguments.max_http_channels],
+                           arguments.workers)
+        finally:
+            api.stop()
+
+    if arguments.suite in ('all', 'scaling'):
+        benchmark_scaling(arguments.channel_counts, arguments.workers)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = 'Measure how adding, sorting and summarizing channels scales.')
+    parser.add_argument('--suite', choices = ['all'] + SUITES, default = 'all')
+    parser.add_argument('--channel-counts', type = lambda counts: [int(count) for count in counts.split(',')],
+                        default = CHANNEL_COUNTS, help = 'comma-separated numbers of channels to run with')
+    parser.add_argument('--max-http-channels', type = int, default = MAX_HTTP_CHANNEL_COUNT,
+                        help = 'largest number of channels to add over HTTP (default: %(default)s)')
+    parser.add_argument('--workers', type = int, default = DEFAULT_MAX_WORKERS, help = 'number of concurrent requests')
+    parser.add_argument('--latency', type = float, default = 0.0,
+                        help = 'seconds the mock API waits before each response')
+    parser.add_argument('--error-rate', type = float, default = 0.0, help = 'fraction of mock API requests that fail')
+    parser.add_argument('--payload-bytes', type = int, default = 0, help = 'padding the mock API adds to every item')
+
+    return parser.parse_args()
+
+
+def benchmark_workers() -> None:
+    '''
+    This function measures how adding channels and their most popular videos
+    speeds up with the number of concurrent requests.
+    '''
+    channel_ids = channel_ids_for(CHANNEL_COUNT)
+    baseline = None
+
+    print('Adding', CHANNEL_COUNT, 'channels with', int(SIMULATED_LATENCY * 1000), 'ms of latency per request')
+    print()
+    print(' Workers |  Seconds  |  Speedup  |')
+    print('---------|-----------|-----------|')
+
+    for max_workers in WORKER_COUNTS:
+        channels = SimulatedYouTubeChannels(max_workers, SIMULATED_LATENCY)
+
+        start = time.perf_counter()
+        channels.add_channels(channel_ids)
+        channels.load_most_popular_vids(channels.channel_list())
+        elapsed = time.perf_counter() - start
+
+        if baseline == None:
+            baseline = elapsed
+
+        print(str(max_workers).rjust(8), '|', format(elapsed, '.3f').rjust(9), '|',
+              format(baseline / elapsed, '.2f').rjust(9), '|')
+
+    print()
+
+
+def benchmark_http(api: MockYouTubeAPI, channel_counts: [int], max_workers: int) -> None:
+    '''
+    This function measures ingestion throughput and per-request latency when
+    adding channels and their most popular videos from the mock API over HTTP.
+    '''
+    print('Adding channels from the mock API at', api.base_url(), 'with', max_workers, 'workers')
+    print()
+    print(' Channels | Channels/s | Requests | Failed | p50 ms | p95 ms | p99 ms |')
+    print('----------|------------|----------|--------|--------|--------|--------|')
+
+    for channel_count in channel_counts:
+        client = TimedYouTubeClient()
+        channels = YouTubeChannels('benchmark', max_workers = max_workers, client = client,
+                                   resolver = SearchResolver(), base_url = api.base_url())
+
+        start = time.perf_counter()
+        failed_ids = channels.add_channels(channel_ids_for(channel_count))
+        channels.load_most_popular_vids(channels.channel_list())
+        elapsed = time.perf_counter() - start
+        client.close()
+
+        latencies = sorted(client.latencies)
+
+        print(str(channel_count).rjust(9), '|', format(channel_count / elapsed, '.0f').rjust(10), '|',
+              str(len(latencies)).rjust(8), '|', str(len(failed_ids)).rjust(6), '|',
+              format(percentile(latencies, 0.50) * 1000, '.2f').rjust(6), '|',
+              format(percentile(latencies, 0.95) * 1000, '.2f').rjust(6), '|',
+              format(percentile(latencies, 0.99) * 1000, '.2f').rjust(6), '|')
+
+    print()
+
+
+def benchmark_scaling(channel_counts: [int], max_workers: int) -> None:
+    '''
+    This function measures, at each number of channels, how long adding them,
+    loading their most popular videos, sorting the list, computing aggregates
+    and answering top-k queries take, and how much memory the list holds.
+    Requests are answered in-process, so only the program's own work is timed.
+    '''
+    print('Adding channels in-process with', max_workers, 'workers')
+    print()
+    print(' Channels |  Add s  | Videos s | Sort ms | Aggregate ms | Top-k ms |   MB   | Bytes/channel |')
+    print('----------|---------|----------|---------|--------------|----------|--------|---------------|')
+
+    for channel_count in channel_counts:
+        channel_ids = channel_ids_for(channel_count)
+        channels = SimulatedYouTubeChannels(max_workers, 0)
+
+        add_seconds = timed(channels.add_channels, channel_ids)
+        video_seconds = timed(channels.load_most_popular_vids, channels.channel_list())
+        sort_seconds = (timed(channels.sort_by_name, False) + timed(channels.sort_by_subscribers, True) +
+                        timed(channels.sort_by_views, True)) / 3
+        aggregate_seconds = timed(compute_aggregates, channels)
+        top_k_seconds = timed(query_top_k, channels)
+        del channels
+
+        # Tracing allocations slows the program down, so memory is measured on a
+        # second, untimed run
+        tracemalloc.start()
+        channels = SimulatedYouTubeChannels(max_workers, 0)
+        channels.add_channels(channel_ids)
+        channels.load_most_popular_vids(channels.channel_list())
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del channels
+
+        print(str(channel_count).rjust(9), '|', format(add_seconds, '.3f').rjust(7), '|',
+              format(video_seconds, '.3f').rjust(8), '|', format(sort_seconds * 1000, '.2f').rjust(7), '|',
+              format(aggregate_seconds * 1000, '.3f').rjust(12), '|', format(top_k_seconds * 1000, '.3f').rjust(8), '|',
+              format(memory / 2 ** 20, '.1f').rjust(6), '|', str(memory // channel_count).rjust(13), '|')
+
+    print()
+
+
+def compute_aggregates(channels: YouTubeChannels) -> None:
+    aggregates = channels.aggregates()
+
+    for metric in ('subscribers', 'views', 'like_ratio', 'comments', 'video_views'):
+        aggregates.mean(metric)
+        aggregates.min_value(metric)
+        aggregates.max_value(metric)
+
+
+def query_top_k(channels: YouTubeChannels) -> None:
+    for metric in ('subscribers', 'views', 'video_views'):
+        channels.top_k(metric, TOP_K)
+        channels.bottom_k(metric, TOP_K)
+
+
+def channel_ids_for(channel_count: int) -> [str]:
+    return ['UCchannel-' + str(i) for i in range(channel_count)]
+
+
+def timed(function: callable, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values: [float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+if __name__ == '__main__':
+    run()
@@ -1,85 +1,187 @@
 # Author: Douglas Hong
-# Version: 12/23/2020
+# Version: 10/18/2026
 # channel.py
 
 
+from channel_table import ChannelTable, decode_date
+
+
+_shared_table = ChannelTable()
+
+
 class Channel:
-    def __init__(self, channel_data: dict, most_popular_vid_data: dict, channel_id: str) -> None:
-        channel_description = channel_data['items'][0]['snippet']
-        channel_stats = channel_data['items'][0]['statistics']
-
-        most_popular_vid_description = most_popular_vid_data['items'][0]['snippet']
-        most_popular_vid_stats = most_popular_vid_data['items'][0]['statistics']
-        
-        self._channel_id = channel_id
-        self._name = channel_description['title']
-        self._creation_date = channel_description['publishedAt'][:10]
-        self._subscriber_count = int(channel_stats['subscriberCount'])
-        self._view_count = int(channel_stats['viewCount'])
-        self._video_count = int(channel_stats['videoCount'])
-
-        self._most_popular_vid_title = most_popular_vid_description['title']
-        self._most_popular_vid_date = most_popular_vid_description['publishedAt'][:10]
-        self._most_popular_vid_views = int(most_popular_vid_stats['viewCount'])
-        self._most_popular_vid_likes = int(most_popular_vid_stats['likeCount'])
-        self._most_popular_vid_dislikes = int(most_popular_vid_stats['dislikeCount'])
-        self._most_popular_vid_comments = int(most_popular_vid_stats['commentCount'])  
+    '''
+    The statistics of one YouTube channel and its most popular video, read from
+    one row of a ChannelTable. Channels built without a table share a module-wide
+    one. The row is released when the Channel is garbage collected.
+
+    The most popular video data may be left out and loaded later, either by
+    passing it to set_most_popular_vid_data or, the first time one of the
+    most_popular_vid_* functions is called, by calling most_popular_vid_loader
+    with [self]. A channel whose video was looked up and not found is not
+    looked up again until its channel data is set again. The channel's view
+    count and the video's views when the video was last looked up are kept
+    apart from its data, by set_resolution_baseline.
+
+    A channel can also keep the ids of its most viewed videos and the
+    distribution of their statistics, set by set_top_vids_data.
+    '''
+    __slots__ = ('_table', '_row', '_most_popular_vid_loader')
+
+
+    def __init__(self, channel_data: dict, most_popular_vid_data: dict, channel_id: str,
+                 most_popular_vid_loader: callable = None, table: ChannelTable = None) -> None:
+        self._table = table if table != None else _shared_table
+        self._row = self._table.add_row(channel_id)
+        self._most_popular_vid_loader = most_popular_vid_loader
+
+        self.set_channel_data(channel_data)
+
+        if most_popular_vid_data != None:
+            self.set_most_popular_vid_data(most_popular_vid_data)
+
+
+    def __del__(self) -> None:
+        # _row is unset if __init__ failed before a row was added
+        if hasattr(self, '_row'):
+            self._table.release_row(self._row)
+
+
+    def set_channel_data(self, channel_data: dict) -> None:
+        self._table.set_channel_item(self._row, channel_data['items'][0])
+
+
+    def set_most_popular_vid_data(self, most_popular_vid_data: dict) -> None:
+        self._table.set_most_popular_vid_item(self._row, most_popular_vid_data['items'][0])
+
+
+    def set_most_popular_vid_not_found(self) -> None:
+        self._table.set_most_popular_vid_not_found(self._row)
+
+
+    def set_resolution_baseline(self, view_count: int, vid_views: int) -> None:
+        self._table.set_resolution_baseline(self._row, view_count, vid_views)
+
+
+    def set_top_vids_data(self, top_vids_data: dict) -> None:
+        self._table.set_top_vid_items(self._row, top_vids_data['items'])
+
+
+    def has_most_popular_vid(self) -> bool:
+        return self._table.get('has_most_popular_vid', self._row) == 1
+
+
+    def most_popular_vid_not_found(self) -> bool:
+        return self._table.get('has_most_popular_vid', self._row) == -1
+
+
+    def has_top_vids(self) -> bool:
+        return self._table.get('top_vid_count', self._row) > 0
+
+
+    def resolution_baseline(self) -> (int, int):
+        return self._table.get('resolved_view_count', self._row), self._table.get('resolved_vid_views', self._row)
 
 
     def channel_id(self) -> str:
-        return self._channel_id
+        return self._table.get('channel_id', self._row)
 
 
     def name(self) -> str:
-        return self._name
+        return self._table.get('name', self._row)
 
 
     def creation_date(self) -> str:
-        return self._creation_date
+        return decode_date(self._table.get('creation_date', self._row))
 
 
     def subscriber_count(self) -> int:
-        return self._subscriber_count
+        return self._table.get('subscriber_count', self._row)
 
 
     def view_count(self) -> int:
-        return self._view_count
+        return self._table.get('view_count', self._row)
 
 
     def video_count(self) -> int:
-        return self._video_count
+        return self._table.get('video_count', self._row)
 
 
     def average_views_per_video(self) -> int:
-        return int(self._view_count / self._video_count)
+        # Channels without videos are added too, now that adding one needs no video
+        if self.video_count() == 0:
+            return 0
+
+        return int(self.view_count() / self.video_count())
+
+
+    def most_popular_vid_id(self) -> str:
+        return self._get_most_popular_vid('most_popular_vid_id')
 
 
     def most_popular_vid_title(self) -> str:
-        return self._most_popular_vid_title
+        return self._get_most_popular_vid('most_popular_vid_title')
 
 
     def most_popular_vid_date(self) -> str:
-        return self._most_popular_vid_date
+        return decode_date(self._get_most_popular_vid('most_popular_vid_date'))
 
 
     def most_popular_vid_views(self) -> int:
-        return self._most_popular_vid_views
+        return self._get_most_popular_vid('most_popular_vid_views')
 
 
     def most_popular_vid_likes(self) -> int:
-        return self._most_popular_vid_likes
+        return self._get_most_popular_vid('most_popular_vid_likes')
 
 
     def most_popular_vid_dislikes(self) -> int:
-        return self._most_popular_vid_dislikes
+        return self._get_most_popular_vid('most_popular_vid_dislikes')
 
 
     def most_popular_vid_likes_ratio(self) -> float:
-        total_likes = self._most_popular_vid_likes + self._most_popular_vid_dislikes
-        return round((self._most_popular_vid_likes / total_likes) * 100, 2)
+        likes = self.most_popular_vid_likes()
+        total_likes = likes + self.most_popular_vid_dislikes()
+
+        if total_likes == 0:
+            return 0.0
+
+        return round((likes / total_likes) * 100, 2)
 
 
     def most_popular_vid_comments(self) -> int:
-        return self._most_popular_vid_comments
+        return self._get_most_popular_vid('most_popular_vid_comments')
+
+
+    def top_vid_ids(self) -> [str]:
+        return self._get_top_vids('top_vid_ids').split(',')
+
+
+    def top_vids_median_views(self) -> float:
+        return self._get_top_vids('top_vids_median_views')
+
+
+    def top_vids_like_ratio_spread(self) -> float:
+        return round(self._get_top_vids('top_vids_like_ratio_spread'), 2)
+
+
+    def top_vids_comments_per_view(self) -> float:
+        return self._get_top_vids('top_vids_comments_per_view')
+
+
+    def _get_top_vids(self, column: str) -> object:
+        if not self.has_top_vids():
+            raise LookupError('the most viewed videos of ' + self.name() + ' have not been loaded')
+
+        return self._table.get(column, self._row)
+
+
+    def _get_most_popular_vid(self, column: str) -> object:
+        if not self.has_most_popular_vid():
+            if self._most_popular_vid_loader != None and not self.most_popular_vid_not_found():
+                self._most_popular_vid_loader([self])
+
+            if not self.has_most_popular_vid():
+                raise LookupError('the most popular video of ' + self.name() + ' could not be loaded')
 
-        
+        return self._table.get(column, self._row)
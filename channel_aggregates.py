@@ -0,0 +1,58 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# channel_aggregates.py
+
+
+from sorted_index import SortedIndex
+
+
+class ChannelAggregates:
+    '''
+    Whole-list statistics for each metric of a channel list. Counts, totals,
+    means and extremes are all read in O(1) time from the metrics' sorted
+    indexes, which keep them up to date on every add, delete and refresh.
+    Functions that need at least one channel return None when there is none.
+    '''
+    def __init__(self, sorted_indexes: {str: SortedIndex}) -> None:
+        self._sorted_indexes = sorted_indexes
+
+
+    def count(self, metric: str) -> int:
+        return len(self._sorted_indexes[metric])
+
+
+    def total(self, metric: str) -> object:
+        return self._sorted_indexes[metric].total()
+
+
+    def mean(self, metric: str) -> float:
+        count = self.count(metric)
+
+        if count == 0:
+            return None
+
+        return self.total(metric) / count
+
+
+    def min_value(self, metric: str) -> object:
+        return self._value(self._sorted_indexes[metric].min_entry())
+
+
+    def max_value(self, metric: str) -> object:
+        return self._value(self._sorted_indexes[metric].max_entry())
+
+
+    def argmin(self, metric: str) -> str:
+        return self._channel_id(self._sorted_indexes[metric].min_entry())
+
+
+    def argmax(self, metric: str) -> str:
+        return self._channel_id(self._sorted_indexes[metric].max_entry())
+
+
+    def _value(self, entry: (object, str)) -> object:
+        return entry[0] if entry != None else None
+
+
+    def _channel_id(self, entry: (object, str)) -> str:
+        return entry[1] if entry != None else None
@@ -0,0 +1,93 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# channel_list_renderer.py
+
+
+import sys
+from typing import TextIO
+from youtube_channels import YouTubeChannels
+
+
+PAGE_SIZE = 50
+
+# Column headers, whose lengths are the widths of the columns
+NUMBER_HEADER = ' No. '
+NAME_HEADER = '          Name          '
+SUBSCRIBERS_HEADER = '  Subscribers  '
+VIEWS_HEADER = '  Total Views  '
+
+
+class ChannelListRenderer:
+    '''
+    Draws one page of a channel list as a table. The whole table is built as one
+    string and written at once, and the column widths are worked out once per
+    draw rather than per row. Values too long for their column are cut short.
+    A page is not drawn again if neither it nor the list has changed since the
+    last draw.
+    '''
+    def __init__(self, page_size: int = PAGE_SIZE) -> None:
+        self.page_size = page_size
+        self._last_drawn = None
+
+
+    def draw(self, channels: YouTubeChannels, first_row: int = 0, output: TextIO = None) -> bool:
+        '''
+        This function writes the page of the list starting at first_row (counting
+        from 0) to output, standard output by default, unless that page was the
+        last one drawn and the list has not changed since. It returns whether the
+        page was drawn.
+        '''
+        page = (id(channels), channels.version(), first_row, self.page_size)
+
+        if page == self._last_drawn:
+            return False
+
+        output = output or sys.stdout
+        output.write(self.render(channels, first_row))
+        output.flush()
+        self._last_drawn = page
+
+        return True
+
+
+    def render(self, channels: YouTubeChannels, first_row: int = 0) -> str:
+        channel_count = channels.channel_count()
+        page_channels = channels.channel_window(first_row, self.page_size)
+        last_row = first_row + len(page_channels)
+
+        number_width = max(len(NUMBER_HEADER), len(str(last_row)))
+        name_width = len(NAME_HEADER)
+        subscribers_width = len(SUBSCRIBERS_HEADER)
+        views_width = len(VIEWS_HEADER)
+        table_width = number_width + name_width + subscribers_width + views_width + 4
+
+        lines = ['', 'Your current channel list: ']
+
+        if channel_count > len(page_channels):
+            lines[-1] += '(rows ' + str(first_row + 1) + '-' + str(last_row) + ' of ' + str(channel_count) + ')'
+
+        lines.append('')
+        lines.append(NUMBER_HEADER.ljust(number_width) + '|' + NAME_HEADER + '|' + SUBSCRIBERS_HEADER + '|' +
+                     VIEWS_HEADER + '|')
+        lines.append('-' * number_width + '|' + '-' * name_width + '|' + '-' * subscribers_width + '|' +
+                     '-' * views_width + '|')
+
+        for row, channel in enumerate(page_channels, first_row + 1):
+            lines.append(str(row).ljust(number_width) + '|' + _fit(channel.name(), name_width) + '|' +
+                         _fit(str(channel.subscriber_count()), subscribers_width) + '|' +
+                         _fit(str(channel.view_count()), views_width) + '|')
+
+        lines.append('-' * table_width)
+
+        return '\n'.join(lines) + '\n'
+
+
+def _fit(text: str, width: int) -> str:
+    '''
+    This function pads text with spaces to the given width, or cuts it short
+    with "..." if it is longer.
+    '''
+    if len(text) > width:
+        return text[:width - 3] + '...'
+
+    return text.ljust(width)
@@ -0,0 +1,129 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# channel_store.py
+
+
+import json
+import os
+import sqlite3
+import threading
+
+
+CHANNEL_STORE_PATH = os.path.join(os.path.expanduser('~'), '.youtube_stats.db')
+
+
+class ChannelStore:
+    '''
+    Persists the channel list in a SQLite database in WAL mode. Each row keeps
+    the raw channels.list and videos.list items of one channel, its position in
+    the list, the time its channel data was last fetched, its resolution
+    baseline and the videos.list items of its top videos, if they were looked
+    up, so the list can be rebuilt at startup without any requests.
+    '''
+    def __init__(self, path: str = CHANNEL_STORE_PATH) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread = False)
+
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode = WAL')
+            self._connection.execute('PRAGMA synchronous = NORMAL')
+            self._connection.execute('''CREATE TABLE IF NOT EXISTS channels (
+                                            channel_id TEXT PRIMARY KEY,
+                                            position INTEGER NOT NULL,
+                                            channel_item TEXT NOT NULL,
+                                            most_popular_vid_item TEXT,
+                                            fetched_at REAL NOT NULL,
+                                            resolved_view_count INTEGER,
+                                            resolved_vid_views INTEGER,
+                                            top_vid_items TEXT)''')
+
+            # Databases written by earlier versions lack the later columns
+            columns = [row[1] for row in self._connection.execute('PRAGMA table_info(channels)')]
+
+            for column, column_type in (('resolved_view_count', 'INTEGER'), ('resolved_vid_views', 'INTEGER'),
+                                        ('top_vid_items', 'TEXT')):
+                if column not in columns:
+                    self._connection.execute('ALTER TABLE channels ADD COLUMN ' + column + ' ' + column_type)
+
+            self._connection.execute('CREATE INDEX IF NOT EXISTS channels_position ON channels (position)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS channels_fetched_at ON channels (fetched_at)')
+
+
+    def load(self) -> [(dict, dict, float, (int, int), [dict])]:
+        '''
+        This function returns the channel item, most popular video item (or None),
+        fetch time, resolution baseline (or None) and top video items (or None) of
+        every stored channel, in list order.
+        '''
+        with self._lock:
+            rows = self._connection.execute('''SELECT channel_item, most_popular_vid_item, fetched_at,
+                                                      resolved_view_count, resolved_vid_views, top_vid_items
+                                               FROM channels ORDER BY position''').fetchall()
+
+        return [(json.loads(channel_item), json.loads(vid_item) if vid_item != None else None, fetched_at,
+                 (view_count, vid_views) if view_count != None else None,
+                 json.loads(top_vid_items) if top_vid_items != None else None)
+                for channel_item, vid_item, fetched_at, view_count, vid_views, top_vid_items in rows]
+
+
+    def save_channels(self, channel_items: [dict], fetched_at: float) -> None:
+        '''
+        This function inserts the given channels at the end of the list, or updates
+        their channel data if they are already stored.
+        '''
+        with self._lock, self._connection:
+            position = self._connection.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM channels').fetchone()[0]
+
+            self._connection.executemany('''INSERT INTO channels (channel_id, position, channel_item, fetched_at)
+                                            VALUES (?, ?, ?, ?)
+                                            ON CONFLICT (channel_id) DO UPDATE SET
+                                                channel_item = excluded.channel_item,
+                                                fetched_at = excluded.fetched_at''',
+                                         [(item['id'], position + i, json.dumps(item), fetched_at)
+                                          for i, item in enumerate(channel_items)])
+
+
+    def save_most_popular_vids(self, vid_items_by_channel_id: dict, baselines_by_channel_id: dict = None) -> None:
+        '''
+        This function saves the most popular video items of the given channels,
+        and the (view count, video views) resolution baselines of those given one.
+        '''
+        with self._lock, self._connection:
+            self._connection.executemany('UPDATE channels SET most_popular_vid_item = ? WHERE channel_id = ?',
+                                         [(json.dumps(vid_item), channel_id)
+                                          for channel_id, vid_item in vid_items_by_channel_id.items()])
+            self._connection.executemany('''UPDATE channels SET resolved_view_count = ?, resolved_vid_views = ?
+                                            WHERE channel_id = ?''',
+                                         [(view_count, vid_views, channel_id) for channel_id, (view_count, vid_views)
+                                          in (baselines_by_channel_id or {}).items()])
+
+
+    def save_top_vids(self, top_vid_items_by_channel_id: dict) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany('UPDATE channels SET top_vid_items = ? WHERE channel_id = ?',
+                                         [(json.dumps(vid_items), channel_id)
+                                          for channel_id, vid_items in top_vid_items_by_channel_id.items()])
+
+
+    def save_order(self, channel_ids: [str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany('UPDATE channels SET position = ? WHERE channel_id = ?',
+                                         [(position, channel_id) for position, channel_id in enumerate(channel_ids)])
+
+
+    def delete_channel(self, channel_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM channels WHERE channel_id = ?', (channel_id,))
+
+
+    def stale_channel_ids(self, fetched_before: float) -> [str]:
+        with self._lock:
+            rows = self._connection.execute('''SELECT channel_id FROM channels WHERE fetched_at < ?
+                                               ORDER BY position''', (fetched_before,)).fetchall()
+
+        return [channel_id for (channel_id,) in rows]
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
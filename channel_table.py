@@ -0,0 +1,188 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# channel_table.py
+
+
+import datetime
+import statistics
+import sys
+from array import array
+
+
+# The typed numeric columns of a ChannelTable and their array type codes
+NUMERIC_COLUMNS = {
+    'creation_date': 'l',
+    'subscriber_count': 'q',
+    'view_count': 'q',
+    'video_count': 'q',
+    # 1 if the most popular video data is set, -1 if it was looked up and not
+    # found, which holds until the channel data is set again, or 0
+    'has_most_popular_vid': 'b',
+    'most_popular_vid_date': 'l',
+    'most_popular_vid_views': 'q',
+    'most_popular_vid_likes': 'q',
+    'most_popular_vid_dislikes': 'q',
+    'most_popular_vid_comments': 'q',
+    # The channel's view count and its most popular video's views when that
+    # video was last looked up, which refreshing the data leaves unchanged
+    'resolved_view_count': 'q',
+    'resolved_vid_views': 'q',
+    'top_vid_count': 'l',
+    'top_vids_median_views': 'd',
+    'top_vids_like_ratio_spread': 'd',
+    'top_vids_comments_per_view': 'd',
+}
+STRING_COLUMNS = ['channel_id', 'name', 'most_popular_vid_id', 'most_popular_vid_title', 'top_vid_ids']
+
+# The fields of channels.list and videos.list items that set_channel_item and
+# set_most_popular_vid_item read, by part
+CHANNEL_ITEM_FIELDS = {
+    'snippet': ['title', 'publishedAt'],
+    'statistics': ['subscriberCount', 'viewCount', 'videoCount'],
+}
+VIDEO_ITEM_FIELDS = {
+    'snippet': ['title', 'publishedAt'],
+    'statistics': ['viewCount', 'likeCount', 'dislikeCount', 'commentCount'],
+}
+
+
+def encode_date(date: str) -> int:
+    '''
+    This function turns the date part of an ISO 8601 timestamp into the number
+    of days since 0001-01-01.
+    '''
+    return datetime.date.fromisoformat(date[:10]).toordinal()
+
+
+def decode_date(day: int) -> str:
+    return datetime.date.fromordinal(day).isoformat()
+
+
+class ChannelTable:
+    '''
+    Stores the statistics of many channels column by column: numbers in typed
+    array buffers, dates as day numbers and strings interned. Each channel is one
+    row. Rows are handed out by add_row and reused after release_row, so the
+    columns only grow to the largest number of channels held at once.
+    '''
+    def __init__(self) -> None:
+        self._numeric_columns = {column: array(type_code) for column, type_code in NUMERIC_COLUMNS.items()}
+        self._string_columns = {column: [] for column in STRING_COLUMNS}
+        self._free_rows = []
+
+
+    def __len__(self) -> int:
+        return len(self._string_columns['channel_id']) - len(self._free_rows)
+
+
+    def add_row(self, channel_id: str) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = len(self._string_columns['channel_id'])
+
+            for column in self._numeric_columns.values():
+                column.append(0)
+
+            for column in self._string_columns.values():
+                column.append('')
+
+        self._numeric_columns['has_most_popular_vid'][row] = 0
+        self._numeric_columns['top_vid_count'][row] = 0
+        self._string_columns['channel_id'][row] = sys.intern(channel_id)
+
+        return row
+
+
+    def release_row(self, row: int) -> None:
+        for column in self._string_columns.values():
+            column[row] = ''
+
+        self._free_rows.append(row)
+
+
+    def set_channel_item(self, row: int, channel_item: dict) -> None:
+        channel_description = channel_item['snippet']
+        channel_stats = channel_item['statistics']
+        numeric_columns = self._numeric_columns
+
+        self._string_columns['name'][row] = sys.intern(channel_description['title'])
+        numeric_columns['creation_date'][row] = encode_date(channel_description['publishedAt'])
+        # The subscriber count is left out when the channel hides it
+        numeric_columns['subscriber_count'][row] = int(channel_stats.get('subscriberCount', 0))
+        numeric_columns['view_count'][row] = int(channel_stats['viewCount'])
+        numeric_columns['video_count'][row] = int(channel_stats['videoCount'])
+
+        # Newer channel data may have videos a failed lookup did not find
+        if numeric_columns['has_most_popular_vid'][row] == -1:
+            numeric_columns['has_most_popular_vid'][row] = 0
+
+
+    def set_most_popular_vid_item(self, row: int, vid_item: dict) -> None:
+        vid_description = vid_item['snippet']
+        vid_stats = vid_item['statistics']
+        numeric_columns = self._numeric_columns
+
+        self._string_columns['most_popular_vid_id'][row] = vid_item.get('id', '')
+        self._string_columns['most_popular_vid_title'][row] = sys.intern(vid_description['title'])
+        numeric_columns['most_popular_vid_date'][row] = encode_date(vid_description['publishedAt'])
+        numeric_columns['most_popular_vid_views'][row] = int(vid_stats['viewCount'])
+
+        # Like, dislike and comment counts are left out when hidden or disabled
+        numeric_columns['most_popular_vid_likes'][row] = int(vid_stats.get('likeCount', 0))
+        numeric_columns['most_popular_vid_dislikes'][row] = int(vid_stats.get('dislikeCount', 0))
+        numeric_columns['most_popular_vid_comments'][row] = int(vid_stats.get('commentCount', 0))
+        numeric_columns['has_most_popular_vid'][row] = 1
+
+
+    def set_resolution_baseline(self, row: int, view_count: int, vid_views: int) -> None:
+        self._numeric_columns['resolved_view_count'][row] = view_count
+        self._numeric_columns['resolved_vid_views'][row] = vid_views
+
+
+    def set_most_popular_vid_not_found(self, row: int) -> None:
+        if self._numeric_columns['has_most_popular_vid'][row] == 0:
+            self._numeric_columns['has_most_popular_vid'][row] = -1
+
+
+    def set_top_vid_items(self, row: int, vid_items: [dict]) -> None:
+        '''
+        This function keeps the ids of a channel's most viewed videos and the
+        distribution of their statistics: the median view count, the standard
+        deviation of their like ratios and the comments per view across all of
+        them. Each statistic is gathered into a typed array first and summarized
+        a column at a time.
+        '''
+        vid_stats = [vid_item['statistics'] for vid_item in vid_items]
+        views = array('q', [int(stats['viewCount']) for stats in vid_stats])
+        likes = array('q', [int(stats.get('likeCount', 0)) for stats in vid_stats])
+        dislikes = array('q', [int(stats.get('dislikeCount', 0)) for stats in vid_stats])
+        comments = array('q', [int(stats.get('commentCount', 0)) for stats in vid_stats])
+        like_ratios = array('d', [like_count / (like_count + dislike_count) * 100
+                                  for like_count, dislike_count in zip(likes, dislikes)
+                                  if like_count + dislike_count > 0])
+        total_views = sum(views)
+        numeric_columns = self._numeric_columns
+
+        self._string_columns['top_vid_ids'][row] = ','.join(vid_item['id'] for vid_item in vid_items)
+        numeric_columns['top_vids_median_views'][row] = statistics.median(views) if views else 0.0
+        numeric_columns['top_vids_like_ratio_spread'][row] = statistics.pstdev(like_ratios) if like_ratios else 0.0
+        numeric_columns['top_vids_comments_per_view'][row] = sum(comments) / total_views if total_views > 0 else 0.0
+        numeric_columns['top_vid_count'][row] = len(vid_items)
+
+
+    def get(self, column: str, row: int) -> object:
+        if column in self._numeric_columns:
+            return self._numeric_columns[column][row]
+
+        return self._string_columns[column][row]
+
+
+    def column(self, column: str) -> memoryview:
+        '''
+        This function returns a read-only view of a numeric column's buffer,
+        including released rows. It can be wrapped without copying, for example
+        by numpy.frombuffer, to run vectorized operations over the column.
+        '''
+        return memoryview(self._numeric_columns[column]).toreadonly()
+
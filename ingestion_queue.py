@@ -0,0 +1,273 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# ingestion_queue.py
+
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+
+INGESTION_QUEUE_PATH = os.path.join(os.path.expanduser('~'), '.youtube_stats_ingestion.db')
+
+# The states a channel id moves through, in order, until it is done or failed
+PENDING = 'pending'
+CHANNEL_FETCHED = 'channel_fetched'
+VIDEO_RESOLVED = 'video_resolved'
+DONE = 'done'
+FAILED = 'failed'
+STATES = [PENDING, CHANNEL_FETCHED, VIDEO_RESOLVED, DONE, FAILED]
+
+# How long a worker may hold claimed channels before other workers may take them,
+# so the channels of a crashed worker are picked up again
+LEASE_SECONDS = 5 * 60
+
+# Times a channel's request may fail before the channel is marked as failed
+MAX_INGESTION_ATTEMPTS = 3
+
+
+def default_worker_id() -> str:
+    return socket.gethostname() + ':' + str(os.getpid())
+
+
+class IngestionQueue:
+    '''
+    A durable work queue of channel ids to add, journaled in a SQLite database
+    in WAL mode. Each id moves from pending to channel_fetched to video_resolved
+    to done, or to failed, and the data requested at each step is saved with
+    it, so an interrupted import resumes where it stopped without requesting
+    anything twice.
+
+    Workers claim batches of ids in one state, work on them, and move them to
+    the next state or release them. A claim expires after LEASE_SECONDS unless
+    it is renewed, so several threads or processes can drain the same queue and
+    the ids held by a worker that crashed are eventually taken by another. Only
+    the worker holding an id can move or release it, so a worker whose claim
+    expired cannot undo the work of the one that took the id over.
+    '''
+    def __init__(self, path: str = INGESTION_QUEUE_PATH, lease_seconds: float = LEASE_SECONDS) -> None:
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout = 30, check_same_thread = False, isolation_level = None)
+
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode = WAL')
+            self._connection.execute('PRAGMA synchronous = NORMAL')
+            self._connection.execute('''CREATE TABLE IF NOT EXISTS ingestion (
+                                            channel_id TEXT PRIMARY KEY,
+                                            position INTEGER NOT NULL,
+                                            source TEXT,
+                                            state TEXT NOT NULL,
+                                            channel_item TEXT,
+                                            vid_item TEXT,
+                                            attempts INTEGER NOT NULL DEFAULT 0,
+                                            error TEXT,
+                                            claimed_by TEXT,
+                                            claimed_until REAL NOT NULL DEFAULT 0,
+                                            updated_at REAL NOT NULL)''')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS ingestion_state ON ingestion (state, position)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS ingestion_source ON ingestion (source)')
+
+
+    def enqueue(self, channel_ids: [str], sources: [str] = None) -> None:
+        '''
+        This function adds channel ids to the end of the queue as pending, skipping
+        ids already in it. Each id can be given the source it was resolved from,
+        such as a channel URL, so known_sources can skip resolving it again.
+        '''
+        sources = sources or [None] * len(channel_ids)
+        now = time.time()
+
+        with self._transaction() as connection:
+            position = connection.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM ingestion').fetchone()[0]
+
+            connection.executemany('''INSERT INTO ingestion (channel_id, position, source, state, updated_at)
+                                      VALUES (?, ?, ?, ?, ?)
+                                      ON CONFLICT (channel_id) DO NOTHING''',
+                                   [(channel_id, position + i, source, PENDING, now)
+                                    for i, (channel_id, source) in enumerate(zip(channel_ids, sources))])
+
+
+    def known_sources(self, sources: [str]) -> set:
+        with self._lock:
+            return {source for source in sources
+                    if self._connection.execute('SELECT 1 FROM ingestion WHERE source = ?', (source,)).fetchone()}
+
+
+    def claim(self, state: str, count: int, worker_id: str) -> [(str, dict, dict)]:
+        '''
+        This function claims up to count ids in the given state that no other
+        worker holds, in queue order, and returns each id with its journaled
+        channel item and video item, which are None until they are requested.
+        '''
+        now = time.time()
+
+        with self._transaction() as connection:
+            rows = connection.execute('''SELECT channel_id, channel_item, vid_item FROM ingestion
+                                         WHERE state = ? AND claimed_until <= ?
+                                         ORDER BY position LIMIT ?''', (state, now, count)).fetchall()
+
+            connection.executemany('UPDATE ingestion SET claimed_by = ?, claimed_until = ? WHERE channel_id = ?',
+                                   [(worker_id, now + self._lease_seconds, channel_id) for channel_id, _, _ in rows])
+
+        return [(channel_id, _loads(channel_item), _loads(vid_item)) for channel_id, channel_item, vid_item in rows]
+
+
+    def renew(self, channel_ids: [str], worker_id: str) -> [str]:
+        '''
+        This function extends the claim on the given ids by another lease, for a
+        worker whose step may outlast its first one. It returns the ids the worker
+        still holds, leaving out those whose claim expired and were taken by
+        another worker.
+        '''
+        now = time.time()
+
+        with self._transaction() as connection:
+            return [channel_id for channel_id in channel_ids
+                    if connection.execute('''UPDATE ingestion SET claimed_until = ?
+                                             WHERE channel_id = ? AND claimed_by = ?''',
+                                          (now + self._lease_seconds, channel_id, worker_id)).rowcount > 0]
+
+
+    def mark_channels_fetched(self, channel_items: [dict], worker_id: str) -> None:
+        self._advance(CHANNEL_FETCHED, 'channel_item', [(item['id'], json.dumps(item)) for item in channel_items],
+                      worker_id)
+
+
+    def mark_videos_resolved(self, vid_items_by_channel_id: dict, worker_id: str) -> None:
+        '''
+        This function journals the most popular video item of each channel, or
+        None for channels without one, and moves the channels to video_resolved.
+        '''
+        self._advance(VIDEO_RESOLVED, 'vid_item',
+                      [(channel_id, json.dumps(vid_item) if vid_item != None else None)
+                       for channel_id, vid_item in vid_items_by_channel_id.items()], worker_id)
+
+
+    def mark_done(self, channel_ids: [str], worker_id: str) -> None:
+        with self._transaction() as connection:
+            connection.executemany('''UPDATE ingestion SET state = ?, claimed_by = NULL, claimed_until = 0,
+                                          updated_at = ? WHERE channel_id = ? AND claimed_by = ?''',
+                                   [(DONE, time.time(), channel_id, worker_id) for channel_id in channel_ids])
+
+
+    def mark_failed(self, channel_ids: [str], error: str, worker_id: str) -> None:
+        with self._transaction() as connection:
+            connection.executemany('''UPDATE ingestion SET state = ?, error = ?, claimed_by = NULL, claimed_until = 0,
+                                          updated_at = ? WHERE channel_id = ? AND claimed_by = ?''',
+                                   [(FAILED, error, time.time(), channel_id, worker_id) for channel_id in channel_ids])
+
+
+    def release(self, channel_ids: [str], worker_id: str, failed_attempt: bool = False) -> [str]:
+        '''
+        This function gives up the worker's claim on the given ids, leaving them in
+        their state for any worker to take again. If failed_attempt is True, their
+        requests failed, and ids that have failed MAX_INGESTION_ATTEMPTS times are
+        marked as failed instead. It returns the ids marked as failed.
+        '''
+        now = time.time()
+
+        with self._transaction() as connection:
+            released_ids = [channel_id for channel_id in channel_ids
+                            if connection.execute('''UPDATE ingestion SET attempts = attempts + ?, claimed_by = NULL,
+                                                         claimed_until = 0, updated_at = ?
+                                                     WHERE channel_id = ? AND claimed_by = ?''',
+                                                  (int(failed_attempt), now, channel_id, worker_id)).rowcount > 0]
+
+            failed_ids = [channel_id for channel_id in released_ids
+                          if connection.execute('SELECT attempts FROM ingestion WHERE channel_id = ?',
+                                                (channel_id,)).fetchone()[0] >= MAX_INGESTION_ATTEMPTS]
+
+            connection.executemany('UPDATE ingestion SET state = ?, error = ? WHERE channel_id = ?',
+                                   [(FAILED, 'request failed', channel_id) for channel_id in failed_ids])
+
+        return failed_ids
+
+
+    def retry_failed(self) -> int:
+        '''
+        This function moves every failed id back to pending and returns how many
+        there were.
+        '''
+        with self._transaction() as connection:
+            return connection.execute('''UPDATE ingestion SET state = ?, attempts = 0, error = NULL,
+                                             channel_item = NULL, vid_item = NULL, updated_at = ?
+                                         WHERE state = ?''', (PENDING, time.time(), FAILED)).rowcount
+
+
+    def counts(self) -> dict:
+        '''
+        This function returns the number of ids in each state.
+        '''
+        with self._lock:
+            rows = self._connection.execute('SELECT state, COUNT(*) FROM ingestion GROUP BY state').fetchall()
+
+        counts = {state: 0 for state in STATES}
+        counts.update(rows)
+
+        return counts
+
+
+    def unfinished_count(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM ingestion WHERE state NOT IN (?, ?)',
+                                            (DONE, FAILED)).fetchone()[0]
+
+
+    def failed(self) -> [(str, str)]:
+        with self._lock:
+            return self._connection.execute('''SELECT channel_id, error FROM ingestion WHERE state = ?
+                                               ORDER BY position''', (FAILED,)).fetchall()
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+    def _advance(self, state: str, column: str, values: [(str, str)], worker_id: str) -> None:
+        with self._transaction() as connection:
+            connection.executemany('UPDATE ingestion SET state = ?, ' + column + ''' = ?, claimed_by = NULL,
+                                          claimed_until = 0, updated_at = ? WHERE channel_id = ? AND claimed_by = ?''',
+                                   [(state, value, time.time(), channel_id, worker_id) for channel_id, value in values])
+
+
+    def _transaction(self) -> '_Transaction':
+        return _Transaction(self._connection, self._lock)
+
+
+class _Transaction:
+    '''
+    Holds the queue's lock and an immediate transaction, which takes the
+    database's write lock up front, so a claim by another process cannot slip
+    in between reading rows and claiming them.
+    '''
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._connection = connection
+        self._lock = lock
+
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+
+        try:
+            self._connection.execute('BEGIN IMMEDIATE')
+        except BaseException:
+            self._lock.release()
+            raise
+
+        return self._connection
+
+
+    def __exit__(self, exception_type: type, exception: BaseException, traceback: object) -> None:
+        try:
+            self._connection.execute('COMMIT' if exception_type == None else 'ROLLBACK')
+        finally:
+            self._lock.release()
+
+
+def _loads(value: str) -> dict:
+    return json.loads(value) if value != None else None
@@ -0,0 +1,242 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# metrics.py
+
+
+import bisect
+import json
+import threading
+import time
+from quota import endpoint_of, quota_cost
+
+
+# Upper bounds, in seconds, of the histogram buckets durations are counted in
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    '''
+    Counts observed values in fixed buckets and keeps their count and sum.
+    '''
+    def __init__(self, buckets: (float, ...) = DURATION_BUCKETS) -> None:
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+
+
+    def count(self) -> int:
+        return self._count
+
+
+    def sum(self) -> float:
+        return self._sum
+
+
+    def cumulative_counts(self) -> [(float, int)]:
+        '''
+        This function returns each bucket's upper bound, ending with infinity, and
+        the number of values at or below it.
+        '''
+        cumulative_counts = []
+        running_count = 0
+
+        for bound, count in zip(self._buckets + (float('inf'),), self._counts):
+            running_count += count
+            cumulative_counts.append((bound, running_count))
+
+        return cumulative_counts
+
+
+    def quantile(self, fraction: float) -> float:
+        '''
+        This function returns the upper bound of the bucket holding the given
+        quantile, or None if nothing has been observed.
+        '''
+        if self._count == 0:
+            return None
+
+        for bound, running_count in self.cumulative_counts():
+            if running_count >= fraction * self._count:
+                return bound
+
+
+class Metrics:
+    '''
+    Collects, per API endpoint, the number of requests, errors, retries, response
+    bytes and quota units and histograms of request and JSON parse times, and
+    histograms of the time spent in named stages such as building channels or
+    rendering. It is safe to share between threads.
+
+    When disabled, start() returns None and every observe function returns
+    immediately, so instrumented code only pays for two function calls:
+
+        start = metrics.start()
+        ...
+        metrics.observe_stage('build_channels', start)
+    '''
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+            self._stages = {}
+
+
+    def start(self) -> float:
+        return time.perf_counter() if self.enabled else None
+
+
+    def observe_request(self, url: str, start: float, status: int, response_bytes: int) -> None:
+        '''
+        This function records a request for the URL sent at start, which got a
+        response with the given status and body size, or no response if status is
+        None.
+        '''
+        if start == None:
+            return
+
+        seconds = time.perf_counter() - start
+        endpoint = endpoint_of(url)
+
+        with self._lock:
+            endpoint_metrics = self._endpoint_metrics(endpoint)
+            endpoint_metrics['requests'] += 1
+            endpoint_metrics['quota_units'] += quota_cost(endpoint)
+            endpoint_metrics['response_bytes'] += response_bytes
+            endpoint_metrics['latency'].observe(seconds)
+
+            if status == None or status >= 400:
+                endpoint_metrics['errors'] += 1
+
+
+    def observe_parse(self, url: str, start: float) -> None:
+        if start == None:
+            return
+
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            self._endpoint_metrics(endpoint_of(url))['parse'].observe(seconds)
+
+
+    def observe_retry(self, url: str) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._endpoint_metrics(endpoint_of(url))['retries'] += 1
+
+
+    def observe_cache_hit(self, url: str) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._endpoint_metrics(endpoint_of(url))['cache_hits'] += 1
+
+
+    def observe_stage(self, stage: str, start: float) -> None:
+        if start == None:
+            return
+
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            if stage not in self._stages:
+                self._stages[stage] = Histogram()
+
+            self._stages[stage].observe(seconds)
+
+
+    def snapshot(self) -> dict:
+        '''
+        This function returns a copy of every metric as plain dictionaries, with
+        each histogram summarized by its count, sum and cumulative bucket counts.
+        '''
+        with self._lock:
+            endpoints = {endpoint: {name: _summarize(value) if isinstance(value, Histogram) else value
+                                    for name, value in endpoint_metrics.items()}
+                         for endpoint, endpoint_metrics in self._endpoints.items()}
+            stages = {stage: _summarize(histogram) for stage, histogram in self._stages.items()}
+
+        return {'endpoints': endpoints, 'stages': stages}
+
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent = 2)
+
+
+    def to_prometheus(self) -> str:
+        '''
+        This function returns every metric in the Prometheus text exposition format.
+        '''
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            stages = sorted(self._stages.items())
+            lines = []
+
+            for name, key, help_text in (('youtube_requests_total', 'requests', 'Requests sent to the YouTube API'),
+                                         ('youtube_request_errors_total', 'errors', 'Requests that failed'),
+                                         ('youtube_request_retries_total', 'retries', 'Failed requests sent again'),
+                                         ('youtube_cache_hits_total', 'cache_hits', 'Responses served from the cache'),
+                                         ('youtube_response_bytes_total', 'response_bytes',
+                                          'Bytes received in response bodies'),
+                                         ('youtube_quota_units_total', 'quota_units', 'Quota units spent')):
+                lines.append('# HELP ' + name + ' ' + help_text)
+                lines.append('# TYPE ' + name + ' counter')
+
+                for endpoint, endpoint_metrics in endpoints:
+                    lines.append(name + '{endpoint="' + endpoint + '"} ' + str(endpoint_metrics[key]))
+
+            for name, key, help_text in (('youtube_request_duration_seconds', 'latency',
+                                          'Time from sending a request to reading its response'),
+                                         ('youtube_parse_duration_seconds', 'parse', 'Time spent parsing JSON')):
+                _append_histogram(lines, name, help_text,
+                                  [('endpoint', endpoint, endpoint_metrics[key]) for endpoint, endpoint_metrics in endpoints])
+
+            _append_histogram(lines, 'youtube_stage_duration_seconds', 'Time spent in each stage of the program',
+                              [('stage', stage, histogram) for stage, histogram in stages])
+
+        return '\n'.join(lines) + '\n'
+
+
+    def _endpoint_metrics(self, endpoint: str) -> dict:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = {'requests': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0, 'response_bytes': 0,
+                                         'quota_units': 0, 'latency': Histogram(), 'parse': Histogram()}
+
+        return self._endpoints[endpoint]
+
+
+def _summarize(histogram: Histogram) -> dict:
+    return {'count': histogram.count(), 'sum': histogram.sum(),
+            'p50': _bound(histogram.quantile(0.5)), 'p95': _bound(histogram.quantile(0.95)),
+            'buckets': [[_bound(bound), count] for bound, count in histogram.cumulative_counts()]}
+
+
+def _bound(bound: float) -> object:
+    return '+Inf' if bound == float('inf') else bound
+
+
+def _append_histogram(lines: [str], name: str, help_text: str, labeled_histograms: [(str, str, Histogram)]) -> None:
+    lines.append('# HELP ' + name + ' ' + help_text)
+    lines.append('# TYPE ' + name + ' histogram')
+
+    for label, value, histogram in labeled_histograms:
+        for bound, count in histogram.cumulative_counts():
+            lines.append(name + '_bucket{' + label + '="' + value + '",le="' + str(_bound(bound)) + '"} ' +
+                         str(count))
+
+        lines.append(name + '_sum{' + label + '="' + value + '"} ' + repr(histogram.sum()))
+        lines.append(name + '_count{' + label + '="' + value + '"} ' + str(histogram.count()))
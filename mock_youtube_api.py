@@ -0,0 +1,292 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# mock_youtube_api.py
+
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import http.server
+import json
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+from quota import quota_cost
+
+
+ENDPOINTS = {'channels', 'search', 'playlistItems', 'videos'}
+DEFAULT_ERROR_STATUS = 503
+ERROR_REASONS = {400: 'badRequest', 403: 'quotaExceeded', 404: 'notFound', 429: 'rateLimitExceeded',
+                 500: 'backendError', 503: 'backendError'}
+MAX_VIDEOS_PER_CHANNEL = 200
+FIRST_DATE = datetime.date(2005, 4, 23).toordinal()
+DATE_RANGE = 6000
+
+
+# The functions below make up synthetic but stable API data: every value is
+# derived from a hash of the channel or video id, so the same id always gets
+# the same statistics. Channel ids that do not start with "UC" do not exist.
+# A channel's videos are "<channel id>.<n>", most viewed first.
+
+
+def synthetic_response(endpoint: str, query: dict, payload_bytes: int = 0) -> dict:
+    '''
+    This function returns the response body the YouTube API would send for a
+    request to the endpoint with the given query parameters. Each item carries
+    payload_bytes of padding in its snippet description.
+    '''
+    if endpoint == 'channels':
+        if 'forUsername' in query or 'forHandle' in query:
+            return {'items': [{'id': 'UC' + query.get('forUsername', query.get('forHandle', '')).lstrip('@')}]}
+
+        return {'items': [_channel_item(channel_id, payload_bytes) for channel_id in query['id'].split(',')
+                          if channel_id.startswith('UC')]}
+
+    if endpoint == 'search':
+        if 'channelId' in query:
+            video_ids = _video_ids(query['channelId'], int(query.get('maxResults', 5)))
+
+            return {'items': [{'id': {'kind': 'youtube#video', 'videoId': video_id}} for video_id in video_ids]}
+
+        return {'items': [{'id': {'kind': 'youtube#channel', 'channelId': 'UC' + query['q']}}]}
+
+    if endpoint == 'playlistItems':
+        video_ids = _video_ids('UC' + query['playlistId'][2:])
+        start = int(query.get('pageToken', 0))
+        end = start + int(query.get('maxResults', 5))
+        response = {'items': [{'contentDetails': {'videoId': video_id}} for video_id in video_ids[start:end]]}
+
+        if end < len(video_ids):
+            response['nextPageToken'] = str(end)
+
+        return response
+
+    if endpoint == 'videos':
+        return {'items': [_video_item(video_id, payload_bytes) for video_id in query['id'].split(',')
+                          if video_id.startswith('UC') and '.' in video_id]}
+
+    raise KeyError(endpoint)
+
+
+def _channel_item(channel_id: str, payload_bytes: int) -> dict:
+    seed = _hash(channel_id)
+
+    return {'id': channel_id,
+            'snippet': {'title': 'Channel ' + channel_id[2:], 'description': 'x' * payload_bytes,
+                        'publishedAt': _date(seed)},
+            'statistics': {'subscriberCount': str(seed % 100000000), 'viewCount': str(seed % 10000000000),
+                           'videoCount': str(_video_count(channel_id))}}
+
+
+def _video_item(video_id: str, payload_bytes: int) -> dict:
+    seed = _hash(video_id)
+
+    return {'id': video_id,
+            'snippet': {'title': 'Video ' + video_id[2:], 'description': 'x' * payload_bytes,
+                        'publishedAt': _date(seed)},
+            'statistics': {'viewCount': str(_video_views(video_id)), 'likeCount': str(seed % 100000),
+                           'dislikeCount': str(seed % 1000), 'commentCount': str(seed % 10000)}}
+
+
+def _video_ids(channel_id: str, max_count: int = MAX_VIDEOS_PER_CHANNEL) -> [str]:
+    return [channel_id + '.' + str(i) for i in range(min(_video_count(channel_id), max_count))]
+
+
+def _video_count(channel_id: str) -> int:
+    return _hash(channel_id) % MAX_VIDEOS_PER_CHANNEL + 1
+
+
+def _video_views(video_id: str) -> int:
+    channel_id, number = video_id.rsplit('.', 1)
+    return _hash(channel_id) % 100000000 // (int(number) + 1)
+
+
+def _date(seed: int) -> str:
+    return datetime.date.fromordinal(FIRST_DATE + seed % DATE_RANGE).isoformat() + 'T00:00:00Z'
+
+
+def _hash(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class MockYouTubeAPI:
+    '''
+    A local stand-in for the YouTube Data API. It serves synthetic /channels,
+    /search, /videos and /playlistItems responses over HTTP/1.1 with keep-alive,
+    gzip and ETags, from a thread per connection. Every request waits latency
+    seconds, and a fraction error_rate of requests fail with error_status and a
+    Google-style error body, with a Retry-After header if retry_after is set.
+    If key_quota is set, each API key may spend that many quota units before
+    its requests fail with quotaExceeded. Point a client at it with base_url().
+    '''
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = DEFAULT_ERROR_STATUS, payload_bytes: int = 0, seed: int = None,
+                 retry_after: int = None, key_quota: int = None) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.key_quota = key_quota
+        self._units_by_key = {}
+        self.payload_bytes = payload_bytes
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_counts = {}
+        self._server = http.server.ThreadingHTTPServer((host, port), _MockRequestHandler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self._thread = None
+
+
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://' + host + ':' + str(port) + '/youtube/v3'
+
+
+    def start(self) -> 'MockYouTubeAPI':
+        self._thread = threading.Thread(target = self._server.serve_forever, daemon = True)
+        self._thread.start()
+
+        return self
+
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+        if self._thread != None:
+            self._thread.join()
+
+
+    def request_counts(self) -> dict:
+        with self._lock:
+            return dict(self._request_counts)
+
+
+    def units_by_key(self) -> dict:
+        with self._lock:
+            return dict(self._units_by_key)
+
+
+    def respond(self, path: str) -> (int, dict):
+        '''
+        This function returns the status and body of the response to a GET of the
+        given path and query string.
+        '''
+        parsed_path = urllib.parse.urlsplit(path)
+        endpoint = parsed_path.path.rstrip('/').rsplit('/', 1)[-1]
+        query = dict(urllib.parse.parse_qsl(parsed_path.query))
+
+        with self._lock:
+            self._request_counts[endpoint] = self._request_counts.get(endpoint, 0) + 1
+            is_error = self._random.random() < self.error_rate
+            api_key = query.get('key')
+            units = self._units_by_key.get(api_key, 0)
+            is_out_of_quota = self.key_quota != None and units + quota_cost(endpoint) > self.key_quota
+
+            if not is_out_of_quota:
+                self._units_by_key[api_key] = units + quota_cost(endpoint)
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if endpoint not in ENDPOINTS:
+            return 404, _error_body(404)
+
+        if is_out_of_quota:
+            return 403, _error_body(403)
+
+        if is_error:
+            return self.error_status, _error_body(self.error_status)
+
+        # A missing or malformed query parameter makes a bad request
+        try:
+            return 200, synthetic_response(endpoint, query, self.payload_bytes)
+        except (KeyError, ValueError):
+            return 400, _error_body(400)
+
+
+def _error_body(status: int) -> dict:
+    reason = ERROR_REASONS.get(status, 'backendError')
+    message = http.server.BaseHTTPRequestHandler.responses.get(status, ('Error',))[0]
+
+    return {'error': {'code': status, 'message': message,
+                      'errors': [{'domain': 'youtube.quota' if reason == 'quotaExceeded' else 'global',
+                                  'reason': reason, 'message': message}]}}
+
+
+class _MockRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # The headers and body are written separately, so without this the body
+    # waits for the client to acknowledge the headers
+    disable_nagle_algorithm = True
+
+
+    def do_GET(self) -> None:
+        status, data = self.server.api.respond(self.path)
+        body = json.dumps(data).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+
+        if status >= 400 and self.server.api.retry_after != None:
+            self.send_header('Retry-After', str(self.server.api.retry_after))
+
+        if status == 200:
+            self.send_header('ETag', etag)
+
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel = 1)
+            self.send_header('Content-Encoding', 'gzip')
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        # Clients that time out or cancel a request hang up before the body is sent
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description = 'Serve synthetic YouTube Data API responses locally.')
+    parser.add_argument('--port', type = int, default = 8080)
+    parser.add_argument('--latency', type = float, default = 0.0, help = 'seconds to wait before each response')
+    parser.add_argument('--error-rate', type = float, default = 0.0, help = 'fraction of requests that fail')
+    parser.add_argument('--error-status', type = int, default = DEFAULT_ERROR_STATUS)
+    parser.add_argument('--key-quota', type = int, help = 'quota units each API key may spend')
+    parser.add_argument('--retry-after', type = int, help = 'Retry-After seconds to send with errors')
+    parser.add_argument('--payload-bytes', type = int, default = 0, help = 'padding added to every item')
+    arguments = parser.parse_args()
+
+    api = MockYouTubeAPI(port = arguments.port, latency = arguments.latency, error_rate = arguments.error_rate,
+                         error_status = arguments.error_status, payload_bytes = arguments.payload_bytes,
+                         retry_after = arguments.retry_after, key_quota = arguments.key_quota)
+
+    print('Serving on', api.base_url(), '- set YOUTUBE_API_BASE_URL to this to use it')
+    api.serve_forever()
+
+
+if __name__ == '__main__':
+    run()
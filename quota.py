@@ -0,0 +1,98 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# quota.py
+
+
+import datetime
+import threading
+import urllib.parse
+
+
+DAILY_QUOTA = 10000
+
+# Units each API endpoint costs per request
+QUOTA_COSTS = {
+    'channels': 1,
+    'playlistItems': 1,
+    'search': 100,
+    'videos': 1,
+}
+
+# The daily quota resets at midnight Pacific Time; daylight saving time is ignored
+QUOTA_TIMEZONE = datetime.timezone(datetime.timedelta(hours = -8))
+
+
+def endpoint_of(url: str) -> str:
+    path = urllib.parse.urlsplit(url).path
+    return path[path.rfind('/') + 1:]
+
+
+def quota_cost(endpoint: str) -> int:
+    return QUOTA_COSTS.get(endpoint, 1)
+
+
+def seconds_until_reset() -> float:
+    '''
+    This function returns the number of seconds until the daily quota resets at
+    the next midnight Pacific Time.
+    '''
+    now = datetime.datetime.now(QUOTA_TIMEZONE)
+    next_midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days = 1), datetime.time(),
+                                              QUOTA_TIMEZONE)
+
+    return (next_midnight - now).total_seconds()
+
+
+class QuotaLedger:
+    '''
+    Keeps track of the quota units spent today, per endpoint. It is safe to
+    share between threads.
+    '''
+    def __init__(self, daily_quota: int = DAILY_QUOTA) -> None:
+        self._daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._day = self._today()
+        self._units_by_endpoint = {}
+
+
+    def record(self, url: str) -> int:
+        '''
+        This function charges the quota cost of one request to the given URL and
+        returns the number of units charged.
+        '''
+        endpoint = endpoint_of(url)
+        units = quota_cost(endpoint)
+
+        with self._lock:
+            self._roll_over()
+            self._units_by_endpoint[endpoint] = self._units_by_endpoint.get(endpoint, 0) + units
+
+        return units
+
+
+    def spent(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return sum(self._units_by_endpoint.values())
+
+
+    def spent_by_endpoint(self) -> dict:
+        with self._lock:
+            self._roll_over()
+            return dict(self._units_by_endpoint)
+
+
+    def remaining(self) -> int:
+        return max(self._daily_quota - self.spent(), 0)
+
+
+    def _roll_over(self) -> None:
+        today = self._today()
+
+        if today != self._day:
+            self._day = today
+            self._units_by_endpoint = {}
+
+
+    def _today(self) -> datetime.date:
+        return datetime.datetime.now(QUOTA_TIMEZONE).date()
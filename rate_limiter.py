@@ -0,0 +1,230 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# rate_limiter.py
+
+
+import email.utils
+import io
+import json
+import random
+import threading
+import time
+import urllib.error
+from quota import seconds_until_reset
+
+
+DEFAULT_RATE = 20.0
+DEFAULT_BURST = 40
+MIN_RATE = 1.0
+
+# After a request is throttled the rate is halved, then it climbs back by this
+# many requests per second after every successful request
+RATE_INCREASE = 0.1
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 32.0
+MAX_RETRY_AFTER = 5 * 60
+
+# How an API error response is handled, by status and error reason
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+THROTTLED_STATUSES = {429}
+THROTTLED_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+
+
+class QuotaExceededError(urllib.error.HTTPError):
+    '''
+    Raised when the daily quota has run out, either by the API or, without a
+    request, while a QuotaCircuitBreaker is open. It is an HTTPError, so code
+    that handles failed requests handles it too.
+    '''
+    def __init__(self, url: str, headers: dict = None, body: bytes = b'') -> None:
+        super().__init__(url, 403, 'quotaExceeded', headers or {}, io.BytesIO(body))
+
+
+class TokenBucket:
+    '''
+    Limits requests to rate per second on average while allowing bursts of up to
+    burst requests. The rate adapts: slow_down halves it when the API throttles a
+    request, and speed_up raises it back toward the configured rate as requests
+    succeed. It is safe to share between threads.
+    '''
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> None:
+        self._max_rate = rate
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def rate(self) -> float:
+        return self._rate
+
+
+    def acquire(self) -> None:
+        '''
+        This function takes one token, waiting until one is available.
+        '''
+        while True:
+            wait = self.reserve()
+
+            if wait == 0:
+                return
+
+            time.sleep(wait)
+
+
+    def reserve(self) -> float:
+        '''
+        This function takes one token if one is available and returns 0, or else
+        returns the number of seconds until one will be, without waiting, so
+        callers that must not block, such as coroutines, can wait their own way.
+        '''
+        with self._lock:
+            self._refill()
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self._rate
+
+
+    def slow_down(self) -> None:
+        with self._lock:
+            self._refill()
+            self._rate = max(self._rate / 2, MIN_RATE)
+            self._tokens = min(self._tokens, 0.0)
+
+
+    def speed_up(self) -> None:
+        if self._rate < self._max_rate:
+            with self._lock:
+                self._refill()
+                self._rate = min(self._rate + RATE_INCREASE, self._max_rate)
+
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated_at) * self._rate, self._burst)
+        self._updated_at = now
+
+
+class QuotaCircuitBreaker:
+    '''
+    Opens when the API reports that the daily quota is exhausted and stays open
+    until the quota resets, so no more requests are wasted on it in the meantime.
+    '''
+    def __init__(self) -> None:
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+
+    def check(self, url: str) -> None:
+        '''
+        This function raises QuotaExceededError if the breaker is open.
+        '''
+        if self.is_open():
+            raise QuotaExceededError(url)
+
+
+    def trip(self, seconds: float = None) -> None:
+        '''
+        This function opens the breaker for the given number of seconds, or until
+        the daily quota resets.
+        '''
+        with self._lock:
+            self._open_until = max(self._open_until,
+                                   time.monotonic() + (seconds if seconds != None else seconds_until_reset()))
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._open_until = 0.0
+
+
+class RetryPolicy:
+    '''
+    Decides how long to wait before each retry of a failed request: a random
+    delay of up to BASE_DELAY * 2 ** attempt seconds, capped at max_delay, or
+    the server's Retry-After if it asks for longer.
+    '''
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, base_delay: float = BASE_DELAY,
+                 max_delay: float = MAX_DELAY) -> None:
+        self.max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._random = random.Random()
+
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        backoff = self._random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt))
+
+        if retry_after != None:
+            return max(backoff, min(retry_after, MAX_RETRY_AFTER))
+
+        return backoff
+
+
+def classify_response(status: int, body: bytes) -> str:
+    '''
+    This function sorts a response into 'ok', 'retry' for transient server
+    errors, 'throttled' for rate limiting, 'quota' when the daily quota has run
+    out, or 'fail' for errors that retrying will not fix.
+    '''
+    if status < 400:
+        return 'ok'
+
+    if status in THROTTLED_STATUSES:
+        return 'throttled'
+
+    if status in RETRYABLE_STATUSES:
+        return 'retry'
+
+    reason = error_reason(body)
+
+    if reason in QUOTA_REASONS:
+        return 'quota'
+
+    if reason in THROTTLED_REASONS:
+        return 'throttled'
+
+    return 'fail'
+
+
+def error_reason(body: bytes) -> str:
+    '''
+    This function returns the reason of the first error in a YouTube API error
+    response, such as "quotaExceeded", or None if the body has none.
+    '''
+    try:
+        return json.loads(body)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def retry_after(headers: dict) -> float:
+    '''
+    This function returns the number of seconds a Retry-After header asks to
+    wait, whether given in seconds or as a date, or None if there is none.
+    '''
+    value = headers.get('Retry-After')
+
+    if value == None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,177 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# response_cache.py
+
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.youtube_stats_cache')
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Seconds before a cached response must be revalidated, by API endpoint
+DEFAULT_TTLS = {
+    'channels': 6 * 60 * 60,
+    'search': 24 * 60 * 60,
+    'videos': 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+
+class ResponseCache:
+    '''
+    A size-bounded LRU cache of API responses stored as one JSON file per request.
+    Entries are keyed by the normalized request URL without the API key and keep
+    the ETag the API returned, so stale entries can be revalidated with
+    If-None-Match instead of downloaded again.
+    '''
+    def __init__(self, directory: str = CACHE_DIRECTORY, ttls: dict = DEFAULT_TTLS,
+                 max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self._directory = directory
+        self._ttls = ttls
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entry_sizes = collections.OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        os.makedirs(directory, exist_ok = True)
+        self._load_index()
+
+
+    def get(self, url: str) -> (dict, bool):
+        '''
+        This function returns the cached entry for the URL, or None if there is
+        none, along with whether the entry is still within its TTL.
+        '''
+        cache_key = self._cache_key(url)
+
+        with self._lock:
+            if cache_key not in self._entry_sizes:
+                self.misses += 1
+                return None, False
+
+            self._entry_sizes.move_to_end(cache_key)
+
+        try:
+            with open(self._path(cache_key), 'rb') as cache_file:
+                entry = json.load(cache_file)
+            os.utime(self._path(cache_key))
+
+        except (OSError, ValueError):
+            self._discard(cache_key)
+
+            with self._lock:
+                self.misses += 1
+
+            return None, False
+
+        is_fresh = time.time() - entry['stored_at'] < self._ttl(url)
+
+        with self._lock:
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return entry, is_fresh
+
+
+    def put(self, url: str, data: dict, etag: str) -> None:
+        cache_key = self._cache_key(url)
+        entry = {'stored_at': time.time(), 'etag': etag, 'data': data}
+        contents = json.dumps(entry).encode(encoding = 'utf-8')
+        temporary_path = self._path(cache_key) + '.' + str(threading.get_ident()) + '.tmp'
+
+        with open(temporary_path, 'wb') as cache_file:
+            cache_file.write(contents)
+        os.replace(temporary_path, self._path(cache_key))
+
+        with self._lock:
+            self._total_bytes += len(contents) - self._entry_sizes.pop(cache_key, 0)
+            self._entry_sizes[cache_key] = len(contents)
+            self._evict()
+
+
+    def revalidated(self, url: str, entry: dict) -> None:
+        '''
+        This function records that the server answered 304 Not Modified for a
+        cached entry, restarting the entry's TTL.
+        '''
+        with self._lock:
+            self.revalidations += 1
+
+        self.put(url, entry['data'], entry['etag'])
+
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations,
+                    'entries': len(self._entry_sizes), 'bytes': self._total_bytes}
+
+
+    def _ttl(self, url: str) -> float:
+        path = urllib.parse.urlsplit(url).path
+        return self._ttls.get(path[path.rfind('/') + 1:], DEFAULT_TTL)
+
+
+    def _cache_key(self, url: str) -> str:
+        parsed_url = urllib.parse.urlsplit(url)
+        query_parameters = sorted((name, value) for name, value in urllib.parse.parse_qsl(parsed_url.query)
+                                  if name != 'key')
+        normalized_url = urllib.parse.urlunsplit((parsed_url.scheme.lower(), parsed_url.netloc.lower(),
+                                                  parsed_url.path, urllib.parse.urlencode(query_parameters), ''))
+
+        return hashlib.sha256(normalized_url.encode(encoding = 'utf-8')).hexdigest()
+
+
+    def _path(self, cache_key: str) -> str:
+        return os.path.join(self._directory, cache_key + '.json')
+
+
+    def _load_index(self) -> None:
+        entries = []
+
+        for file_name in os.listdir(self._directory):
+            if not file_name.endswith('.json'):
+                continue
+
+            file_stat = os.stat(os.path.join(self._directory, file_name))
+            entries.append((file_stat.st_mtime, file_name[:-len('.json')], file_stat.st_size))
+
+        for _, cache_key, size in sorted(entries):
+            self._entry_sizes[cache_key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict()
+
+
+    def _evict(self) -> None:
+        while self._total_bytes > self._max_bytes and self._entry_sizes:
+            cache_key, size = self._entry_sizes.popitem(last = False)
+            self._total_bytes -= size
+
+            try:
+                os.remove(self._path(cache_key))
+            except OSError:
+                pass
+
+
+    def _discard(self, cache_key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entry_sizes.pop(cache_key, 0)
+
+        try:
+            os.remove(self._path(cache_key))
+        except OSError:
+            pass
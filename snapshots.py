@@ -0,0 +1,384 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# snapshots.py
+
+
+import bisect
+import os
+import struct
+import time
+from typing import BinaryIO
+from youtube_channels import YouTubeChannels
+
+
+SNAPSHOT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.youtube_stats_snapshots')
+POLL_INTERVAL = 5 * 60
+RETENTION = 90 * 24 * 60 * 60
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Every sample is one fixed-width record: its timestamp, then the change in
+# subscribers, views and videos since the previous sample. Every
+# KEYFRAME_INTERVAL-th sample, and any sample whose changes do not fit, also
+# gets a keyframe holding its absolute values, so a sample's values can be
+# rebuilt from at most KEYFRAME_INTERVAL records.
+RECORD = struct.Struct('<Iiii')
+KEYFRAME = struct.Struct('<IIqqq')
+KEYFRAME_INTERVAL = 256
+MAX_DELTA = 2 ** 31 - 1
+
+
+class SnapshotStore:
+    '''
+    An append-only store of channel statistics over time. Each channel has a
+    .snap file of 16-byte delta-encoded records and a .key file of keyframes.
+    Records are in time order, so the samples in a time range are found by
+    binary search over the fixed-width records.
+    '''
+    def __init__(self, directory: str = SNAPSHOT_DIRECTORY) -> None:
+        self._directory = directory
+
+        # The record count, timestamp and values of each channel's last sample
+        self._last_samples = {}
+
+        os.makedirs(directory, exist_ok = True)
+        self._recover_prunes()
+
+
+    def append(self, channel_id: str, timestamp: int, values: (int, int, int)) -> None:
+        '''
+        This function records the subscriber, view and video counts of a channel at
+        a time later than its last sample.
+        '''
+        record_count, last_timestamp, last_values = self._last_sample(channel_id)
+
+        if record_count > 0 and timestamp <= last_timestamp:
+            raise ValueError('snapshots must be appended in time order')
+
+        record, keyframe = self._pack(record_count, last_values, timestamp, values)
+
+        if keyframe != None:
+            with open(self._path(channel_id, '.key'), 'ab') as keyframe_file:
+                keyframe_file.write(keyframe)
+
+        with open(self._path(channel_id, '.snap'), 'ab') as record_file:
+            record_file.write(record)
+
+        self._last_samples[channel_id] = (record_count + 1, timestamp, tuple(values))
+
+
+    def samples(self, channel_id: str, start: int, end: int) -> [(int, int, int, int)]:
+        '''
+        This function returns the (timestamp, subscribers, views, videos) samples of
+        a channel taken between start and end inclusive, in time order.
+        '''
+        if not os.path.exists(self._path(channel_id, '.snap')):
+            return []
+
+        keyframes = self._read_keyframes(channel_id)
+
+        with open(self._path(channel_id, '.snap'), 'rb') as record_file:
+            record_count = os.fstat(record_file.fileno()).st_size // RECORD.size
+            first = self._first_record_at_or_after(record_file, record_count, start)
+
+            if first == record_count:
+                return []
+
+            timestamp, values = self._rebuild(record_file, keyframes, first)
+            samples = []
+
+            for record_number in range(first, record_count):
+                if record_number > first:
+                    timestamp, values = self._next_sample(record_file, keyframes, record_number, values)
+
+                if timestamp > end:
+                    break
+
+                samples.append((timestamp,) + values)
+
+        return samples
+
+
+    def growth_rates(self, channel_id: str, start: int, end: int) -> dict:
+        '''
+        This function returns the average subscribers, views and videos gained per
+        day between the first and last samples taken from start to end, or None if
+        there are fewer than two samples in that window.
+        '''
+        first_sample = self._sample_near(channel_id, start, after = True)
+        last_sample = self._sample_near(channel_id, end, after = False)
+
+        if first_sample == None or last_sample == None or last_sample[0] <= first_sample[0]:
+            return None
+
+        days = (last_sample[0] - first_sample[0]) / SECONDS_PER_DAY
+
+        return {'subscribers_per_day': (last_sample[1] - first_sample[1]) / days,
+                'views_per_day': (last_sample[2] - first_sample[2]) / days,
+                'videos_per_day': (last_sample[3] - first_sample[3]) / days}
+
+
+    def channel_ids(self) -> [str]:
+        '''
+        This function returns the ids of every channel with samples in the store,
+        including channels no longer in any list.
+        '''
+        return sorted(file_name[:-len('.snap')] for file_name in os.listdir(self._directory)
+                      if file_name.endswith('.snap'))
+
+
+    def prune(self, channel_id: str, before: int) -> None:
+        '''
+        This function drops a channel's samples taken before the given time. The
+        samples kept are encoded again, starting with a keyframe, into temporary
+        files in one pass, which then replace the channel's files. If no samples
+        remain, the channel's files are removed.
+        '''
+        remaining_samples = self.samples(channel_id, before, 2 ** 32 - 1)
+        self._last_samples.pop(channel_id, None)
+
+        if not remaining_samples:
+            for extension in ('.snap', '.key'):
+                if os.path.exists(self._path(channel_id, extension)):
+                    os.remove(self._path(channel_id, extension))
+
+            return
+
+        records = []
+        keyframes = []
+        last_values = (0, 0, 0)
+
+        for record_count, (timestamp, *values) in enumerate(remaining_samples):
+            record, keyframe = self._pack(record_count, last_values, timestamp, values)
+            records.append(record)
+
+            if keyframe != None:
+                keyframes.append(keyframe)
+
+            last_values = values
+
+        self._write_durably(self._path(channel_id, '.key.tmp'), b''.join(keyframes))
+        self._write_durably(self._path(channel_id, '.snap.tmp'), b''.join(records))
+
+        # Once the records are renamed to .snap.pruned, both new files are
+        # complete, and a store opened after a crash finishes the prune
+        os.replace(self._path(channel_id, '.snap.tmp'), self._path(channel_id, '.snap.pruned'))
+        self._finish_prune(channel_id)
+
+
+    def oldest_timestamp(self, channel_id: str) -> int:
+        try:
+            with open(self._path(channel_id, '.snap'), 'rb') as record_file:
+                record = record_file.read(RECORD.size)
+        except OSError:
+            return None
+
+        return RECORD.unpack(record)[0] if len(record) == RECORD.size else None
+
+
+    def _pack(self, record_count: int, last_values: (int, int, int), timestamp: int,
+              values: (int, int, int)) -> (bytes, bytes):
+        '''
+        This function returns the record of a sample following one with the last
+        values, and its keyframe, or None if it does not need one.
+        '''
+        deltas = [value - last_value for value, last_value in zip(values, last_values)]
+
+        if record_count % KEYFRAME_INTERVAL == 0 or any(abs(delta) > MAX_DELTA for delta in deltas):
+            return RECORD.pack(timestamp, 0, 0, 0), KEYFRAME.pack(record_count, timestamp, *values)
+
+        return RECORD.pack(timestamp, *deltas), None
+
+
+    def _write_durably(self, path: str, contents: bytes) -> None:
+        with open(path, 'wb') as output_file:
+            output_file.write(contents)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+
+
+    def _finish_prune(self, channel_id: str) -> None:
+        if os.path.exists(self._path(channel_id, '.key.tmp')):
+            os.replace(self._path(channel_id, '.key.tmp'), self._path(channel_id, '.key'))
+
+        os.replace(self._path(channel_id, '.snap.pruned'), self._path(channel_id, '.snap'))
+
+
+    def _recover_prunes(self) -> None:
+        '''
+        This function finishes the prunes a crash interrupted after their new files
+        were complete, and removes the temporary files of those interrupted before,
+        whose channels still have their old files.
+        '''
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith('.snap.pruned'):
+                self._finish_prune(file_name[:-len('.snap.pruned')])
+
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith('.tmp'):
+                os.remove(os.path.join(self._directory, file_name))
+
+
+    def _sample_near(self, channel_id: str, timestamp: int, after: bool) -> (int, int, int, int):
+        '''
+        This function returns the first sample at or after the timestamp if after
+        is True, or the last sample at or before it otherwise.
+        '''
+        if not os.path.exists(self._path(channel_id, '.snap')):
+            return None
+
+        with open(self._path(channel_id, '.snap'), 'rb') as record_file:
+            record_count = os.fstat(record_file.fileno()).st_size // RECORD.size
+            record_number = self._first_record_at_or_after(record_file, record_count, timestamp if after
+                                                           else timestamp + 1)
+
+            if not after:
+                record_number -= 1
+
+            if record_number < 0 or record_number >= record_count:
+                return None
+
+            timestamp, values = self._rebuild(record_file, self._read_keyframes(channel_id), record_number)
+
+        return (timestamp,) + values
+
+
+    def _last_sample(self, channel_id: str) -> (int, int, (int, int, int)):
+        if channel_id not in self._last_samples:
+            sample = self._sample_near(channel_id, 2 ** 32 - 1, after = False)
+
+            if sample == None:
+                self._last_samples[channel_id] = (0, 0, (0, 0, 0))
+            else:
+                record_count = os.path.getsize(self._path(channel_id, '.snap')) // RECORD.size
+                self._last_samples[channel_id] = (record_count, sample[0], sample[1:])
+
+        return self._last_samples[channel_id]
+
+
+    def _first_record_at_or_after(self, record_file: BinaryIO, record_count: int, timestamp: int) -> int:
+        lo = 0
+        hi = record_count
+
+        while lo < hi:
+            middle = (lo + hi) // 2
+
+            if self._read_record(record_file, middle)[0] < timestamp:
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return lo
+
+
+    def _rebuild(self, record_file: BinaryIO, keyframes: dict, record_number: int) -> (int, (int, int, int)):
+        keyframe_numbers = list(keyframes)
+        keyframe_number = keyframe_numbers[bisect.bisect_right(keyframe_numbers, record_number) - 1]
+        timestamp, values = keyframes[keyframe_number]
+
+        for number in range(keyframe_number + 1, record_number + 1):
+            timestamp, values = self._next_sample(record_file, keyframes, number, values)
+
+        return timestamp, values
+
+
+    def _next_sample(self, record_file: BinaryIO, keyframes: dict, record_number: int,
+                     values: (int, int, int)) -> (int, (int, int, int)):
+        if record_number in keyframes:
+            return keyframes[record_number]
+
+        timestamp, *deltas = self._read_record(record_file, record_number)
+        return timestamp, tuple(value + delta for value, delta in zip(values, deltas))
+
+
+    def _read_record(self, record_file: BinaryIO, record_number: int) -> (int, int, int, int):
+        record_file.seek(record_number * RECORD.size)
+        return RECORD.unpack(record_file.read(RECORD.size))
+
+
+    def _read_keyframes(self, channel_id: str) -> dict:
+        with open(self._path(channel_id, '.key'), 'rb') as keyframe_file:
+            contents = keyframe_file.read()
+
+        return {record_number: (timestamp, tuple(values))
+                for record_number, timestamp, *values in KEYFRAME.iter_unpack(contents)}
+
+
+    def _path(self, channel_id: str, extension: str) -> str:
+        return os.path.join(self._directory, channel_id + extension)
+
+
+class SnapshotRecorder:
+    '''
+    Periodically requests the statistics of every channel in a YouTubeChannels,
+    50 channels per request, and appends them to a SnapshotStore. Samples older
+    than the retention period are pruned from every channel in the store,
+    including channels since deleted from the list, so the store stops growing
+    once it covers that period.
+    '''
+    def __init__(self, channels: YouTubeChannels, store: SnapshotStore, interval: float = POLL_INTERVAL,
+                 retention: float = RETENTION) -> None:
+        self._channels = channels
+        self._store = store
+        self._interval = interval
+        self._retention = retention
+        self._next_prune = 0
+        self._last_timestamp = 0
+
+
+    def poll_once(self) -> [str]:
+        '''
+        This function takes one snapshot of every channel and returns the ids of
+        the channels that could not be refreshed. The refresh revalidates cached
+        responses, so each snapshot holds the counts the API returns now rather
+        than ones cached at an earlier poll.
+        '''
+        failed_ids = set(self._channels.refresh(stale_after = 0))
+        timestamp = int(time.time())
+
+        # Samples are stored to the second, so a second poll within the same
+        # second is not recorded
+        if timestamp <= self._last_timestamp:
+            return list(failed_ids)
+
+        self._last_timestamp = timestamp
+
+        for channel in self._channels.channels():
+            if channel.channel_id() in failed_ids:
+                continue
+
+            self._store.append(channel.channel_id(), timestamp,
+                               (channel.subscriber_count(), channel.view_count(), channel.video_count()))
+
+        # Rewriting the files is only worth it once a tenth of the retention
+        # period has passed since the last time
+        if timestamp >= self._next_prune:
+            for channel_id in self._store.channel_ids():
+                self._prune(channel_id, timestamp)
+
+            self._next_prune = timestamp + self._retention / 10
+
+        return list(failed_ids)
+
+
+    def run(self, iterations: int = None) -> None:
+        '''
+        This function polls every interval seconds, forever or for the given number
+        of iterations.
+        '''
+        iteration = 0
+
+        while iterations == None or iteration < iterations:
+            started = time.monotonic()
+            self.poll_once()
+            iteration += 1
+
+            if iterations == None or iteration < iterations:
+                time.sleep(max(self._interval - (time.monotonic() - started), 0))
+
+
+    def _prune(self, channel_id: str, timestamp: int) -> None:
+        cutoff = int(timestamp - self._retention)
+        oldest_timestamp = self._store.oldest_timestamp(channel_id)
+
+        if oldest_timestamp != None and oldest_timestamp < cutoff:
+            self._store.prune(channel_id, cutoff)
@@ -0,0 +1,158 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# sorted_index.py
+
+
+import bisect
+
+
+# Batches at least this large are sorted and merged in one pass rather than
+# inserted one entry at a time
+MIN_BULK_SIZE = 16
+
+
+class SortedIndex:
+    '''
+    Keeps (key, channel id) entries sorted by key, with ties broken by channel
+    id. Entries are found by binary search, so lookups take O(log n) time and
+    inserts and removals only shift the list in place. Batches of entries are
+    merged in one pass with add_many and remove_many. If summed is True, the
+    keys are numbers and a running total of them is kept.
+    '''
+    def __init__(self, summed: bool = False) -> None:
+        self._entries = []
+        self._keys_by_id = {}
+        self._summed = summed
+        self._total = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def add(self, channel_id: str, key: object) -> None:
+        if channel_id in self._keys_by_id:
+            self.remove(channel_id)
+
+        bisect.insort(self._entries, (key, channel_id))
+        self._keys_by_id[channel_id] = key
+
+        if self._summed:
+            self._total += key
+
+
+    def add_many(self, entries: [(str, object)]) -> None:
+        '''
+        This function adds or moves every (channel id, key) entry. A large batch
+        is sorted once and merged with the entries already kept, so adding k
+        entries to n takes O(n + k log k) time rather than the O(k n) of adding
+        them one by one.
+        '''
+        keys_by_id = dict(entries)
+
+        if len(keys_by_id) < MIN_BULK_SIZE:
+            for channel_id, key in keys_by_id.items():
+                self.add(channel_id, key)
+
+            return
+
+        self.remove_many([channel_id for channel_id in keys_by_id if channel_id in self._keys_by_id])
+
+        # The kept entries and the sorted new ones are two runs, which sort()
+        # merges in linear time
+        self._entries.extend(sorted((key, channel_id) for channel_id, key in keys_by_id.items()))
+        self._entries.sort()
+        self._keys_by_id.update(keys_by_id)
+
+        if self._summed:
+            self._total += sum(keys_by_id.values())
+
+
+    def remove(self, channel_id: str) -> None:
+        key = self._keys_by_id.pop(channel_id, None)
+
+        if key == None:
+            return
+
+        del self._entries[bisect.bisect_left(self._entries, (key, channel_id))]
+
+        if self._summed:
+            self._total -= key
+
+
+    def remove_many(self, channel_ids: [str]) -> None:
+        '''
+        This function removes the entries of every given channel id, filtering
+        the list once if there are many of them.
+        '''
+        removed_ids = {channel_id for channel_id in channel_ids if channel_id in self._keys_by_id}
+
+        if len(removed_ids) < MIN_BULK_SIZE:
+            for channel_id in removed_ids:
+                self.remove(channel_id)
+
+            return
+
+        self._entries[:] = [entry for entry in self._entries if entry[1] not in removed_ids]
+
+        for channel_id in removed_ids:
+            key = self._keys_by_id.pop(channel_id)
+
+            if self._summed:
+                self._total -= key
+
+
+    def total(self) -> object:
+        return self._total
+
+
+    def min_entry(self) -> (object, str):
+        return self._entries[0] if self._entries else None
+
+
+    def max_entry(self) -> (object, str):
+        return self._entries[-1] if self._entries else None
+
+
+    def ids(self, reverse: bool = False) -> [str]:
+        channel_ids = [channel_id for _, channel_id in self._entries]
+
+        if reverse:
+            channel_ids.reverse()
+
+        return channel_ids
+
+
+    def first(self, k: int) -> [str]:
+        return [channel_id for _, channel_id in self._entries[:k]]
+
+
+    def last(self, k: int) -> [str]:
+        return [channel_id for _, channel_id in reversed(self._entries[max(len(self._entries) - k, 0):])]
+
+
+    def between(self, lo: object, hi: object) -> [str]:
+        '''
+        This function returns the ids of the entries with lo <= key <= hi, in
+        ascending order of key.
+        '''
+        start = self._bisect_key(lo, after_equal = False)
+        end = self._bisect_key(hi, after_equal = True)
+
+        return [channel_id for _, channel_id in self._entries[start:end]]
+
+
+    def _bisect_key(self, key: object, after_equal: bool) -> int:
+        lo = 0
+        hi = len(self._entries)
+
+        while lo < hi:
+            middle = (lo + hi) // 2
+            middle_key = self._entries[middle][0]
+
+            if middle_key < key or (after_equal and middle_key == key):
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return lo
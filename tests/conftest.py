@@ -0,0 +1,35 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# conftest.py
+
+
+import os
+import sys
+import pytest
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_youtube_api import MockYouTubeAPI
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+@pytest.fixture
+def mock_api() -> MockYouTubeAPI:
+    api = MockYouTubeAPI(seed = 1).start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def channels(mock_api: MockYouTubeAPI) -> YouTubeChannels:
+    '''
+    A YouTubeChannels pointed at the mock API, with its own client so tests do
+    not share the rate-limited default client.
+    '''
+    return YouTubeChannels('test-key', client = YouTubeClient(), base_url = mock_api.base_url())
+
+
+def channel_ids(count: int, start: int = 0) -> [str]:
+    return ['UC' + str(number).zfill(4) for number in range(start, start + count)]
@@ -0,0 +1,59 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_api_key_pool.py
+
+
+import pytest
+import youtube_requests
+from conftest import channel_ids
+from api_key_pool import ApiKeyPool, mask_api_key, read_api_keys
+from mock_youtube_api import MockYouTubeAPI
+from rate_limiter import QuotaExceededError
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+def test_requests_go_to_the_key_with_the_most_quota_left() -> None:
+    key_pool = ApiKeyPool(['first-key', 'second-key'], daily_quota = 1000)
+    url = youtube_requests.build_url(*youtube_requests.channels_request(['UC0001']))
+
+    assert key_pool.take_key(url) == 'first-key'
+    assert key_pool.take_key(url) == 'second-key'
+    assert key_pool.remaining() == 1998
+
+
+def test_a_key_out_of_quota_fails_over_to_the_next(mock_api: MockYouTubeAPI) -> None:
+    mock_api.key_quota = 2
+    key_pool = ApiKeyPool(['first-key', 'second-key', 'third-key'])
+    channels = YouTubeChannels(key_pool, max_workers = 1, client = YouTubeClient(), base_url = mock_api.base_url())
+
+    # The three keys pay for six of the ten channels requests between them
+    assert channels.add_channels(channel_ids(500)) == channel_ids(200, 300)
+    assert channels.channel_count() == 300
+    assert mock_api.units_by_key() == {'first-key': 2, 'second-key': 2, 'third-key': 2}
+    assert key_pool.is_exhausted()
+
+
+def test_quota_exceeded_is_raised_once_every_key_is_out(mock_api: MockYouTubeAPI) -> None:
+    mock_api.key_quota = 1
+    key_pool = ApiKeyPool(['first-key', 'second-key'])
+    client = YouTubeClient()
+    url = youtube_requests.build_url(*youtube_requests.channels_request(['UC0001']), base_url = mock_api.base_url())
+
+    client.get_data(url, key_pool)
+    client.get_data(url, key_pool)
+
+    with pytest.raises(QuotaExceededError):
+        client.get_data(url, key_pool)
+
+    assert [available for _, _, available in key_pool.usage()] == [False, False]
+
+
+def test_key_files_skip_blank_lines_and_comments(tmp_path: str) -> None:
+    key_path = str(tmp_path) + '/keys.txt'
+
+    with open(key_path, 'w') as key_file:
+        key_file.write('# first project\nkey-one\n\n  key-two  \n')
+
+    assert read_api_keys(key_path) == ['key-one', 'key-two']
+    assert mask_api_key('secret-key-1234') == '...1234'
@@ -0,0 +1,95 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_async_youtube_channels.py
+
+
+import asyncio
+import pytest
+import youtube_requests
+from conftest import channel_ids
+from async_youtube_channels import AsyncYouTubeChannels
+from async_youtube_client import AsyncYouTubeClient
+from mock_youtube_api import MockYouTubeAPI
+from rate_limiter import RetryPolicy
+
+
+def test_async_channels_match_the_blocking_ones(mock_api: MockYouTubeAPI) -> None:
+    # Built outside the event loop, as a program would before asyncio.run
+    channels = AsyncYouTubeChannels('test-key', base_url = mock_api.base_url())
+
+    async def run() -> None:
+        assert await channels.add_channels(channel_ids(120) + ['XX0001']) == ['XX0001']
+        await channels.load_most_popular_vids(channels.channel_list()[:10])
+        assert await channels.refresh_all() == []
+        await channels.close()
+
+    asyncio.run(run())
+
+    assert channels.channel_count() == 120
+    assert sum(channel.has_most_popular_vid() for channel in channels.channel_list()) == 10
+
+
+def test_a_slow_request_times_out(mock_api: MockYouTubeAPI) -> None:
+    mock_api.latency = 0.5
+    client = AsyncYouTubeClient(timeout = 0.1, retry_policy = RetryPolicy(max_attempts = 1))
+    url = youtube_requests.build_url(*youtube_requests.channels_request(['UC0001']), 'test-key',
+                                     base_url = mock_api.base_url())
+
+    async def run() -> None:
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.get_data(url)
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_cancelling_a_coroutine_cancels_its_requests(mock_api: MockYouTubeAPI) -> None:
+    mock_api.latency = 0.3
+    channels = AsyncYouTubeChannels('test-key', base_url = mock_api.base_url())
+
+    async def run() -> None:
+        task = asyncio.ensure_future(channels.add_channels(channel_ids(100)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert channels.channel_count() == 0
+
+        # The cancelled requests' connections are closed, not reused
+        mock_api.latency = 0
+        await channels.add_channel('UC0001')
+        await channels.close()
+
+    asyncio.run(run())
+
+    assert channels.channel_count() == 1
+
+
+def test_cancelling_a_threaded_call_stops_its_requests(mock_api: MockYouTubeAPI) -> None:
+    channels = AsyncYouTubeChannels('test-key', base_url = mock_api.base_url())
+
+    async def run() -> None:
+        await channels.add_channels(channel_ids(50))
+        mock_api.latency = 0.05
+
+        task = asyncio.ensure_future(channels.load_most_popular_vids(channels.channel_list()))
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await asyncio.sleep(0.3)
+        request_counts = mock_api.request_counts()
+        await asyncio.sleep(0.3)
+
+        assert mock_api.request_counts() == request_counts
+        await channels.close()
+
+    asyncio.run(run())
+
+    assert not any(channel.has_most_popular_vid() for channel in channels.channel_list())
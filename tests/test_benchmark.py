@@ -0,0 +1,23 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_benchmark.py
+
+
+import sys
+import benchmark
+import pytest
+
+
+@pytest.mark.parametrize('suite', benchmark.SUITES)
+def test_each_suite_runs_at_a_small_size(suite: str, monkeypatch: pytest.MonkeyPatch,
+                                         capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(benchmark, 'CHANNEL_COUNT', 20)
+    monkeypatch.setattr(benchmark, 'SIMULATED_LATENCY', 0)
+    monkeypatch.setattr(benchmark, 'WORKER_COUNTS', [1, 4])
+    monkeypatch.setattr(sys, 'argv', ['benchmark.py', '--suite', suite, '--channel-counts', '10,60'])
+
+    benchmark.run()
+
+    # Every suite prints one row per worker count or channel count
+    rows = [line for line in capsys.readouterr().out.splitlines() if line.split('|')[0].strip().isdigit()]
+    assert len(rows) == 2
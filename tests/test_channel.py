@@ -0,0 +1,55 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_channel.py
+
+
+from channel import Channel
+from channel_table import ChannelTable
+
+
+def channel_data(view_count: int, video_count: int) -> dict:
+    return {'items': [{'id': 'UC0001', 'snippet': {'title': 'Channel 0001', 'publishedAt': '2010-01-01T00:00:00Z'},
+                       'statistics': {'subscriberCount': '5', 'viewCount': str(view_count),
+                                      'videoCount': str(video_count)}}]}
+
+
+def vid_data(views: int) -> dict:
+    return {'items': [{'id': 'UC0001.0', 'snippet': {'title': 'Video', 'publishedAt': '2011-01-01T00:00:00Z'},
+                       'statistics': {'viewCount': str(views), 'likeCount': '9', 'dislikeCount': '1',
+                                      'commentCount': '3'}}]}
+
+
+def test_average_views_per_video() -> None:
+    assert Channel(channel_data(1000, 3), None, 'UC0001', table = ChannelTable()).average_views_per_video() == 333
+
+
+def test_a_channel_without_videos_averages_zero_views() -> None:
+    assert Channel(channel_data(0, 0), None, 'UC0001', table = ChannelTable()).average_views_per_video() == 0
+
+
+def test_the_most_popular_video_is_loaded_on_first_use() -> None:
+    loaded = []
+
+    def load(channels: [Channel]) -> None:
+        loaded.append(channels)
+        channels[0].set_most_popular_vid_data(vid_data(500))
+
+    channel = Channel(channel_data(1000, 3), None, 'UC0001', load, ChannelTable())
+
+    assert not channel.has_most_popular_vid()
+    assert channel.most_popular_vid_views() == 500
+    assert channel.most_popular_vid_views() == 500
+    assert loaded == [[channel]]
+
+
+def test_a_video_not_found_is_not_looked_up_again_until_the_channel_data_changes() -> None:
+    loaded = []
+    channel = Channel(channel_data(1000, 3), None, 'UC0001', loaded.append, ChannelTable())
+    channel.set_most_popular_vid_not_found()
+
+    assert channel.most_popular_vid_not_found()
+    assert loaded == []
+
+    channel.set_channel_data(channel_data(2000, 4))
+
+    assert not channel.most_popular_vid_not_found()
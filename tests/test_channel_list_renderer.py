@@ -0,0 +1,61 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_channel_list_renderer.py
+
+
+import io
+from conftest import channel_ids
+from channel_list_renderer import NAME_HEADER, ChannelListRenderer
+from youtube_channels import YouTubeChannels
+
+
+def channel_item(channel_id: str, title: str) -> dict:
+    return {'id': channel_id, 'snippet': {'title': title, 'publishedAt': '2010-01-01T00:00:00Z'},
+            'statistics': {'subscriberCount': '12', 'viewCount': '345', 'videoCount': '6'}}
+
+
+def table_rows(table: str) -> [str]:
+    return [line for line in table.splitlines() if line[:1].isdigit()]
+
+
+def test_long_names_are_cut_short_to_fit_their_column(channels: YouTubeChannels) -> None:
+    channels._save_channels([channel_item('UC0001', 'A' * 40), channel_item('UC0002', 'Short')])
+    rows = table_rows(ChannelListRenderer().render(channels))
+    name_cells = [row.split('|')[1] for row in rows]
+
+    assert name_cells == ['A' * (len(NAME_HEADER) - 3) + '...', 'Short'.ljust(len(NAME_HEADER))]
+    assert len({len(row) for row in rows}) == 1
+
+
+def test_one_page_of_a_long_list_is_rendered(channels: YouTubeChannels) -> None:
+    channels.add_channels(channel_ids(120))
+    renderer = ChannelListRenderer(page_size = 50)
+
+    middle_page = renderer.render(channels, 50)
+    last_page = renderer.render(channels, 100)
+
+    assert '(rows 51-100 of 120)' in middle_page
+    assert [row.split('|')[0].strip() for row in table_rows(middle_page)] == [str(row) for row in range(51, 101)]
+    assert '(rows 101-120 of 120)' in last_page
+    assert len(table_rows(last_page)) == 20
+    assert '(rows' not in ChannelListRenderer(page_size = 200).render(channels)
+
+
+def test_an_unchanged_page_is_not_drawn_again(channels: YouTubeChannels) -> None:
+    channels.add_channels(channel_ids(60))
+    renderer = ChannelListRenderer(page_size = 20)
+    output = io.StringIO()
+
+    assert renderer.draw(channels, 0, output)
+    assert not renderer.draw(channels, 0, output)
+    assert renderer.draw(channels, 20, output)
+
+    channels.sort_by_views(reverse = True)
+
+    assert renderer.draw(channels, 20, output)
+
+    channels.delete_channel_by_id('UC0001')
+
+    assert renderer.draw(channels, 20, output)
+    assert not renderer.draw(channels, 20, output)
+    assert output.getvalue().count('Your current channel list') == 4
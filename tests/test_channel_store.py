@@ -0,0 +1,76 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_channel_store.py
+
+
+import os
+import time
+from conftest import channel_ids
+from channel_store import ChannelStore
+from mock_youtube_api import MockYouTubeAPI
+from response_cache import ResponseCache
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+def open_channels(mock_api: MockYouTubeAPI, path: str, client: YouTubeClient = None) -> YouTubeChannels:
+    return YouTubeChannels('test-key', client = client or YouTubeClient(), store = ChannelStore(path),
+                           base_url = mock_api.base_url())
+
+
+def test_the_list_is_loaded_from_the_store_without_requests(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    path = os.path.join(str(tmp_path), 'channels.db')
+    channels = open_channels(mock_api, path)
+    channels.add_channels(channel_ids(60))
+    channels.load_most_popular_vids(channels.channel_list()[:5])
+    channels.sort_by_subscribers(reverse = True)
+    channels.delete_channel_by_id('UC0059')
+    order = [channel.channel_id() for channel in channels.channel_list()]
+    request_counts = mock_api.request_counts()
+
+    reopened = open_channels(mock_api, path)
+
+    assert [channel.channel_id() for channel in reopened.channel_list()] == order
+    assert sum(channel.has_most_popular_vid() for channel in reopened.channel_list()) == 5
+    assert reopened.get_channel('UC0001').name() == channels.get_channel('UC0001').name()
+    assert mock_api.request_counts() == request_counts
+
+
+def test_refresh_only_requests_stale_channels(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    channels = open_channels(mock_api, os.path.join(str(tmp_path), 'channels.db'))
+    channels.add_channels(channel_ids(60))
+
+    assert channels.refresh(stale_after = 60) == []
+    assert mock_api.request_counts() == {'channels': 2}
+
+    time.sleep(0.05)
+
+    assert channels.refresh(stale_after = 0.01) == []
+    assert mock_api.request_counts() == {'channels': 4}
+
+
+def test_refresh_revalidates_cached_channels(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    cache = ResponseCache(os.path.join(str(tmp_path), 'cache'))
+    channels = open_channels(mock_api, os.path.join(str(tmp_path), 'channels.db'), YouTubeClient(cache = cache))
+    channels.add_channels(channel_ids(120))
+
+    assert channels.refresh(stale_after = 0) == []
+    assert mock_api.request_counts() == {'channels': 6}
+    assert cache.revalidations == 3
+
+
+def test_top_videos_are_loaded_from_the_store(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    path = os.path.join(str(tmp_path), 'channels.db')
+    channels = open_channels(mock_api, path)
+    channels.add_channels(['UC0000', 'UC0007'])
+    channels.load_top_vids([channels.get_channel('UC0007')])
+    request_counts = mock_api.request_counts()
+
+    reopened = open_channels(mock_api, path)
+    channel = reopened.get_channel('UC0007')
+
+    assert channel.top_vid_ids() == channels.get_channel('UC0007').top_vid_ids()
+    assert channel.top_vids_median_views() == channels.get_channel('UC0007').top_vids_median_views()
+    assert channel.most_popular_vid_id() == 'UC0007.0'
+    assert not reopened.get_channel('UC0000').has_top_vids()
+    assert mock_api.request_counts() == request_counts
@@ -0,0 +1,110 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_indexes.py
+
+
+import pytest
+from conftest import channel_ids
+from sorted_index import SortedIndex
+from youtube_channels import YouTubeChannels
+
+
+def test_sorted_index_keeps_entries_in_key_order() -> None:
+    index = SortedIndex(summed = True)
+
+    for channel_id, key in [('UCc', 30), ('UCa', 10), ('UCb', 20), ('UCd', 20)]:
+        index.add(channel_id, key)
+
+    assert index.ids() == ['UCa', 'UCb', 'UCd', 'UCc']
+    assert index.ids(reverse = True) == ['UCc', 'UCd', 'UCb', 'UCa']
+    assert index.first(2) == ['UCa', 'UCb']
+    assert index.last(2) == ['UCc', 'UCd']
+    assert index.between(15, 30) == ['UCb', 'UCd', 'UCc']
+    assert index.total() == 80
+
+
+def test_sorted_index_moves_and_removes_entries() -> None:
+    index = SortedIndex(summed = True)
+    index.add('UCa', 10)
+    index.add('UCb', 20)
+    index.add('UCa', 30)
+    index.remove('UCb')
+    index.remove('UCmissing')
+
+    assert index.ids() == ['UCa']
+    assert index.min_entry() == (30, 'UCa')
+    assert index.total() == 30
+
+
+def test_bulk_adds_and_removals_match_single_ones() -> None:
+    single = SortedIndex(summed = True)
+    bulk = SortedIndex(summed = True)
+    first_entries = [('UC' + str(number), number % 7) for number in range(40)]
+    second_entries = [('UC' + str(number), number % 5) for number in range(20, 80)]
+
+    for channel_id, key in first_entries + second_entries:
+        single.add(channel_id, key)
+
+    bulk.add_many(first_entries)
+    bulk.add_many(second_entries)
+
+    assert bulk.ids() == single.ids()
+    assert bulk.total() == single.total()
+
+    removed_ids = ['UC' + str(number) for number in range(0, 80, 3)] + ['UCmissing']
+
+    for channel_id in removed_ids:
+        single.remove(channel_id)
+
+    bulk.remove_many(removed_ids)
+
+    assert bulk.ids() == single.ids()
+    assert bulk.total() == single.total()
+    assert len(bulk) == len(single)
+
+
+def test_channels_added_in_batches_are_indexed(channels: YouTubeChannels) -> None:
+    channels.add_channels(channel_ids(30))
+    channels.add_channels(channel_ids(40, start = 30))
+    channels.load_most_popular_vids(channels.channel_list())
+    by_views = sorted(channels.channel_list(), key = lambda channel: (channel.view_count(), channel.channel_id()))
+    by_video_views = sorted(channels.channel_list(),
+                            key = lambda channel: (channel.most_popular_vid_views(), channel.channel_id()))
+
+    assert channels.bottom_k('views', 70) == by_views
+    assert channels.bottom_k('video_views', 70) == by_video_views
+    assert channels.aggregates().total('views') == sum(channel.view_count() for channel in by_views)
+
+
+def test_sorting_follows_the_index(channels: YouTubeChannels) -> None:
+    channels.add_channels(channel_ids(60))
+    expected_order = sorted(channels.channel_list(), key = lambda channel: (channel.view_count(), channel.channel_id()))
+
+    channels.sort_by_views(reverse = False)
+    assert channels.channel_list() == expected_order
+
+    channels.sort_by_views(reverse = True)
+    assert channels.channel_list() == expected_order[::-1]
+
+
+def test_lookups_stay_current_after_a_delete(channels: YouTubeChannels) -> None:
+    channels.add_channels(channel_ids(60))
+    top_channel = channels.top_k('subscribers', 1)[0]
+    top_subscribers = top_channel.subscriber_count()
+    total_subscribers = channels.aggregates().total('subscribers')
+
+    assert channels.find_channel(top_channel.name().upper()) is top_channel
+    assert channels.range('subscribers', top_subscribers, top_subscribers) == [top_channel]
+
+    channels.delete_channel_by_id(top_channel.channel_id())
+
+    assert channels.find_channel(top_channel.name()) == None
+    assert channels.range('subscribers', top_subscribers, top_subscribers) == []
+    assert channels.top_k('subscribers', 1)[0].subscriber_count() <= top_subscribers
+    assert channels.aggregates().total('subscribers') == total_subscribers - top_subscribers
+    assert channels.aggregates().count('subscribers') == 59
+
+
+def test_unknown_metrics_are_rejected(channels: YouTubeChannels) -> None:
+    with pytest.raises(ValueError):
+        channels.top_k('dislikes', 1)
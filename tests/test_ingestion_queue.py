@@ -0,0 +1,97 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_ingestion_queue.py
+
+
+import os
+import time
+from conftest import channel_ids
+from api_key_pool import ApiKeyPool
+from ingestion_queue import CHANNEL_FETCHED, DONE, FAILED, PENDING, VIDEO_RESOLVED, IngestionQueue
+from mock_youtube_api import MockYouTubeAPI
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+def test_ingest_adds_every_channel_and_fails_unknown_ids(channels: YouTubeChannels, tmp_path: str) -> None:
+    queue = IngestionQueue(os.path.join(str(tmp_path), 'ingestion.db'))
+    queue.enqueue(channel_ids(130) + ['XX0001'])
+
+    assert channels.ingest(queue, videos = True, worker_id = 'worker') == ['XX0001']
+    assert queue.counts()[DONE] == 130
+    assert queue.failed() == [('XX0001', 'not found')]
+    assert channels.channel_count() == 130
+    assert all(channel.has_most_popular_vid() for channel in channels.channel_list())
+
+
+def test_ingest_resumes_from_the_journal(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    path = os.path.join(str(tmp_path), 'ingestion.db')
+    queue = IngestionQueue(path)
+    queue.enqueue(channel_ids(130))
+
+    # The single key runs out of quota partway through the video step
+    mock_api.key_quota = 400
+    first_channels = YouTubeChannels('first-key', client = YouTubeClient(), base_url = mock_api.base_url())
+    first_channels.ingest(queue, videos = True, worker_id = 'worker')
+    counts = queue.counts()
+    queue.close()
+
+    assert counts[PENDING] == 0 and counts[DONE] < 130
+    channel_requests = mock_api.request_counts()['channels']
+
+    queue = IngestionQueue(path)
+    key_pool = ApiKeyPool(['second-key', 'third-key', 'fourth-key'])
+    second_channels = YouTubeChannels(key_pool, client = YouTubeClient(), base_url = mock_api.base_url())
+    second_channels.ingest(queue, videos = True, worker_id = 'worker')
+
+    # Journaled channel data is not requested again
+    assert mock_api.request_counts()['channels'] == channel_requests
+    assert queue.counts()[DONE] == 130 - counts[DONE]
+    assert second_channels.channel_count() == 130 - counts[DONE]
+
+
+def test_an_expired_lease_passes_the_ids_to_another_worker(tmp_path: str) -> None:
+    queue = IngestionQueue(os.path.join(str(tmp_path), 'ingestion.db'), lease_seconds = 0.05)
+    queue.enqueue(['UCa', 'UCb'])
+
+    assert [channel_id for channel_id, _, _ in queue.claim(PENDING, 2, 'first')] == ['UCa', 'UCb']
+    assert queue.claim(PENDING, 2, 'second') == []
+
+    time.sleep(0.1)
+
+    assert [channel_id for channel_id, _, _ in queue.claim(PENDING, 2, 'second')] == ['UCa', 'UCb']
+    assert queue.renew(['UCa', 'UCb'], 'first') == []
+    assert queue.renew(['UCa', 'UCb'], 'second') == ['UCa', 'UCb']
+
+
+def test_a_worker_whose_lease_expired_cannot_move_the_ids(tmp_path: str) -> None:
+    queue = IngestionQueue(os.path.join(str(tmp_path), 'ingestion.db'), lease_seconds = 0.05)
+    queue.enqueue(['UCa', 'UCb'])
+    queue.claim(PENDING, 2, 'first')
+    time.sleep(0.1)
+    queue.claim(PENDING, 2, 'second')
+
+    queue.mark_channels_fetched([{'id': 'UCa'}], 'first')
+    queue.mark_failed(['UCb'], 'not found', 'first')
+    assert queue.release(['UCa', 'UCb'], 'first', failed_attempt = True) == []
+    assert queue.counts()[PENDING] == 2
+
+    queue.mark_channels_fetched([{'id': 'UCa'}], 'second')
+    assert queue.counts()[CHANNEL_FETCHED] == 1
+
+
+def test_repeatedly_failed_ids_are_marked_failed(tmp_path: str) -> None:
+    queue = IngestionQueue(os.path.join(str(tmp_path), 'ingestion.db'))
+    queue.enqueue(['UCa'])
+
+    for attempt in range(2):
+        queue.claim(PENDING, 1, 'worker')
+        assert queue.release(['UCa'], 'worker', failed_attempt = True) == []
+
+    queue.claim(PENDING, 1, 'worker')
+    assert queue.release(['UCa'], 'worker', failed_attempt = True) == ['UCa']
+    assert queue.counts()[FAILED] == 1
+
+    assert queue.retry_failed() == 1
+    assert queue.counts()[PENDING] == 1
+    assert queue.counts()[VIDEO_RESOLVED] == 0
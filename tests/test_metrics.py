@@ -0,0 +1,66 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_metrics.py
+
+
+from metrics import Histogram, Metrics
+from mock_youtube_api import MockYouTubeAPI
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+CHANNELS_URL = 'https://www.googleapis.com/youtube/v3/channels?part=statistics&id=UC0001'
+
+
+def test_histograms_count_values_in_cumulative_buckets() -> None:
+    histogram = Histogram((1.0, 2.0))
+
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [(1.0, 2), (2.0, 3), (float('inf'), 4)]
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(1.0) == float('inf')
+    assert Histogram().quantile(0.5) == None
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    metrics = Metrics()
+    metrics.observe_request(CHANNELS_URL, metrics.start(), 200, 100)
+    metrics.observe_retry(CHANNELS_URL)
+    metrics.observe_stage('render', metrics.start())
+
+    assert metrics.snapshot() == {'endpoints': {}, 'stages': {}}
+
+
+def test_to_prometheus_writes_counters_and_histograms() -> None:
+    metrics = Metrics(enabled = True)
+    metrics.observe_request(CHANNELS_URL, metrics.start(), 200, 100)
+    metrics.observe_request(CHANNELS_URL, metrics.start(), 503, 20)
+    metrics.observe_retry(CHANNELS_URL)
+    metrics.observe_stage('render', metrics.start())
+    lines = metrics.to_prometheus().splitlines()
+
+    assert '# TYPE youtube_requests_total counter' in lines
+    assert 'youtube_requests_total{endpoint="channels"} 2' in lines
+    assert 'youtube_request_errors_total{endpoint="channels"} 1' in lines
+    assert 'youtube_request_retries_total{endpoint="channels"} 1' in lines
+    assert 'youtube_response_bytes_total{endpoint="channels"} 120' in lines
+    assert 'youtube_quota_units_total{endpoint="channels"} 2' in lines
+    assert '# TYPE youtube_request_duration_seconds histogram' in lines
+    assert 'youtube_request_duration_seconds_bucket{endpoint="channels",le="+Inf"} 2' in lines
+    assert 'youtube_request_duration_seconds_count{endpoint="channels"} 2' in lines
+    assert 'youtube_stage_duration_seconds_count{stage="render"} 1' in lines
+    assert all(line.startswith('#') or len(line.split(' ')) == 2 for line in lines)
+
+
+def test_requests_sent_through_the_client_are_counted(mock_api: MockYouTubeAPI) -> None:
+    client = YouTubeClient()
+    client.metrics().enabled = True
+    channels = YouTubeChannels('test-key', client = client, base_url = mock_api.base_url())
+    channels.add_channels(['UC0001', 'UC0002'])
+    endpoints = client.metrics().snapshot()['endpoints']
+
+    assert endpoints['channels']['requests'] == 1
+    assert endpoints['channels']['parse']['count'] == 1
+    assert endpoints['channels']['response_bytes'] > 0
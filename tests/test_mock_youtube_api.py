@@ -0,0 +1,82 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_mock_youtube_api.py
+
+
+import json
+import urllib.error
+import urllib.request
+from mock_youtube_api import MockYouTubeAPI, synthetic_response
+
+
+def get(url: str, headers: dict = None) -> (int, dict, bytes):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers = headers or {})) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), error.read()
+
+
+def test_synthetic_data_is_stable_and_only_ids_starting_with_uc_exist() -> None:
+    first = synthetic_response('channels', {'id': 'UC0001,XX0002'})
+    second = synthetic_response('channels', {'id': 'UC0001'})
+
+    assert first == second
+    assert [item['id'] for item in first['items']] == ['UC0001']
+
+
+def test_videos_are_numbered_most_viewed_first() -> None:
+    channel_item = synthetic_response('channels', {'id': 'UC0001'})['items'][0]
+    video_count = int(channel_item['statistics']['videoCount'])
+    search_data = synthetic_response('search', {'channelId': 'UC0001', 'maxResults': str(video_count)})
+    video_ids = [item['id']['videoId'] for item in search_data['items']]
+    video_data = synthetic_response('videos', {'id': ','.join(video_ids)})
+    views = [int(item['statistics']['viewCount']) for item in video_data['items']]
+
+    assert video_ids[0] == 'UC0001.0'
+    assert views == sorted(views, reverse = True)
+
+
+def test_playlist_pages_cover_every_upload() -> None:
+    video_count = int(synthetic_response('channels', {'id': 'UC0001'})['items'][0]['statistics']['videoCount'])
+    video_ids = []
+    page_token = '0'
+
+    while page_token != None:
+        page = synthetic_response('playlistItems', {'playlistId': 'UU0001', 'maxResults': '50',
+                                                    'pageToken': page_token})
+        video_ids.extend(item['contentDetails']['videoId'] for item in page['items'])
+        page_token = page.get('nextPageToken')
+
+    assert len(video_ids) == video_count
+
+
+def test_unchanged_responses_are_answered_with_304(mock_api: MockYouTubeAPI) -> None:
+    url = mock_api.base_url() + '/channels?part=statistics&id=UC0001&key=test-key'
+    status, headers, body = get(url)
+
+    assert status == 200
+    assert get(url, {'If-None-Match': headers['ETag']})[0] == 304
+    assert mock_api.request_counts() == {'channels': 2}
+
+
+def test_keys_out_of_quota_get_quota_exceeded(mock_api: MockYouTubeAPI) -> None:
+    mock_api.key_quota = 1
+    url = mock_api.base_url() + '/channels?part=statistics&id=UC0001&key=test-key'
+
+    assert get(url)[0] == 200
+
+    status, headers, body = get(url)
+
+    assert status == 403
+    assert json.loads(body)['error']['errors'][0]['reason'] == 'quotaExceeded'
+    assert mock_api.units_by_key() == {'test-key': 1}
+
+
+def test_errors_are_injected_at_the_given_rate(mock_api: MockYouTubeAPI) -> None:
+    mock_api.error_rate = 1.0
+    mock_api.retry_after = 3
+    status, headers, body = get(mock_api.base_url() + '/channels?part=statistics&id=UC0001')
+
+    assert status == 503
+    assert headers['Retry-After'] == '3'
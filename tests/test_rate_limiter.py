@@ -0,0 +1,113 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_rate_limiter.py
+
+
+import email.utils
+import json
+import time
+import urllib.error
+import pytest
+from mock_youtube_api import MockYouTubeAPI
+from rate_limiter import (MAX_RETRY_AFTER, MIN_RATE, QuotaCircuitBreaker, QuotaExceededError, RetryPolicy, TokenBucket,
+                          classify_response, retry_after)
+from youtube_client import YouTubeClient
+
+
+def error_body(reason: str) -> bytes:
+    return json.dumps({'error': {'errors': [{'reason': reason}]}}).encode()
+
+
+def test_retry_delays_grow_and_are_capped() -> None:
+    policy = RetryPolicy(base_delay = 0.5, max_delay = 4.0)
+
+    for attempt in range(8):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_retry_after_is_honored_up_to_a_limit() -> None:
+    policy = RetryPolicy(base_delay = 0.001, max_delay = 0.001)
+
+    assert policy.delay(0, retry_after = 7) == 7
+    assert policy.delay(0, retry_after = MAX_RETRY_AFTER * 10) == MAX_RETRY_AFTER
+
+
+def test_retry_after_reads_seconds_and_dates() -> None:
+    in_a_minute = email.utils.formatdate(time.time() + 60, usegmt = True)
+
+    assert retry_after({'Retry-After': '3'}) == 3.0
+    assert retry_after({'Retry-After': '-3'}) == 0.0
+    assert 55 <= retry_after({'Retry-After': in_a_minute}) <= 60
+    assert retry_after({'Retry-After': 'soon'}) == None
+    assert retry_after({}) == None
+
+
+def test_responses_are_classified_by_status_and_reason() -> None:
+    assert classify_response(200, b'{}') == 'ok'
+    assert classify_response(304, b'') == 'ok'
+    assert classify_response(503, b'') == 'retry'
+    assert classify_response(429, b'') == 'throttled'
+    assert classify_response(403, error_body('userRateLimitExceeded')) == 'throttled'
+    assert classify_response(403, error_body('quotaExceeded')) == 'quota'
+    assert classify_response(403, error_body('forbidden')) == 'fail'
+    assert classify_response(404, b'not json') == 'fail'
+
+
+def test_token_bucket_allows_a_burst_then_the_rate() -> None:
+    bucket = TokenBucket(rate = 10.0, burst = 3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert 0 < bucket.reserve() <= 0.1
+
+
+def test_token_bucket_slows_down_and_speeds_back_up() -> None:
+    bucket = TokenBucket(rate = 4.0, burst = 1)
+    bucket.slow_down()
+    bucket.slow_down()
+    bucket.slow_down()
+
+    assert bucket.rate() == MIN_RATE
+
+    for _ in range(100):
+        bucket.speed_up()
+
+    assert bucket.rate() == 4.0
+
+
+def test_an_open_circuit_breaker_fails_requests_without_sending_them() -> None:
+    breaker = QuotaCircuitBreaker()
+    breaker.check('url')
+    breaker.trip(60)
+
+    with pytest.raises(QuotaExceededError):
+        breaker.check('url')
+
+    breaker.reset()
+
+    assert not breaker.is_open()
+
+
+def test_the_client_retries_server_errors(mock_api: MockYouTubeAPI) -> None:
+    mock_api.error_rate = 1.0
+    client = YouTubeClient(retry_policy = RetryPolicy(max_attempts = 3, base_delay = 0.001))
+    client.metrics().enabled = True
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        client.get_data(mock_api.base_url() + '/channels?part=statistics&id=UC0001&key=test-key')
+
+    assert error.value.code == 503
+    assert mock_api.request_counts() == {'channels': 3}
+    assert client.metrics().snapshot()['endpoints']['channels']['retries'] == 2
+
+
+def test_the_client_stops_sending_once_the_quota_runs_out(mock_api: MockYouTubeAPI) -> None:
+    mock_api.key_quota = 1
+    client = YouTubeClient()
+    url = mock_api.base_url() + '/channels?part=statistics&id=UC0001&key=test-key'
+    client.get_data(url)
+
+    for _ in range(2):
+        with pytest.raises(QuotaExceededError):
+            client.get_data(url)
+
+    assert mock_api.request_counts() == {'channels': 2}
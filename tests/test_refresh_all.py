@@ -0,0 +1,123 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_refresh_all.py
+
+
+import urllib.parse
+from channel_store import ChannelStore
+from video_resolvers import SearchResolver
+from youtube_channels import YouTubeChannels
+
+
+class GrowingYouTubeChannels(YouTubeChannels):
+    '''
+    A YouTubeChannels answered in-process from video_views, a dictionary of the
+    views of every "<channel id>.<n>" video, which tests change between
+    refreshes. A channel's view count is the sum of its videos' views.
+    '''
+    def __init__(self, video_views: dict, store: ChannelStore = None) -> None:
+        super().__init__('test-key', max_workers = 1, resolver = SearchResolver(), store = store)
+        self.video_views = video_views
+        self.requests = []
+
+
+    def _get_data(self, url: str, revalidate: bool = False) -> dict:
+        parsed_url = urllib.parse.urlsplit(url)
+        endpoint = parsed_url.path[parsed_url.path.rfind('/') + 1:]
+        query = dict(urllib.parse.parse_qsl(parsed_url.query))
+        self.requests.append(endpoint)
+
+        if endpoint == 'channels':
+            return {'items': [self._channel_item(channel_id) for channel_id in query['id'].split(',')
+                              if self._vid_ids(channel_id)]}
+
+        if endpoint == 'search':
+            vid_ids = sorted(self._vid_ids(query['channelId']), key = self.video_views.get, reverse = True)
+            return {'items': [{'id': {'videoId': vid_id}} for vid_id in vid_ids[:int(query['maxResults'])]]}
+
+        return {'items': [{'id': vid_id, 'snippet': {'title': vid_id, 'publishedAt': '2020-01-01T00:00:00Z'},
+                           'statistics': {'viewCount': str(self.video_views[vid_id])}}
+                          for vid_id in query['id'].split(',') if vid_id in self.video_views]}
+
+
+    def _channel_item(self, channel_id: str) -> dict:
+        vid_ids = self._vid_ids(channel_id)
+
+        return {'id': channel_id, 'snippet': {'title': channel_id, 'publishedAt': '2010-01-01T00:00:00Z'},
+                'statistics': {'viewCount': str(sum(self.video_views[vid_id] for vid_id in vid_ids)),
+                               'videoCount': str(len(vid_ids))}}
+
+
+    def _vid_ids(self, channel_id: str) -> [str]:
+        return [vid_id for vid_id in self.video_views if vid_id.startswith(channel_id + '.')]
+
+
+def loaded_channels(video_views: dict, store: ChannelStore = None) -> GrowingYouTubeChannels:
+    channels = GrowingYouTubeChannels(video_views, store)
+    channels.add_channels(sorted({vid_id.split('.')[0] for vid_id in video_views}))
+    channels.load_most_popular_vids(channels.channel_list())
+    channels.requests.clear()
+
+    return channels
+
+
+def test_unchanged_channels_are_refreshed_without_a_search() -> None:
+    channels = loaded_channels({'UC0001.0': 1000, 'UC0001.1': 500, 'UC0002.0': 80})
+
+    assert channels.refresh_all() == []
+    assert channels.requests == ['channels', 'videos']
+    assert channels.get_channel('UC0001').most_popular_vid_id() == 'UC0001.0'
+
+
+def test_a_video_overtaken_by_a_large_gain_is_looked_up_again() -> None:
+    channels = loaded_channels({'UC0001.0': 1000, 'UC0001.1': 500})
+    channels.video_views['UC0001.1'] = 2000
+    channels.refresh_all()
+
+    assert channels.requests.count('search') == 1
+    assert channels.get_channel('UC0001').most_popular_vid_id() == 'UC0001.1'
+    assert channels.get_channel('UC0001').most_popular_vid_views() == 2000
+
+
+def test_a_video_that_overtakes_slowly_is_found_once_the_gains_add_up() -> None:
+    channels = loaded_channels({'UC0001.0': 1000, 'UC0001.1': 990})
+
+    # Each round gains 1% of the leader's views, less than RERESOLVE_VIEW_SHARE,
+    # and refreshes the channel data in between, as the snapshot poll does
+    for _ in range(4):
+        channels.video_views['UC0001.1'] += 10
+        channels.refresh(stale_after = 0)
+        channels.refresh_all()
+
+    assert channels.requests.count('search') == 0
+    assert channels.get_channel('UC0001').most_popular_vid_id() == 'UC0001.0'
+
+    channels.video_views['UC0001.1'] += 10
+    channels.refresh_all()
+
+    assert channels.requests.count('search') == 1
+    assert channels.get_channel('UC0001').most_popular_vid_id() == 'UC0001.1'
+    assert channels.get_channel('UC0001').resolution_baseline() == (2040, 1040)
+
+
+def test_a_deleted_video_is_replaced_and_deleted_channels_are_returned() -> None:
+    channels = loaded_channels({'UC0001.0': 1000, 'UC0001.1': 500, 'UC0002.0': 80})
+    del channels.video_views['UC0001.0']
+    del channels.video_views['UC0002.0']
+
+    assert channels.refresh_all() == ['UC0002']
+    assert channels.get_channel('UC0001').most_popular_vid_id() == 'UC0001.1'
+
+
+def test_the_resolution_baseline_is_stored(tmp_path: str) -> None:
+    path = str(tmp_path) + '/channels.db'
+    channels = loaded_channels({'UC0001.0': 1000, 'UC0001.1': 990}, ChannelStore(path))
+    channels.video_views['UC0001.1'] += 30
+    channels.refresh_all()
+
+    reopened = GrowingYouTubeChannels(channels.video_views, ChannelStore(path))
+    reopened.video_views['UC0001.1'] += 30
+    reopened.refresh_all()
+
+    assert reopened.get_channel('UC0001').resolution_baseline() == (2050, 1050)
+    assert reopened.get_channel('UC0001').most_popular_vid_id() == 'UC0001.1'
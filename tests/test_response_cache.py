@@ -0,0 +1,66 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_response_cache.py
+
+
+import youtube_requests
+from mock_youtube_api import MockYouTubeAPI
+from response_cache import ResponseCache
+from youtube_client import YouTubeClient
+
+
+def channels_url(mock_api: MockYouTubeAPI, channel_id: str = 'UC0001') -> str:
+    return youtube_requests.build_url(*youtube_requests.channels_request([channel_id]), 'test-key',
+                                      base_url = mock_api.base_url())
+
+
+def test_entries_are_keyed_without_the_api_key(tmp_path: str) -> None:
+    cache = ResponseCache(str(tmp_path))
+    cache.put('http://host/youtube/v3/channels?id=UC0001&key=first-key', {'items': []}, '"etag"')
+
+    entry, is_fresh = cache.get('http://host/youtube/v3/channels?key=second-key&id=UC0001')
+
+    assert entry['data'] == {'items': []} and is_fresh
+
+
+def test_entries_past_their_ttl_are_stale(tmp_path: str) -> None:
+    cache = ResponseCache(str(tmp_path), ttls = {'channels': 0})
+    cache.put('http://host/youtube/v3/channels?id=UC0001', {'items': []}, '"etag"')
+
+    entry, is_fresh = cache.get('http://host/youtube/v3/channels?id=UC0001')
+
+    assert entry['etag'] == '"etag"' and not is_fresh
+
+
+def test_the_least_recently_used_entries_are_evicted(tmp_path: str) -> None:
+    cache = ResponseCache(str(tmp_path), max_bytes = 250)
+
+    for number in range(3):
+        cache.put('http://host/youtube/v3/channels?id=UC000' + str(number), {'items': ['x' * 50]}, '"etag"')
+
+    assert cache.get('http://host/youtube/v3/channels?id=UC0000')[0] == None
+    assert cache.get('http://host/youtube/v3/channels?id=UC0002')[0] != None
+    assert cache.stats()['bytes'] <= 250
+
+
+def test_fresh_cache_entry_is_returned_without_a_request(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    cache = ResponseCache(str(tmp_path))
+    client = YouTubeClient(cache = cache)
+
+    first = client.get_data(channels_url(mock_api))
+    second = client.get_data(channels_url(mock_api))
+
+    assert first == second
+    assert mock_api.request_counts() == {'channels': 1}
+    assert cache.hits == 1
+
+
+def test_a_stale_entry_is_revalidated_with_its_etag(mock_api: MockYouTubeAPI, tmp_path: str) -> None:
+    cache = ResponseCache(str(tmp_path), ttls = {'channels': 0})
+    client = YouTubeClient(cache = cache)
+
+    data = client.get_data(channels_url(mock_api))
+
+    assert client.get_data(channels_url(mock_api)) == data
+    assert mock_api.request_counts() == {'channels': 2}
+    assert cache.revalidations == 1
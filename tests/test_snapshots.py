@@ -0,0 +1,107 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_snapshots.py
+
+
+import os
+import pytest
+from snapshots import KEYFRAME, KEYFRAME_INTERVAL, MAX_DELTA, SnapshotStore
+
+
+def test_samples_round_trip_through_their_deltas(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    samples = [(1000 + i, 100 + i, 5000 - 3 * i, 10 + i // 2) for i in range(20)]
+
+    for timestamp, *values in samples:
+        store.append('UC0001', timestamp, values)
+
+    assert SnapshotStore(str(tmp_path)).samples('UC0001', 0, 2 ** 32 - 1) == samples
+    assert store.samples('UC0001', 1005, 1009) == samples[5:10]
+    assert store.samples('UC0001', 2000, 3000) == []
+    assert store.samples('UC0002', 0, 2 ** 32 - 1) == []
+
+
+def test_samples_are_rebuilt_from_keyframes(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    samples = [(1000 + i, i, i * 7, 0) for i in range(KEYFRAME_INTERVAL * 2 + 10)]
+
+    # A change too large for a delta is stored as a keyframe
+    samples[100] = (1100, 100, MAX_DELTA * 3, 0)
+
+    for timestamp, *values in samples:
+        store.append('UC0001', timestamp, values)
+
+    keyframe_size = os.path.getsize(os.path.join(str(tmp_path), 'UC0001.key'))
+
+    assert keyframe_size == KEYFRAME.size * 5
+    assert store.samples('UC0001', 0, 2 ** 32 - 1) == samples
+    assert store.samples('UC0001', 1300, 1300) == [samples[300]]
+
+
+def test_samples_must_be_appended_in_time_order(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    store.append('UC0001', 1000, (1, 2, 3))
+
+    with pytest.raises(ValueError):
+        SnapshotStore(str(tmp_path)).append('UC0001', 1000, (1, 2, 3))
+
+
+def test_growth_rates_span_the_first_and_last_samples(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    store.append('UC0001', 0, (100, 1000, 10))
+    store.append('UC0001', 43200, (150, 1500, 10))
+    store.append('UC0001', 172800, (300, 3000, 12))
+
+    assert store.growth_rates('UC0001', 0, 172800) == {'subscribers_per_day': 100.0, 'views_per_day': 1000.0,
+                                                       'videos_per_day': 1.0}
+    assert store.growth_rates('UC0001', 100000, 172800) == None
+
+
+def test_pruning_keeps_later_samples_and_appending_continues(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    samples = [(1000 + i, i * 3, MAX_DELTA * (i % 2) * 2, i) for i in range(KEYFRAME_INTERVAL + 50)]
+
+    for timestamp, *values in samples:
+        store.append('UC0001', timestamp, values)
+
+    store.prune('UC0001', 1100)
+    store.append('UC0001', 5000, (1, 2, 3))
+
+    assert store.oldest_timestamp('UC0001') == 1100
+    assert SnapshotStore(str(tmp_path)).samples('UC0001', 0, 2 ** 32 - 1) == samples[100:] + [(5000, 1, 2, 3)]
+    assert sorted(os.listdir(str(tmp_path))) == ['UC0001.key', 'UC0001.snap']
+
+
+def test_pruning_every_sample_removes_the_files(tmp_path: str) -> None:
+    store = SnapshotStore(str(tmp_path))
+    store.append('UC0001', 1000, (1, 2, 3))
+    store.prune('UC0001', 2000)
+
+    assert store.channel_ids() == []
+    assert os.listdir(str(tmp_path)) == []
+
+    store.append('UC0001', 3000, (4, 5, 6))
+
+    assert store.samples('UC0001', 0, 2 ** 32 - 1) == [(3000, 4, 5, 6)]
+
+
+def test_an_interrupted_prune_is_finished_or_rolled_back(tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = SnapshotStore(str(tmp_path))
+
+    for channel_id in ('UC0001', 'UC0002'):
+        for i in range(10):
+            store.append(channel_id, 1000 + i, (i, i, i))
+
+    # The prune of UC0001 stops after its new files are complete, and that of
+    # UC0002 while they were being written
+    monkeypatch.setattr(store, '_finish_prune', lambda channel_id: None)
+    store.prune('UC0001', 1005)
+
+    with open(os.path.join(str(tmp_path), 'UC0002.snap.tmp'), 'wb') as partial_file:
+        partial_file.write(b'partial')
+
+    store = SnapshotStore(str(tmp_path))
+
+    assert store.samples('UC0001', 0, 2 ** 32 - 1) == [(1000 + i, i, i, i) for i in range(5, 10)]
+    assert store.samples('UC0002', 0, 2 ** 32 - 1) == [(1000 + i, i, i, i) for i in range(10)]
+    assert sorted(os.listdir(str(tmp_path))) == ['UC0001.key', 'UC0001.snap', 'UC0002.key', 'UC0002.snap']
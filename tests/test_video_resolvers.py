@@ -0,0 +1,70 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_video_resolvers.py
+
+
+import pytest
+from api_key_pool import ApiKeyPool
+from mock_youtube_api import MockYouTubeAPI
+from quota import QuotaLedger
+from rate_limiter import QuotaExceededError
+from video_resolvers import AdaptiveResolver, SearchResolver, UploadsPlaylistResolver
+from youtube_channels import YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+def channel_item(video_count: int) -> dict:
+    return {'id': 'UC0001', 'statistics': {'videoCount': str(video_count)}}
+
+
+def chosen_resolver(remaining: int, video_count: int, search_reserve: int = 5000) -> type:
+    resolver = AdaptiveResolver(QuotaLedger(remaining), search_reserve)
+    return type(resolver._choose(channel_item(video_count)))
+
+
+def test_large_channels_are_searched_while_quota_is_plentiful() -> None:
+    # 1000 videos take 20 pages to walk
+    assert chosen_resolver(10000, 1000) == SearchResolver
+
+
+def test_small_channels_are_walked_while_quota_is_plentiful() -> None:
+    assert chosen_resolver(10000, 100) == UploadsPlaylistResolver
+
+
+def test_the_cheaper_resolver_is_chosen_below_the_reserve() -> None:
+    # 1000 videos cost 40 units to walk; 5000 videos cost 200, more than a search
+    assert chosen_resolver(4000, 1000) == UploadsPlaylistResolver
+    assert chosen_resolver(4000, 5000) == SearchResolver
+
+
+def test_only_the_walk_is_used_once_a_search_cannot_be_paid_for() -> None:
+    assert chosen_resolver(99, 1000) == UploadsPlaylistResolver
+
+
+def test_quota_cost_is_the_cost_of_the_chosen_resolver() -> None:
+    assert AdaptiveResolver(QuotaLedger(10000)).quota_cost(channel_item(1000)) == 100
+    assert AdaptiveResolver(QuotaLedger(99)).quota_cost(channel_item(1000)) == 40
+
+
+def test_a_walk_the_quota_left_cannot_pay_for_is_refused() -> None:
+    resolver = AdaptiveResolver(QuotaLedger(99))
+
+    # 5000 videos cost 200 units to walk
+    with pytest.raises(QuotaExceededError):
+        resolver.most_popular_vid_id(lambda endpoint, query_parameters: pytest.fail('no request expected'),
+                                     channel_item(5000))
+
+
+def test_channels_refused_for_lack_of_quota_are_looked_up_later(mock_api: MockYouTubeAPI) -> None:
+    key_pool = ApiKeyPool(['test-key'], daily_quota = 10)
+    channels = YouTubeChannels(key_pool, max_workers = 1, client = YouTubeClient(), base_url = mock_api.base_url())
+
+    # UC0000 has 9 videos, one page to walk; UC0007 has 188, four pages
+    channels.add_channels(['UC0000', 'UC0007'])
+    channels.load_most_popular_vids(channels.channel_list())
+    small_channel, large_channel = channels.channel_list()
+
+    assert small_channel.has_most_popular_vid()
+    assert not large_channel.has_most_popular_vid()
+    assert not large_channel.most_popular_vid_not_found()
+    assert mock_api.request_counts()['playlistItems'] == 1
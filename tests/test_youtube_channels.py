@@ -0,0 +1,89 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_youtube_channels.py
+
+
+import statistics
+from conftest import channel_ids
+from mock_youtube_api import MockYouTubeAPI, synthetic_response
+from rate_limiter import RetryPolicy
+from youtube_channels import YouTubeChannels, parse_channel_url
+from youtube_client import YouTubeClient
+
+
+def test_add_channels_batches_requests_and_keeps_the_given_order(mock_api: MockYouTubeAPI,
+                                                                 channels: YouTubeChannels) -> None:
+    ids = channel_ids(120)
+
+    assert channels.add_channels(list(reversed(ids))) == []
+    assert [channel.channel_id() for channel in channels.channel_list()] == list(reversed(ids))
+    assert mock_api.request_counts() == {'channels': 3}
+
+
+def test_add_channels_returns_the_ids_the_api_does_not_know(channels: YouTubeChannels) -> None:
+    assert channels.add_channels(['UC0001', 'XX0002', 'UC0003', 'XX0004']) == ['XX0002', 'XX0004']
+    assert channels.channel_count() == 2
+
+
+def test_add_channels_skips_duplicates_and_known_ids(mock_api: MockYouTubeAPI, channels: YouTubeChannels) -> None:
+    channels.add_channels(['UC0001'])
+
+    assert channels.add_channels(['UC0001', 'UC0002', 'UC0002']) == []
+    assert channels.channel_count() == 2
+    assert mock_api.request_counts() == {'channels': 2}
+
+
+def test_add_channels_returns_the_ids_of_failed_batches(mock_api: MockYouTubeAPI) -> None:
+    mock_api.error_rate = 1.0
+    client = YouTubeClient(retry_policy = RetryPolicy(max_attempts = 1))
+    channels = YouTubeChannels('test-key', client = client, base_url = mock_api.base_url())
+
+    assert channels.add_channels(channel_ids(60)) == channel_ids(60)
+    assert channels.channel_count() == 0
+
+
+def test_a_hidden_subscriber_count_is_read_as_zero(channels: YouTubeChannels) -> None:
+    channels._save_channels([{'id': 'UC0001',
+                              'snippet': {'title': 'Hidden', 'publishedAt': '2010-01-01T00:00:00Z'},
+                              'statistics': {'viewCount': '10', 'videoCount': '1', 'hiddenSubscriberCount': True}}])
+
+    assert channels.get_channel('UC0001').subscriber_count() == 0
+
+
+def test_parse_channel_url_reads_every_url_form() -> None:
+    assert parse_channel_url('https://www.youtube.com/channel/UC0001/videos') == ('id', 'UC0001')
+    assert parse_channel_url('https://www.youtube.com/user/someone') == ('username', 'someone')
+    assert parse_channel_url('youtube.com/c/SomeName') == ('custom', 'SomeName')
+    assert parse_channel_url('https://www.youtube.com/@some%C3%A9handle') == ('handle', '@someéhandle')
+    assert parse_channel_url(' @handle ') == ('handle', '@handle')
+    assert parse_channel_url('UC0001') == ('id', 'UC0001')
+
+
+def test_resolve_channel_id_only_requests_what_the_url_lacks(mock_api: MockYouTubeAPI,
+                                                             channels: YouTubeChannels) -> None:
+    assert channels.resolve_channel_id('https://www.youtube.com/channel/UC0001') == 'UC0001'
+    assert mock_api.request_counts() == {}
+
+    assert channels.resolve_channel_id('https://www.youtube.com/@0002') == 'UC0002'
+    assert channels.resolve_channel_id('https://www.youtube.com/c/0003') == 'UC0003'
+    assert mock_api.request_counts() == {'channels': 1, 'search': 1}
+
+
+def test_load_top_vids_keeps_the_statistics_of_the_most_viewed_videos(channels: YouTubeChannels) -> None:
+    channels.add_channels(['UC0007', 'UC0013'])
+    channels.load_top_vids(channels.channel_list(), count = 5)
+    channel = channels.get_channel('UC0007')
+    vid_data = synthetic_response('videos', {'id': ','.join(channel.top_vid_ids())})
+    vid_stats = [item['statistics'] for item in vid_data['items']]
+    views = [int(stats['viewCount']) for stats in vid_stats]
+    like_ratios = [int(stats['likeCount']) / (int(stats['likeCount']) + int(stats['dislikeCount'])) * 100
+                   for stats in vid_stats]
+
+    assert channel.top_vid_ids() == ['UC0007.' + str(number) for number in range(5)]
+    assert channel.top_vids_median_views() == statistics.median(views)
+    assert channel.top_vids_like_ratio_spread() == round(statistics.pstdev(like_ratios), 2)
+    assert channel.top_vids_comments_per_view() == sum(int(stats['commentCount']) for stats in vid_stats) / sum(views)
+    assert channel.most_popular_vid_id() == 'UC0007.0'
+
+    # UC0013 has fewer videos than were asked for
+    assert len(channels.get_channel('UC0013').top_vid_ids()) == 4
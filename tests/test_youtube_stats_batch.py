@@ -0,0 +1,58 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# test_youtube_stats_batch.py
+
+
+import csv
+import json
+import pathlib
+import sys
+import pytest
+import youtube_stats_batch
+from mock_youtube_api import MockYouTubeAPI
+
+
+def run_batch(monkeypatch: pytest.MonkeyPatch, mock_api: MockYouTubeAPI, tmp_path: pathlib.Path, lines: [str],
+              *options: str) -> str:
+    input_path = tmp_path / 'channels.txt'
+    input_path.write_text('\n'.join(lines) + '\n', encoding = 'utf-8')
+    key_path = tmp_path / 'keys.txt'
+    key_path.write_text('# test keys\ntest-key\n', encoding = 'utf-8')
+    output_path = tmp_path / 'output'
+
+    monkeypatch.setattr(sys, 'argv', ['youtube_stats_batch.py', str(input_path), '--api-key-file', str(key_path),
+                                      '--base-url', mock_api.base_url(), '--output', str(output_path)] + list(options))
+    youtube_stats_batch.run()
+
+    return output_path.read_text(encoding = 'utf-8')
+
+
+def test_every_resolvable_line_is_written_as_csv(monkeypatch: pytest.MonkeyPatch, mock_api: MockYouTubeAPI,
+                                                 tmp_path: pathlib.Path, capsys: pytest.CaptureFixture) -> None:
+    lines = ['# channels', 'https://www.youtube.com/channel/UC0001', '', '@0002', 'XX0003']
+    rows = list(csv.reader(run_batch(monkeypatch, mock_api, tmp_path, lines).splitlines()))
+
+    assert rows[0] == youtube_stats_batch.CHANNEL_COLUMNS
+    assert [row[0] for row in rows[1:]] == ['UC0001', 'UC0002']
+    assert 'Could not find channel XX0003' in capsys.readouterr().err
+
+
+def test_videos_are_written_as_json_lines(monkeypatch: pytest.MonkeyPatch, mock_api: MockYouTubeAPI,
+                                          tmp_path: pathlib.Path) -> None:
+    output = run_batch(monkeypatch, mock_api, tmp_path, ['UC0001', 'UC0002'], '--format', 'jsonl', '--videos')
+    rows = [json.loads(line) for line in output.splitlines()]
+
+    assert [row['channel_id'] for row in rows] == ['UC0001', 'UC0002']
+    assert all(row['most_popular_vid_views'] > 0 for row in rows)
+
+
+def test_a_journaled_run_resumes_without_repeating_channels(monkeypatch: pytest.MonkeyPatch, mock_api: MockYouTubeAPI,
+                                                            tmp_path: pathlib.Path) -> None:
+    journal = str(tmp_path / 'journal.db')
+    run_batch(monkeypatch, mock_api, tmp_path, ['UC0001', 'UC0002'], '--journal', journal)
+    output = run_batch(monkeypatch, mock_api, tmp_path, ['UC0001', 'UC0002', 'UC0003'], '--journal', journal)
+    rows = list(csv.reader(output.splitlines()))
+
+    assert rows[0] == youtube_stats_batch.CHANNEL_COLUMNS
+    assert [row[0] for row in rows[1:]] == ['UC0001', 'UC0002', 'UC0003']
+    assert mock_api.request_counts() == {'channels': 2}
@@ -0,0 +1,142 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# video_resolvers.py
+
+
+import heapq
+import math
+import youtube_requests
+from quota import DAILY_QUOTA, QuotaLedger, quota_cost
+from rate_limiter import QuotaExceededError
+
+
+MAX_RESULTS_PER_PAGE = 50
+
+# While more than SEARCH_QUOTA_RESERVE units are left today, AdaptiveResolver
+# spends a search on channels whose uploads walk would take more than
+# MAX_FAST_WALK_PAGES pages, since a search is one request instead of two per
+# page sent one after another
+SEARCH_QUOTA_RESERVE = DAILY_QUOTA // 2
+MAX_FAST_WALK_PAGES = 10
+
+
+# Each resolver finds the ids of a channel's most viewed videos, most viewed
+# first. The request argument takes an endpoint name and a list of query
+# parameters (without the API key) and returns the parsed JSON response.
+
+
+class SearchResolver:
+    '''
+    Asks search.list for the channel's videos ordered by view count. It takes a
+    single request but costs 100 quota units.
+    '''
+    def quota_cost(self, channel_item: dict) -> int:
+        return quota_cost('search')
+
+
+    def most_popular_vid_id(self, request: callable, channel_item: dict) -> str:
+        return self.top_vid_ids(request, channel_item, 1)[0]
+
+
+    def top_vid_ids(self, request: callable, channel_item: dict, count: int) -> [str]:
+        search_data = request(*youtube_requests.most_popular_vid_search_request(channel_item['id'], count))
+        video_ids = [item['id']['videoId'] for item in search_data['items']]
+
+        if not video_ids:
+            raise IndexError('channel ' + channel_item['id'] + ' has no videos')
+
+        return video_ids
+
+
+class UploadsPlaylistResolver:
+    '''
+    Walks the channel's uploads playlist 50 videos at a time and ranks each page
+    with one videos.list call. It costs 2 quota units per 50 uploads, which is
+    cheaper than a search for channels with up to 2500 videos.
+    '''
+    def quota_cost(self, channel_item: dict) -> int:
+        page_count = max(math.ceil(int(channel_item['statistics']['videoCount']) / MAX_RESULTS_PER_PAGE), 1)
+        return page_count * (quota_cost('playlistItems') + quota_cost('videos'))
+
+
+    def most_popular_vid_id(self, request: callable, channel_item: dict) -> str:
+        return self.top_vid_ids(request, channel_item, 1)[0]
+
+
+    def top_vid_ids(self, request: callable, channel_item: dict, count: int) -> [str]:
+        # A channel's uploads playlist id is its channel id with "UC" replaced by "UU"
+        playlist_id = 'UU' + channel_item['id'][2:]
+        page_token = None
+        top_vids = []
+
+        while True:
+            playlist_data = request(*youtube_requests.playlist_videos_request(playlist_id, page_token,
+                                                                              MAX_RESULTS_PER_PAGE))
+            video_ids = [item['contentDetails']['videoId'] for item in playlist_data.get('items', [])]
+
+            if video_ids:
+                video_data = request(*youtube_requests.video_views_request(video_ids))
+
+                page_vids = [(int(item['statistics'].get('viewCount', 0)), item['id']) for item in video_data['items']]
+
+                # Only the count most viewed videos seen so far are kept
+                top_vids = heapq.nlargest(count, top_vids + page_vids)
+
+            if 'nextPageToken' not in playlist_data:
+                break
+
+            page_token = playlist_data['nextPageToken']
+
+        if not top_vids:
+            raise IndexError('channel ' + channel_item['id'] + ' has no videos')
+
+        return [video_id for views, video_id in top_vids]
+
+
+class AdaptiveResolver:
+    '''
+    Picks between a search and the uploads playlist walk by the quota left
+    today. While more than search_reserve units are left, channels whose walk
+    would take more than MAX_FAST_WALK_PAGES pages are searched, trading quota
+    for fewer requests. Below the reserve, whichever costs fewer units is used,
+    which is the walk for all but the largest channels. Once a search can no
+    longer be paid for, only the walk is used, as it is paid a page at a time,
+    and a channel whose walk costs more than the quota left is not looked up
+    at all, since the walk would spend the rest of the quota and still fail.
+    '''
+    def __init__(self, ledger: QuotaLedger, search_reserve: int = SEARCH_QUOTA_RESERVE) -> None:
+        self._ledger = ledger
+        self._search_reserve = search_reserve
+        self._search_resolver = SearchResolver()
+        self._uploads_resolver = UploadsPlaylistResolver()
+
+
+    def quota_cost(self, channel_item: dict) -> int:
+        return self._choose(channel_item).quota_cost(channel_item)
+
+
+    def most_popular_vid_id(self, request: callable, channel_item: dict) -> str:
+        return self._choose(channel_item).most_popular_vid_id(request, channel_item)
+
+
+    def top_vid_ids(self, request: callable, channel_item: dict, count: int) -> [str]:
+        return self._choose(channel_item).top_vid_ids(request, channel_item, count)
+
+
+    def _choose(self, channel_item: dict) -> object:
+        uploads_cost = self._uploads_resolver.quota_cost(channel_item)
+        search_cost = self._search_resolver.quota_cost(channel_item)
+        remaining = self._ledger.remaining()
+
+        if remaining < search_cost:
+            if uploads_cost > remaining:
+                raise QuotaExceededError('uploads of ' + channel_item['id'])
+
+            return self._uploads_resolver
+
+        walk_pages = uploads_cost // (quota_cost('playlistItems') + quota_cost('videos'))
+
+        if remaining > self._search_reserve and walk_pages > MAX_FAST_WALK_PAGES:
+            return self._search_resolver
+
+        return self._uploads_resolver if uploads_cost <= search_cost else self._search_resolver
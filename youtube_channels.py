@@ -1,87 +1,904 @@
 # Author: Douglas Hong
-# Version: 12/25/2020
+# Version: 10/18/2026
 # youtube_channels.py
 
 
-import json
+import itertools
+import time
+import urllib.error
 import urllib.parse
-import urllib.request
+import youtube_client
+import youtube_requests
+from api_key_pool import ApiKeyPool
 from channel import Channel
+from channel_aggregates import ChannelAggregates
+from channel_store import ChannelStore
+from channel_table import ChannelTable
+from concurrent.futures import ThreadPoolExecutor
+from ingestion_queue import CHANNEL_FETCHED, PENDING, VIDEO_RESOLVED, IngestionQueue, default_worker_id
+from metrics import Metrics
+from quota import QuotaLedger, quota_cost
+from sorted_index import SortedIndex
+from video_resolvers import AdaptiveResolver
+from youtube_client import BASE_YOUTUBE_URL, YouTubeClient
 
 
-BASE_YOUTUBE_URL = 'https://www.googleapis.com/youtube/v3'
+MAX_IDS_PER_REQUEST = 50
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TOP_VID_COUNT = 10
+
+# refresh_all looks up a channel's most popular video again once its other
+# videos have gained this share of that video's views since it was last looked up
+RERESOLVE_VIEW_SHARE = 0.05
+
+# The metrics channels can be ordered and queried by, and the key each is
+# sorted on. Video metrics only include channels whose most popular video
+# data has been loaded. Summed metrics also keep a running total.
+CHANNEL_METRICS = {
+    'name': Channel.name,
+    'subscribers': Channel.subscriber_count,
+    'views': Channel.view_count,
+    'creation_date': Channel.creation_date,
+}
+VIDEO_METRICS = {
+    'like_ratio': Channel.most_popular_vid_likes_ratio,
+    'comments': Channel.most_popular_vid_comments,
+    'video_views': Channel.most_popular_vid_views,
+}
+SUMMED_METRICS = {'subscribers', 'views', 'like_ratio', 'comments', 'video_views'}
+
+
+def parse_channel_url(channel_url: str) -> (str, str):
+    '''
+    This function takes a channel URL, or a bare channel ID or @handle, and
+    returns what kind of reference it holds ('id', 'username', 'handle' or
+    'custom') along with the reference itself. It handles the /channel/,
+    /user/, /c/ and /@handle forms.
+    '''
+    path = urllib.parse.urlsplit(channel_url.strip()).path if '/' in channel_url else channel_url.strip()
+    segments = [segment for segment in path.split('/') if segment != '']
+
+    for i, segment in enumerate(segments[:-1]):
+        if segment == 'channel':
+            return 'id', segments[i + 1]
+        elif segment == 'user':
+            return 'username', segments[i + 1]
+        elif segment == 'c':
+            return 'custom', segments[i + 1]
+
+    for segment in segments:
+        if segment.startswith('@'):
+            return 'handle', urllib.parse.unquote(segment)
+
+    return 'id', segments[-1] if segments else ''
+
+
+class AmbiguousChannelNameError(Exception):
+    '''
+    Raised when a channel is looked up by a name that more than one channel in
+    the list shares. The matching channels are kept in the channels attribute.
+    '''
+    def __init__(self, channel_name: str, channels: [Channel]) -> None:
+        super().__init__(str(len(channels)) + ' channels are named ' + channel_name)
+        self.channels = channels
 
 
 class YouTubeChannels:
-    def __init__(self, api_key: str) -> None:
-        self._api_key = api_key
-        self._channel_list = []
+    '''
+    A list of YouTube channels, fetched with api_key, which is either one API key
+    or an ApiKeyPool to spread requests over several keys.
+    '''
+    def __init__(self, api_key: object, max_workers: int = DEFAULT_MAX_WORKERS,
+                 client: YouTubeClient = None, resolver: object = None, store: ChannelStore = None,
+                 base_url: str = BASE_YOUTUBE_URL) -> None:
+        self._key_pool = api_key if isinstance(api_key, ApiKeyPool) else ApiKeyPool([api_key])
+        self._base_url = base_url
+        self._client = client or youtube_client.default_client()
+        self._metrics = self._client.metrics()
+        self._resolver = resolver or AdaptiveResolver(self._key_pool)
+        self._max_workers = max_workers
+        self._store = store
+        self._fetched_at = {}
+
+        # Counts changes to the list, so views of it can tell when to redraw
+        self._version = 0
+
+        # Channel data is stored column by column in the table; Channel objects
+        # are views of its rows. They are kept by id, in list order, and by
+        # casefolded name.
+        self._table = ChannelTable()
+        self._channels_by_id = {}
+        self._channels_by_name = {}
+        self._sorted_indexes = {metric: SortedIndex(summed = metric in SUMMED_METRICS)
+                                for metric in list(CHANNEL_METRICS) + list(VIDEO_METRICS)}
+        self._aggregates = ChannelAggregates(self._sorted_indexes)
+
+        if store != None:
+            self._load_from_store()
+
+
+    def channel_list(self) -> [Channel]:
+        return list(self._channels_by_id.values())
+
+
+    def channels(self) -> 'dict_values':
+        '''
+        This function returns a read-only view of the channels in list order,
+        without copying the list.
+        '''
+        return self._channels_by_id.values()
+
+
+    def channel_window(self, start: int, count: int) -> [Channel]:
+        '''
+        This function returns up to count channels in list order, starting at
+        position start, without copying the rest of the list.
+        '''
+        return list(itertools.islice(self._channels_by_id.values(), start, start + count))
+
+
+    def channel_count(self) -> int:
+        return len(self._channels_by_id)
+
+
+    def version(self) -> int:
+        '''
+        This function returns a number that changes whenever a channel is added,
+        updated or removed or the list is reordered.
+        '''
+        return self._version
+
+
+    def get_channel(self, channel_id: str) -> Channel:
+        return self._channels_by_id.get(channel_id)
+
+
+    def find_channel(self, channel_name: str) -> Channel:
+        '''
+        This function returns the channel with the given name, ignoring case, or
+        None if there is none. It raises AmbiguousChannelNameError if several
+        channels have that name.
+        '''
+        channels = self._channels_by_name.get(channel_name.casefold(), {})
 
+        if len(channels) > 1:
+            raise AmbiguousChannelNameError(channel_name, list(channels.values()))
 
-    def channel_list(self) -> [str]:
-        return self._channel_list[:]
+        return next(iter(channels.values()), None)
+
+
+    def channels_without_most_popular_vid(self) -> [Channel]:
+        if len(self._sorted_indexes['video_views']) == len(self._channels_by_id):
+            return []
+
+        return [channel for channel in self._channels_by_id.values()
+                if not channel.has_most_popular_vid() and not channel.most_popular_vid_not_found()]
+
+
+    def aggregates(self) -> ChannelAggregates:
+        return self._aggregates
+
+
+    def top_k(self, metric: str, k: int) -> [Channel]:
+        '''
+        This function returns the k channels with the highest value of the metric,
+        highest first, in O(k) time.
+        '''
+        return [self._channels_by_id[channel_id] for channel_id in self._sorted_index(metric).last(k)]
+
+
+    def bottom_k(self, metric: str, k: int) -> [Channel]:
+        '''
+        This function returns the k channels with the lowest value of the metric,
+        lowest first, in O(k) time.
+        '''
+        return [self._channels_by_id[channel_id] for channel_id in self._sorted_index(metric).first(k)]
+
+
+    def range(self, metric: str, lo: object, hi: object) -> [Channel]:
+        '''
+        This function returns the channels whose value of the metric is between lo
+        and hi inclusive, in ascending order, found by binary search.
+        '''
+        return [self._channels_by_id[channel_id] for channel_id in self._sorted_index(metric).between(lo, hi)]
+
+
+    def quota_ledger(self) -> QuotaLedger:
+        return self._client.quota_ledger()
+
+
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+
+    def key_pool(self) -> ApiKeyPool:
+        return self._key_pool
+
+
+    def resolve_channel_id(self, channel_url: str) -> str:
+        '''
+        This function returns the ID of the channel a URL refers to, requesting it
+        from the API unless the URL already contains it. It returns None if no
+        channel matches. Custom /c/ URLs can only be resolved by a search, which
+        costs 100 quota units.
+        '''
+        kind, reference = parse_channel_url(channel_url)
+
+        if kind == 'id':
+            return reference
+        elif kind == 'username':
+            channel_data = self._request(*youtube_requests.channel_by_username_request(reference))
+        elif kind == 'handle':
+            channel_data = self._request(*youtube_requests.channel_by_handle_request(reference))
+        else:
+            search_data = self._request(*youtube_requests.channel_search_request(reference))
+            return search_data['items'][0]['id']['channelId'] if search_data.get('items') else None
+
+        return channel_data['items'][0]['id'] if channel_data.get('items') else None
 
 
     def add_channel(self, channel_id: str) -> None:
-        channel_data = self._get_data(self._build_channel_data_url(channel_id))
-        most_popular_vid_id = self._get_data(self._build_most_popular_vid_url(channel_id))['items'][0]['id']['videoId']
-        most_popular_vid_data = self._get_data(self._build_most_popular_vid_data(most_popular_vid_id))
+        '''
+        This function adds one channel, or updates its channel data if it is already
+        in the list. Its most popular video is not requested until it is needed;
+        see load_most_popular_vids.
+        '''
+        start = self._metrics.start()
+        channel_data = self._request(*youtube_requests.channels_request([channel_id]))
+        self._save_channels([channel_data['items'][0]])
+        self._metrics.observe_stage('add_channel', start)
 
-        self._channel_list.append(Channel(channel_data, most_popular_vid_data, channel_id))
 
+    def add_channels(self, channel_ids: [str]) -> [str]:
+        '''
+        This function adds many channels at once, requesting channel data in batches
+        of up to 50 ids per call and running up to max_workers requests concurrently.
+        Channels are added in the order of channel_ids; ids already in the list are
+        skipped without a request. It returns the ids that could not be added because
+        they are missing or invalid.
+        '''
+        start = self._metrics.start()
+        new_ids = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id not in self._channels_by_id]
+        channel_items = self._fetch_channel_items(new_ids)
 
-    def delete_channel(self, channel_name: str) -> None:
-        for i in range(len(self._channel_list)):
-            if self._channel_list[i].name().casefold() == channel_name.casefold():
-                del self._channel_list[i]
+        self._save_channels([channel_items[channel_id] for channel_id in new_ids if channel_id in channel_items])
+        self._metrics.observe_stage('add_channels', start)
+
+        return [channel_id for channel_id in new_ids if channel_id not in channel_items]
+
+
+    def ingest(self, queue: IngestionQueue, videos: bool = False, worker_id: str = None,
+               on_done: callable = None) -> [str]:
+        '''
+        This function drains an ingestion queue, adding its channels to the list.
+        Batches of ids are claimed, their channel data is requested 50 ids per call
+        and, if videos is True, their most popular videos are found, with every
+        step journaled in the queue before the next one starts. A batch is marked
+        done once it is in the list and the store, after on_done, if given, has
+        been called with its channels. Other threads and processes may drain the
+        same queue at once.
+
+        It stops when no unclaimed work is left or every API key is out of quota,
+        so it can be called again later to resume. It returns the ids it marked as
+        failed because the API does not return them or their requests kept failing.
+        '''
+        start = self._metrics.start()
+        worker_id = worker_id or default_worker_id()
+        batch_size = MAX_IDS_PER_REQUEST * self._max_workers
+        failed_ids = []
+
+        while not self._key_pool.is_exhausted():
+            # Later steps go first, so claimed work is finished before more is started
+            finished = self._finish_ingestion(queue, queue.claim(VIDEO_RESOLVED, batch_size, worker_id), worker_id,
+                                              on_done)
+            resolved = self._ingest_videos(queue, queue.claim(CHANNEL_FETCHED, batch_size, worker_id), worker_id,
+                                           videos)
+            fetched = self._ingest_channels(queue, queue.claim(PENDING, batch_size, worker_id), worker_id, failed_ids)
+
+            if not (finished or resolved or fetched):
                 break
 
+        self._metrics.observe_stage('ingest', start)
+
+        return failed_ids
+
+
+    def refresh(self, stale_after: float) -> [str]:
+        '''
+        This function requests the channel data again, in batches of up to 50 ids
+        per call, for every channel fetched more than stale_after seconds ago.
+        Cached responses are revalidated rather than trusted, so a refreshed
+        channel's data is current. It returns the ids of the stale channels the
+        API no longer returns.
+        '''
+        fetched_before = time.time() - stale_after
+
+        if self._store != None:
+            stale_ids = self._store.stale_channel_ids(fetched_before)
+        else:
+            stale_ids = [channel_id for channel_id, fetched_at in self._fetched_at.items() if fetched_at < fetched_before]
+
+        channel_items = self._fetch_channel_items(stale_ids, revalidate = True)
+        self._save_channels([channel_items[channel_id] for channel_id in stale_ids if channel_id in channel_items])
+
+        return [channel_id for channel_id in stale_ids if channel_id not in channel_items]
+
+
+    def refresh_all(self) -> [str]:
+        '''
+        This function refreshes the channel data of every channel, and the most
+        popular video data of those that have it, for as little quota as possible.
+        Channels and their known most popular videos are requested again in
+        batches of 50 ids. A channel's most popular video is only looked up again,
+        which costs a search or a walk of its uploads, if its statistics changed
+        enough since the last lookup that another video may have overtaken it.
+        Cached responses are
+        revalidated, as in refresh. It returns the ids of the channels the API no
+        longer returns.
+        '''
+        start = self._metrics.start()
+        channel_ids, known_stats = self._refresh_all_targets()
+
+        channel_items = self._fetch_channel_items(channel_ids, revalidate = True)
+        self._save_channels([channel_items[channel_id] for channel_id in channel_ids if channel_id in channel_items])
+
+        vid_items = self._fetch_video_items(list(dict.fromkeys(vid_id for _, vid_id, _, _ in known_stats.values())),
+                                            revalidate = True)
+        refreshed_vid_items = {}
+        changed_channels = []
+
+        for channel_id, (channel, vid_id, view_count, vid_views) in known_stats.items():
+            if channel_id not in channel_items:
+                continue
+
+            if self._may_have_new_most_popular_vid(view_count, vid_views, channel_items[channel_id],
+                                                   vid_items.get(vid_id)):
+                changed_channels.append(channel)
+            else:
+                refreshed_vid_items[channel_id] = vid_items[vid_id]
+
+        resolved_vid_items = self._resolve_most_popular_vid_items(changed_channels, vid_items, revalidate = True)
+
+        # Channels whose videos could not be looked up again keep the known video
+        # and the baseline of its last lookup
+        for channel in changed_channels:
+            channel_id = channel.channel_id()
+            vid_id = known_stats[channel_id][1]
+
+            if channel_id not in resolved_vid_items and vid_id in vid_items:
+                refreshed_vid_items[channel_id] = vid_items[vid_id]
+
+        self._set_most_popular_vid_items([(known_stats[channel_id][0], vid_item)
+                                          for channel_id, vid_item in refreshed_vid_items.items()], resolved = False)
+        self._set_most_popular_vid_items([(known_stats[channel_id][0], vid_item)
+                                          for channel_id, vid_item in resolved_vid_items.items()])
+        self._metrics.observe_stage('refresh_all', start)
+
+        return [channel_id for channel_id in channel_ids if channel_id not in channel_items]
+
+
+    def load_most_popular_vids(self, channels: [Channel]) -> None:
+        '''
+        This function requests the most popular video data of every given channel
+        that does not have it yet, resolving the videos concurrently and requesting
+        their data in batches of up to 50 ids per call. Channels whose videos cannot
+        be found are left without most popular video data, and are skipped by later
+        calls until their channel data is refreshed.
+        '''
+        start = self._metrics.start()
+        channels = [channel for channel in channels
+                    if not channel.has_most_popular_vid() and not channel.most_popular_vid_not_found()]
+        vid_items = self._resolve_most_popular_vid_items(channels)
+
+        self._set_most_popular_vid_items([(channel, vid_items[channel.channel_id()]) for channel in channels
+                                          if channel.channel_id() in vid_items])
+        self._set_most_popular_vids_not_found([channel for channel in channels
+                                               if channel.channel_id() not in vid_items])
+        self._metrics.observe_stage('load_most_popular_vids', start)
+
+
+    def load_top_vids(self, channels: [Channel], count: int = DEFAULT_TOP_VID_COUNT) -> None:
+        '''
+        This function finds the count most viewed videos of every given channel
+        and requests all of their data together, in batches of up to 50 ids per
+        call, so a channel's videos cost one videos.list call or less. Each
+        channel keeps the distribution of its videos' statistics, and its most
+        viewed video becomes its most popular video. Channels whose videos cannot
+        be found are left unchanged. With a store, the top videos are saved with
+        their channel, so later sessions do not look them up again.
+        '''
+        start = self._metrics.start()
+        channel_items = [{'id': channel.channel_id(), 'statistics': {'videoCount': channel.video_count()}}
+                         for channel in channels]
+
+        with ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            top_vid_ids = list(executor.map(lambda channel_item: self._try_get_top_vid_ids(channel_item, count),
+                                            channel_items))
+
+        vid_items = self._fetch_video_items(list(dict.fromkeys(vid_id for vid_ids in top_vid_ids for vid_id in vid_ids)))
+        top_vid_items = []
+
+        for channel, vid_ids in zip(channels, top_vid_ids):
+            channel_vid_items = [vid_items[vid_id] for vid_id in vid_ids if vid_id in vid_items]
+
+            if channel_vid_items:
+                top_vid_items.append((channel, channel_vid_items))
+
+        self._set_top_vid_items(top_vid_items)
+        self._set_most_popular_vids_not_found([channel for channel, vid_ids in zip(channels, top_vid_ids)
+                                               if not vid_ids])
+        self._metrics.observe_stage('load_top_vids', start)
+
+
+    def delete_channel(self, channel_name: str) -> None:
+        '''
+        This function removes the channel with the given name, ignoring case. It
+        raises AmbiguousChannelNameError if several channels have that name.
+        '''
+        channel = self.find_channel(channel_name)
+
+        if channel != None:
+            self.delete_channel_by_id(channel.channel_id())
+
+
+    def delete_channel_by_id(self, channel_id: str) -> None:
+        channel = self._channels_by_id.pop(channel_id, None)
+
+        if channel == None:
+            return
+
+        self._unindex(channel)
+        del self._fetched_at[channel_id]
+        self._version += 1
+
+        if self._store != None:
+            self._store.delete_channel(channel_id)
+
 
     def sort_by_name(self, reverse: bool) -> None:
-        self._channel_list.sort(key = lambda channel: channel.name(), reverse = reverse)
+        self._sort('name', reverse)
 
 
     def sort_by_subscribers(self, reverse: bool) -> None:
-        self._channel_list.sort(key = lambda channel: channel.subscriber_count(), reverse = reverse)
+        self._sort('subscribers', reverse)
 
 
     def sort_by_views(self, reverse: bool) -> None:
-        self._channel_list.sort(key = lambda channel: channel.view_count(), reverse = reverse)
-        
+        self._sort('views', reverse)
+
+
+    def _sort(self, metric: str, reverse: bool) -> None:
+        '''
+        This function reorders the channel list by a channel metric in O(n) time,
+        reading the order from the metric's sorted index.
+        '''
+        start = self._metrics.start()
+        channel_ids = self._sorted_index(metric).ids(reverse)
+        self._channels_by_id = {channel_id: self._channels_by_id[channel_id] for channel_id in channel_ids}
+        self._version += 1
+        self._metrics.observe_stage('sort', start)
 
-    def _build_channel_data_url(self, channel_id: str) -> str:
-        query_parameters = [('part', 'statistics, snippet'), ('id', channel_id), ('key', self._api_key)]
+        if self._store != None:
+            self._store.save_order(list(self._channels_by_id))
 
-        return BASE_YOUTUBE_URL + '/channels?' + urllib.parse.urlencode(query_parameters)
 
+    def _save_channels(self, channel_items: [dict]) -> None:
+        '''
+        This function adds a Channel for every item whose id is not in the list yet
+        and updates the channel data of the others in place.
+        '''
+        start = self._metrics.start()
+        fetched_at = time.time()
+
+        self._index([self._put_channel(channel_item, None, fetched_at) for channel_item in channel_items])
+        self._metrics.observe_stage('build_channels', start)
+
+        if self._store != None:
+            self._store.save_channels(channel_items, fetched_at)
 
-    def _build_most_popular_vid_url(self, channel_id: str) -> str:
-        query_parameters = [('part', 'snippet'), ('channelId', channel_id), ('key', self._api_key),
-                            ('order', 'viewCount'), ('type', 'video'), ('maxResults', 10),
-                            ('safeSearch', 'none')]
 
-        return BASE_YOUTUBE_URL + '/search?' + urllib.parse.urlencode(query_parameters)
+    def _load_from_store(self) -> None:
+        channels = []
 
+        for channel_item, vid_item, fetched_at, baseline, top_vid_items in self._store.load():
+            channel = self._put_channel(channel_item, vid_item, fetched_at)
 
-    def _build_most_popular_vid_data(self, video_id: str) -> str:
-        query_parameters = [('part', 'statistics,snippet'), ('id', video_id), ('key', self._api_key)]
+            if top_vid_items != None:
+                channel.set_top_vids_data({'items': top_vid_items})
 
-        return BASE_YOUTUBE_URL + '/videos?' + urllib.parse.urlencode(query_parameters)
+            # Videos stored before baselines were kept count as looked up now
+            if baseline != None:
+                channel.set_resolution_baseline(*baseline)
+            elif vid_item != None:
+                channel.set_resolution_baseline(channel.view_count(), channel.most_popular_vid_views())
 
+            channels.append(channel)
 
-    def _get_data(self, url: str) -> dict:
+        self._index(channels)
+
+
+    def _put_channel(self, channel_item: dict, vid_item: dict, fetched_at: float) -> Channel:
         '''
-        This function takes a URL and returns a Python dictionary representing the
-        parsed JSON response.
+        This function adds or updates a channel and returns it. It is left out of
+        the indexes until the caller passes it to _index with the rest of its batch.
         '''
-        response = None
+        channel_id = channel_item['id']
+        channel = self._channels_by_id.get(channel_id)
+
+        if channel == None:
+            vid_data = {'items': [vid_item]} if vid_item != None else None
+            channel = Channel({'items': [channel_item]}, vid_data, channel_id, self._most_popular_vid_loader(),
+                              self._table)
+            self._channels_by_id[channel_id] = channel
 
+        else:
+            self._unindex_name(channel)
+            channel.set_channel_data({'items': [channel_item]})
+
+        self._fetched_at[channel_id] = fetched_at
+        self._version += 1
+
+        return channel
+
+
+    def _most_popular_vid_loader(self) -> callable:
+        return self.load_most_popular_vids
+
+
+    def _index(self, channels: [Channel]) -> None:
+        '''
+        This function adds or moves the given channels in the name and sorted
+        indexes. Each sorted index takes the whole batch at once, so adding k
+        channels to a list of n takes O(n + k log k) time rather than O(k n).
+        '''
+        for channel in channels:
+            self._channels_by_name.setdefault(channel.name().casefold(), {})[channel.channel_id()] = channel
+
+        for metric, key in CHANNEL_METRICS.items():
+            self._sorted_indexes[metric].add_many([(channel.channel_id(), key(channel)) for channel in channels])
+
+        self._index_video_metrics([channel for channel in channels if channel.has_most_popular_vid()])
+
+
+    def _index_video_metrics(self, channels: [Channel]) -> None:
+        for metric, key in VIDEO_METRICS.items():
+            self._sorted_indexes[metric].add_many([(channel.channel_id(), key(channel)) for channel in channels])
+
+
+    def _unindex(self, channel: Channel) -> None:
+        self._unindex_name(channel)
+
+        for sorted_index in self._sorted_indexes.values():
+            sorted_index.remove(channel.channel_id())
+
+
+    def _unindex_name(self, channel: Channel) -> None:
+        name_key = channel.name().casefold()
+        channels = self._channels_by_name.get(name_key, {})
+        channels.pop(channel.channel_id(), None)
+
+        if not channels:
+            self._channels_by_name.pop(name_key, None)
+
+
+    def _sorted_index(self, metric: str) -> SortedIndex:
+        if metric not in self._sorted_indexes:
+            raise ValueError('there is no metric named ' + metric)
+
+        return self._sorted_indexes[metric]
+
+
+    def _fetch_channel_items(self, channel_ids: [str], revalidate: bool = False) -> dict:
+        '''
+        This function requests the channel data of many channels, 50 ids per call
+        and up to max_workers calls at once, and returns their items keyed by
+        channel id. Channels that could not be requested are left out.
+        '''
+        channel_items = {}
+
+        with ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            for items in executor.map(lambda batch: self._get_channel_items(batch, revalidate),
+                                      self._split_into_batches(channel_ids)):
+                channel_items.update(items)
+
+        return channel_items
+
+
+    def _fetch_video_items(self, video_ids: [str], revalidate: bool = False) -> dict:
+        video_items = {}
+
+        with ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            for items in executor.map(lambda batch: self._get_video_items(batch, revalidate),
+                                      self._split_into_batches(video_ids)):
+                video_items.update(items)
+
+        return video_items
+
+
+    def _resolve_most_popular_vid_items(self, channels: [Channel], known_vid_items: dict = None,
+                                        revalidate: bool = False) -> dict:
+        '''
+        This function finds the most popular video of every given channel, up to
+        max_workers at once, and returns the videos' items keyed by channel id. Only
+        videos missing from known_vid_items are requested. Channels whose videos
+        cannot be found are left out.
+        '''
+        return self._resolve_vid_items([{'id': channel.channel_id(), 'statistics': {'videoCount': channel.video_count()}}
+                                        for channel in channels], known_vid_items, revalidate)
+
+
+    def _resolve_vid_items(self, channel_items: [dict], known_vid_items: dict = None,
+                           revalidate: bool = False) -> dict:
+        known_vid_items = known_vid_items or {}
+
+        with ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            vid_ids = list(executor.map(lambda channel_item: self._try_get_most_popular_vid_id(channel_item, revalidate),
+                                        channel_items))
+
+        unique_vid_ids = list(dict.fromkeys(vid_id for vid_id in vid_ids if vid_id != None))
+        vid_items = self._fetch_video_items([vid_id for vid_id in unique_vid_ids if vid_id not in known_vid_items],
+                                            revalidate)
+        vid_items.update(known_vid_items)
+
+        return {channel_item['id']: vid_items[vid_id] for channel_item, vid_id in zip(channel_items, vid_ids)
+                if vid_id in vid_items}
+
+
+    def _refresh_all_targets(self) -> ([str], dict):
+        '''
+        This function returns the ids of every channel and, keyed by the ids of
+        those with a most popular video, each channel with its video id and the
+        resolution baseline that refresh_all compares against.
+        '''
+        return list(self._channels_by_id), {channel_id: (channel, channel.most_popular_vid_id()) +
+                                                        channel.resolution_baseline()
+                                            for channel_id, channel in self._channels_by_id.items()
+                                            if channel.has_most_popular_vid()}
+
+
+    def _set_top_vid_items(self, channel_vid_items: [(Channel, [dict])]) -> None:
+        '''
+        This function sets the top videos data of each channel, whose most viewed
+        video becomes its most popular video, and saves it to the store.
+        '''
+        for channel, vid_items in channel_vid_items:
+            channel.set_top_vids_data({'items': vid_items})
+
+        if self._store != None and channel_vid_items:
+            self._store.save_top_vids({channel.channel_id(): vid_items for channel, vid_items in channel_vid_items})
+
+        self._set_most_popular_vid_items([(channel, vid_items[0]) for channel, vid_items in channel_vid_items])
+
+
+    def _set_most_popular_vid_items(self, channel_vid_items: [(Channel, dict)], resolved: bool = True) -> None:
+        '''
+        This function sets the most popular video data of each channel, reindexes
+        the video metrics of those in the list and saves the data to the store.
+        If resolved is True, the videos were just looked up, so each channel's
+        current view count and video views become its resolution baseline.
+        '''
+        listed_channels = []
+        baselines = {}
+
+        for channel, vid_item in channel_vid_items:
+            channel.set_most_popular_vid_data({'items': [vid_item]})
+
+            if resolved:
+                baselines[channel.channel_id()] = (channel.view_count(), channel.most_popular_vid_views())
+                channel.set_resolution_baseline(*baselines[channel.channel_id()])
+
+            if self._channels_by_id.get(channel.channel_id()) is channel:
+                listed_channels.append(channel)
+                self._version += 1
+
+        self._index_video_metrics(listed_channels)
+
+        if self._store != None and channel_vid_items:
+            self._store.save_most_popular_vids({channel.channel_id(): vid_item for channel, vid_item in channel_vid_items},
+                                               baselines)
+
+
+    def _ingest_channels(self, queue: IngestionQueue, claimed: [(str, dict, dict)], worker_id: str,
+                         failed_ids: [str]) -> bool:
+        '''
+        This function requests the channel data of claimed pending ids and moves
+        them to channel_fetched. Ids the API does not return are marked as failed,
+        and ids whose requests failed are released to be tried again.
+        '''
+        channel_ids = [channel_id for channel_id, _, _ in claimed]
+
+        with ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            batches = self._split_into_batches(channel_ids)
+            results = list(executor.map(self._try_get_channel_items, batches))
+
+        channel_items = [item for items in results if items != None for item in items.values()]
+        returned_ids = {item['id'] for item in channel_items}
+        missing_ids = [channel_id for batch, items in zip(batches, results) if items != None
+                       for channel_id in batch if channel_id not in returned_ids]
+        unrequested_ids = [channel_id for batch, items in zip(batches, results) if items == None for channel_id in batch]
+
+        queue.mark_channels_fetched(channel_items, worker_id)
+        queue.mark_failed(missing_ids, 'not found', worker_id)
+        failed_ids.extend(missing_ids)
+
+        # Requests refused for lack of quota are not counted against the ids
+        failed_ids.extend(queue.release(unrequested_ids, worker_id, failed_attempt = not self._key_pool.is_exhausted()))
+
+        return bool(claimed)
+
+
+    def _ingest_videos(self, queue: IngestionQueue, claimed: [(str, dict, dict)], worker_id: str,
+                       videos: bool) -> bool:
+        '''
+        This function finds the most popular video of each claimed channel_fetched
+        channel, if videos is True, and moves them to video_resolved. Looking up a
+        whole claim can outlast its lease, so channels are looked up 50 at a time
+        and the claim on the rest is renewed before each lookup. Channels another
+        worker took over meanwhile are left to it. If the quota runs low, channels
+        whose videos were not found are released, so they are looked up again once
+        it resets.
+        '''
+        if not videos:
+            queue.mark_videos_resolved({channel_id: None for channel_id, _, _ in claimed}, worker_id)
+            return bool(claimed)
+
+        channel_items = {channel_id: channel_item for channel_id, channel_item, _ in claimed}
+        held_ids = list(channel_items)
+
+        while held_ids:
+            held_ids = queue.renew(held_ids, worker_id)
+            batch_ids = held_ids[:MAX_IDS_PER_REQUEST]
+            vid_items = self._resolve_vid_items([channel_items[channel_id] for channel_id in batch_ids])
+
+            if self._is_short_of_quota():
+                queue.release([channel_id for channel_id in held_ids if channel_id not in vid_items], worker_id)
+                queue.mark_videos_resolved(vid_items, worker_id)
+                return bool(vid_items)
+
+            queue.mark_videos_resolved({channel_id: vid_items.get(channel_id) for channel_id in batch_ids}, worker_id)
+            held_ids = held_ids[MAX_IDS_PER_REQUEST:]
+
+        return bool(claimed)
+
+
+    def _finish_ingestion(self, queue: IngestionQueue, claimed: [(str, dict, dict)], worker_id: str,
+                          on_done: callable) -> bool:
+        '''
+        This function adds claimed video_resolved channels to the list from their
+        journaled data, without any requests, and marks them done.
+        '''
+        channels = self._add_ingested_channels(claimed)
+
+        if on_done != None and claimed:
+            on_done(channels)
+
+        queue.mark_done([channel_id for channel_id, _, _ in claimed], worker_id)
+
+        return bool(claimed)
+
+
+    def _add_ingested_channels(self, claimed: [(str, dict, dict)]) -> [Channel]:
+        self._save_channels([channel_item for _, channel_item, _ in claimed])
+        self._set_most_popular_vid_items([(self._channels_by_id[channel_id], vid_item)
+                                          for channel_id, _, vid_item in claimed if vid_item != None])
+
+        return [self._channels_by_id[channel_id] for channel_id, _, _ in claimed]
+
+
+    def _set_most_popular_vids_not_found(self, channels: [Channel]) -> None:
+        '''
+        This function remembers that the given channels' videos were not found,
+        so they are not looked up again until their channel data is refreshed.
+        Lookups that may have failed for lack of quota are not remembered.
+        '''
+        if self._is_short_of_quota():
+            return
+
+        for channel in channels:
+            channel.set_most_popular_vid_not_found()
+
+
+    def _is_short_of_quota(self) -> bool:
+        '''
+        This function returns whether the quota left cannot pay for a search, so a
+        failed video lookup may have been skipped or refused for lack of quota
+        rather than finding no videos.
+        '''
+        return self._key_pool.is_exhausted() or self._key_pool.remaining() < quota_cost('search')
+
+
+    def _may_have_new_most_popular_vid(self, view_count: int, vid_views: int, channel_item: dict,
+                                       vid_item: dict) -> bool:
+        '''
+        This function guesses whether a channel's most popular video may have
+        changed since it was last looked up, when the channel had view_count
+        views and the video had vid_views. Another video, old or newly uploaded,
+        can only overtake it by gaining views, so the video is looked up again
+        once the channel's other videos have gained at least RERESOLVE_VIEW_SHARE
+        of its views between them since then, or when the video is gone.
+
+        The test is approximate. The runner-up's views are not known, so a video
+        within a few views of the leader can overtake it with a smaller gain. As
+        gains are counted from the last lookup rather than the last refresh, the
+        overtake is found once the gains of the refreshes since add up.
+        '''
+        if vid_item == None:
+            return True
+
+        channel_views_gained = int(channel_item['statistics']['viewCount']) - view_count
+        new_vid_views = int(vid_item['statistics']['viewCount'])
+        other_views_gained = channel_views_gained - (new_vid_views - vid_views)
+
+        return other_views_gained >= RERESOLVE_VIEW_SHARE * new_vid_views
+
+
+    def _get_channel_items(self, channel_ids: [str], revalidate: bool = False) -> dict:
+        '''
+        This function requests up to 50 channels in one call and returns their
+        items keyed by channel id. Ids the API does not recognize are left out.
+        '''
+        return self._try_get_channel_items(channel_ids, revalidate) or {}
+
+
+    def _try_get_channel_items(self, channel_ids: [str], revalidate: bool = False) -> dict:
         try:
-            request = urllib.request.Request(url)
-            response = urllib.request.urlopen(request)
-            json_text = response.read().decode(encoding = 'utf-8')
-            return json.loads(json_text)
-
-        finally:
-            if response != None:
-                response.close()
+            channel_data = self._request(*youtube_requests.channels_request(channel_ids), revalidate = revalidate)
+        except urllib.error.HTTPError:
+            return None
+
+        return {item['id']: item for item in channel_data.get('items', [])}
+
+
+    def _get_video_items(self, video_ids: [str], revalidate: bool = False) -> dict:
+        try:
+            video_data = self._request(*youtube_requests.videos_request(video_ids), revalidate = revalidate)
+        except urllib.error.HTTPError:
+            return {}
+
+        return {item['id']: item for item in video_data.get('items', [])}
+
+
+    def _get_most_popular_vid_id(self, channel_item: dict, revalidate: bool = False) -> str:
+        return self._resolver.most_popular_vid_id(self._revalidating_request if revalidate else self._request,
+                                                  channel_item)
+
+
+    def _try_get_most_popular_vid_id(self, channel_item: dict, revalidate: bool = False) -> str:
+        try:
+            return self._get_most_popular_vid_id(channel_item, revalidate)
+        except (urllib.error.HTTPError, IndexError, KeyError):
+            return None
+
+
+    def _try_get_top_vid_ids(self, channel_item: dict, count: int) -> [str]:
+        try:
+            return self._resolver.top_vid_ids(self._request, channel_item, count)
+        except (urllib.error.HTTPError, IndexError, KeyError):
+            return []
+
+
+    def _split_into_batches(self, ids: [str]) -> [[str]]:
+        return [ids[start:start + MAX_IDS_PER_REQUEST] for start in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+
+
+    def _request(self, endpoint: str, query_parameters: [(str, str)], revalidate: bool = False) -> dict:
+        start = self._metrics.start()
+        data = self._get_data(youtube_requests.build_url(endpoint, query_parameters, base_url = self._base_url),
+                              revalidate)
+        self._metrics.observe_stage('get_data', start)
+
+        return data
+
+
+    def _revalidating_request(self, endpoint: str, query_parameters: [(str, str)]) -> dict:
+        return self._request(endpoint, query_parameters, revalidate = True)
+
+
+    def _get_data(self, url: str, revalidate: bool = False) -> dict:
+        '''
+        This function takes a URL and returns a Python dictionary representing the
+        parsed JSON response, sending it with a key from the key pool. Refreshes
+        pass revalidate, so a cached response is only used once the API confirms
+        it is still current.
+        '''
+        return self._client.get_data(url, self._key_pool, revalidate)
@@ -0,0 +1,296 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# youtube_client.py
+
+
+import gzip
+import http.client
+import io
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+from api_key_pool import ApiKeyPool
+from metrics import Metrics
+from quota import QuotaLedger
+from rate_limiter import (QuotaCircuitBreaker, QuotaExceededError, RetryPolicy, TokenBucket, classify_response,
+                          retry_after)
+from response_cache import ResponseCache
+
+
+# Set YOUTUBE_API_BASE_URL to send requests somewhere else, such as to a
+# MockYouTubeAPI from mock_youtube_api.py
+BASE_YOUTUBE_URL = os.environ.get('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
+MAX_IDLE_CONNECTIONS = 16
+TIMEOUT = 30
+
+
+class YouTubeClient:
+    '''
+    An HTTP client that keeps connections to the YouTube API alive between
+    requests, asks for gzip-compressed responses and parses the JSON bodies
+    directly from bytes. When given a ResponseCache, fresh cached responses are
+    returned without a request and stale ones are revalidated by ETag. Every
+    request sent is charged to a QuotaLedger and, if enabled, timed and counted
+    in a Metrics. It is safe to share between threads.
+
+    Requests wait for the rate limiter, if one is given, and are retried after
+    transient errors, throttling and dropped connections as the RetryPolicy
+    allows. Once the API reports that the daily quota has run out, the circuit
+    breaker makes every request fail with QuotaExceededError until it resets.
+    '''
+    def __init__(self, max_idle_connections: int = MAX_IDLE_CONNECTIONS, timeout: float = TIMEOUT,
+                 cache: ResponseCache = None, ledger: QuotaLedger = None, metrics: Metrics = None,
+                 rate_limiter: TokenBucket = None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: QuotaCircuitBreaker = None) -> None:
+        self._cache = cache
+        self._ledger = ledger or QuotaLedger()
+        self._metrics = metrics or Metrics()
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker or QuotaCircuitBreaker()
+        self._max_idle_connections = max_idle_connections
+        self._timeout = timeout
+        self._idle_connections = {}
+        self._lock = threading.Lock()
+
+
+    def get_data(self, url: str, key_pool: ApiKeyPool = None, revalidate: bool = False) -> dict:
+        '''
+        This function takes a URL and returns a Python dictionary representing the
+        parsed JSON response. If a key pool is given, the URL is sent without a key
+        and each attempt adds the key the pool picks. If revalidate is True, a
+        cached response is never returned without asking the API whether it is
+        still current. It raises urllib.error.HTTPError if the response status is
+        not 200 after any retries, and QuotaExceededError if the daily quota has
+        run out.
+        '''
+        if self._cache == None:
+            return self._parse_response(url, *self._request_with_retries(url, None, key_pool))
+
+        entry, is_fresh = self._cache.get(url)
+
+        if is_fresh and not revalidate:
+            self._metrics.observe_cache_hit(url)
+            return entry['data']
+
+        conditional_headers = {}
+
+        if entry != None and entry['etag'] != None:
+            conditional_headers['If-None-Match'] = entry['etag']
+
+        status, headers, body = self._request_with_retries(url, conditional_headers, key_pool)
+
+        if status == 304 and entry != None:
+            self._cache.revalidated(url, entry)
+            return entry['data']
+
+        data = self._parse_response(url, status, headers, body)
+        self._cache.put(url, data, headers.get('Etag', data.get('etag')))
+
+        return data
+
+
+    def cache(self) -> ResponseCache:
+        return self._cache
+
+
+    def quota_ledger(self) -> QuotaLedger:
+        return self._ledger
+
+
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+
+    def rate_limiter(self) -> TokenBucket:
+        return self._rate_limiter
+
+
+    def circuit_breaker(self) -> QuotaCircuitBreaker:
+        return self._circuit_breaker
+
+
+    def request(self, url: str, headers: dict = None) -> (int, dict, bytes):
+        '''
+        This function sends a GET request over a pooled connection and returns the
+        status, the response headers and the decompressed body.
+        '''
+        parsed_url = urllib.parse.urlsplit(url)
+        host_key = (parsed_url.scheme, parsed_url.netloc)
+        path = urllib.parse.urlunsplit(('', '', parsed_url.path, parsed_url.query, ''))
+        request_headers = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+        request_headers.update(headers or {})
+
+        start = self._metrics.start()
+        connection, reused = self._acquire_connection(host_key)
+        self._ledger.record(url)
+
+        try:
+            try:
+                response = self._send(connection, path, request_headers)
+
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+
+                if not reused:
+                    raise
+
+                # The server closed an idle connection; retry once on a fresh one
+                connection, reused = self._new_connection(host_key), False
+                response = self._send(connection, path, request_headers)
+
+            body = response.read()
+
+        except Exception:
+            connection.close()
+            self._metrics.observe_request(url, start, None, 0)
+            raise
+
+        self._metrics.observe_request(url, start, response.status, len(body))
+        response_headers = {name.title(): value for name, value in response.getheaders()}
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(host_key, connection)
+
+        if response_headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        return response.status, response_headers, body
+
+
+    def close(self) -> None:
+        with self._lock:
+            idle_connections, self._idle_connections = self._idle_connections, {}
+
+        for connections in idle_connections.values():
+            for connection in connections:
+                connection.close()
+
+
+    def _request_with_retries(self, url: str, headers: dict = None,
+                              key_pool: ApiKeyPool = None) -> (int, dict, bytes):
+        '''
+        This function sends a request and retries it after a connection error, a
+        5xx or a throttling response, halving the request rate after throttling.
+        It returns the last response, or raises QuotaExceededError, without
+        sending anything if the circuit breaker is open, once the daily quota has
+        run out. With a key pool, a key that runs out of quota is taken out of
+        rotation and the request is sent again at once with another key; the
+        error is only raised once every key has run out.
+        '''
+        attempt = 0
+
+        while True:
+            if key_pool != None:
+                api_key = key_pool.take_key(url)
+                request_url = url + ('&' if '?' in url else '?') + urllib.parse.urlencode({'key': api_key})
+            else:
+                self._circuit_breaker.check(url)
+                request_url = url
+
+            if self._rate_limiter != None:
+                self._rate_limiter.acquire()
+
+            try:
+                status, response_headers, body = self.request(request_url, headers)
+
+            except (OSError, http.client.HTTPException):
+                if attempt + 1 >= self._retry_policy.max_attempts:
+                    raise
+
+                wait = self._retry_policy.delay(attempt)
+
+            else:
+                outcome = classify_response(status, body)
+
+                if outcome == 'ok':
+                    if self._rate_limiter != None:
+                        self._rate_limiter.speed_up()
+
+                    return status, response_headers, body
+
+                if outcome == 'quota' and key_pool != None:
+                    key_pool.mark_exhausted(api_key)
+                    continue
+
+                if outcome == 'quota':
+                    self._circuit_breaker.trip()
+                    raise QuotaExceededError(url, response_headers, body)
+
+                if outcome == 'fail' or attempt + 1 >= self._retry_policy.max_attempts:
+                    return status, response_headers, body
+
+                if outcome == 'throttled' and self._rate_limiter != None:
+                    self._rate_limiter.slow_down()
+
+                wait = self._retry_policy.delay(attempt, retry_after(response_headers))
+
+            self._metrics.observe_retry(url)
+            time.sleep(wait)
+            attempt += 1
+
+
+    def _parse_response(self, url: str, status: int, headers: dict, body: bytes) -> dict:
+        if status != 200:
+            raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ''), headers, io.BytesIO(body))
+
+        start = self._metrics.start()
+        data = json.loads(body)
+        self._metrics.observe_parse(url, start)
+
+        return data
+
+
+    def _send(self, connection: http.client.HTTPConnection, path: str, headers: dict) -> http.client.HTTPResponse:
+        connection.request('GET', path, headers = headers)
+        return connection.getresponse()
+
+
+    def _acquire_connection(self, host_key: (str, str)) -> (http.client.HTTPConnection, bool):
+        with self._lock:
+            connections = self._idle_connections.get(host_key)
+
+            if connections:
+                return connections.pop(), True
+
+        return self._new_connection(host_key), False
+
+
+    def _release_connection(self, host_key: (str, str), connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            connections = self._idle_connections.setdefault(host_key, [])
+
+            if len(connections) < self._max_idle_connections:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+
+    def _new_connection(self, host_key: (str, str)) -> http.client.HTTPConnection:
+        scheme, netloc = host_key
+
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout = self._timeout)
+
+        return http.client.HTTPConnection(netloc, timeout = self._timeout)
+
+
+_default_client = YouTubeClient(rate_limiter = TokenBucket())
+
+
+def default_client() -> YouTubeClient:
+    return _default_client
+
+
+def get_data(url: str) -> dict:
+    '''
+    This function takes a URL and returns a Python dictionary representing the
+    parsed JSON response, using the client shared by the whole program.
+    '''
+    return _default_client.get_data(url)
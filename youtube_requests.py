@@ -0,0 +1,95 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# youtube_requests.py
+
+
+import urllib.parse
+from channel_table import CHANNEL_ITEM_FIELDS, VIDEO_ITEM_FIELDS
+from youtube_client import BASE_YOUTUBE_URL
+
+
+# Each function below returns the endpoint and query parameters of one API
+# request, without the API key. Unless a fields selector is passed in, the
+# request only asks for the parts and fields the program reads.
+
+
+def fields_selector(item_fields: dict, extra_fields: [str] = ('id',)) -> str:
+    '''
+    This function builds a fields selector, such as
+    "items(id,snippet(title))", from a dictionary mapping each part to the
+    names of the fields read from it.
+    '''
+    selected_fields = list(extra_fields)
+
+    for part, names in item_fields.items():
+        selected_fields.append(part + '(' + ','.join(names) + ')')
+
+    return 'items(' + ','.join(selected_fields) + ')'
+
+
+def channels_request(channel_ids: [str], fields: str = None) -> (str, [(str, str)]):
+    query_parameters = [('part', ','.join(CHANNEL_ITEM_FIELDS)), ('id', ','.join(channel_ids)),
+                        ('fields', fields or fields_selector(CHANNEL_ITEM_FIELDS))]
+
+    return 'channels', query_parameters
+
+
+def channel_by_username_request(username: str) -> (str, [(str, str)]):
+    return 'channels', [('part', 'id'), ('forUsername', username), ('fields', 'items(id)')]
+
+
+def channel_by_handle_request(handle: str) -> (str, [(str, str)]):
+    return 'channels', [('part', 'id'), ('forHandle', handle), ('fields', 'items(id)')]
+
+
+def channel_search_request(query: str) -> (str, [(str, str)]):
+    query_parameters = [('part', 'id'), ('q', query), ('type', 'channel'), ('maxResults', 1),
+                        ('fields', 'items(id(channelId))')]
+
+    return 'search', query_parameters
+
+
+def videos_request(video_ids: [str], fields: str = None) -> (str, [(str, str)]):
+    query_parameters = [('part', ','.join(VIDEO_ITEM_FIELDS)), ('id', ','.join(video_ids)),
+                        ('fields', fields or fields_selector(VIDEO_ITEM_FIELDS))]
+
+    return 'videos', query_parameters
+
+
+def video_views_request(video_ids: [str], fields: str = None) -> (str, [(str, str)]):
+    query_parameters = [('part', 'statistics'), ('id', ','.join(video_ids)),
+                        ('fields', fields or fields_selector({'statistics': ['viewCount']}))]
+
+    return 'videos', query_parameters
+
+
+def most_popular_vid_search_request(channel_id: str, max_results: int = 1,
+                                    fields: str = None) -> (str, [(str, str)]):
+    query_parameters = [('part', 'id'), ('channelId', channel_id), ('order', 'viewCount'),
+                        ('type', 'video'), ('maxResults', max_results), ('safeSearch', 'none'),
+                        ('fields', fields or 'items(id(videoId))')]
+
+    return 'search', query_parameters
+
+
+def playlist_videos_request(playlist_id: str, page_token: str = None, max_results: int = 50,
+                            fields: str = None) -> (str, [(str, str)]):
+    query_parameters = [('part', 'contentDetails'), ('playlistId', playlist_id), ('maxResults', max_results),
+                        ('fields', fields or 'nextPageToken,items(contentDetails(videoId))')]
+
+    if page_token != None:
+        query_parameters.append(('pageToken', page_token))
+
+    return 'playlistItems', query_parameters
+
+
+def build_url(endpoint: str, query_parameters: [(str, str)], api_key: str = None,
+              base_url: str = BASE_YOUTUBE_URL) -> str:
+    '''
+    This function builds the URL of a request, leaving out the key if api_key is
+    None so that a YouTubeClient can add one from an ApiKeyPool.
+    '''
+    if api_key != None:
+        query_parameters = query_parameters + [('key', api_key)]
+
+    return base_url + '/' + endpoint + '?' + urllib.parse.urlencode(query_parameters)
@@ -1,11 +1,10 @@
 # Author: Douglas Hong
-# Version: 12/23/2020
+# Version: 10/18/2026
 # youtube_stats.py
 
 
-import json
-import urllib.parse
-import urllib.request
+import youtube_client
+import youtube_requests
 from channel import Channel
 from datetime import datetime
 
@@ -82,30 +81,19 @@ def add_channel(api_key: str, channel_list: [str]) -> None:
 
 def delete_channel(channel_list: [str]) -> None:
     channel = input('Enter the name of the channel to delete: ').strip()
-
-    for i in range(len(channel_list)):
-        if channel_list[i].name().casefold() == channel.casefold():
-            del channel_list[i]
+    channel_list[:] = [ch for ch in channel_list if ch.name().casefold() != channel.casefold()]
 
 
 def build_channel_data_url(api_key: str, channel_id: str) -> str:
-    query_parameters = [('part', 'statistics, snippet'), ('id', channel_id), ('key', api_key)]
-
-    return BASE_YOUTUBE_URL + '/channels?' + urllib.parse.urlencode(query_parameters)
+    return youtube_requests.build_url(*youtube_requests.channels_request([channel_id]), api_key)
 
 
 def build_most_popular_vid_url(api_key: str, channel_id: str) -> str:
-    query_parameters = [('part', 'snippet'), ('channelId', channel_id), ('key', api_key),
-                        ('order', 'viewCount'), ('type', 'video'), ('maxResults', 10),
-                        ('safeSearch', 'none')]
-
-    return BASE_YOUTUBE_URL + '/search?' + urllib.parse.urlencode(query_parameters)
+    return youtube_requests.build_url(*youtube_requests.most_popular_vid_search_request(channel_id), api_key)
 
 
 def build_most_popular_vid_data(api_key: str, video_id: str) -> str:
-    query_parameters = [('part', 'statistics,snippet'), ('id', video_id), ('key', api_key)]
-
-    return BASE_YOUTUBE_URL + '/videos?' + urllib.parse.urlencode(query_parameters)
+    return youtube_requests.build_url(*youtube_requests.videos_request([video_id]), api_key)
                         
 
 def get_data(url: str) -> dict:
@@ -113,17 +101,7 @@ def get_data(url: str) -> dict:
     This function takes a URL and returns a Python dictionary representing the
     parsed JSON response.
     '''
-    response = None
-
-    try:
-        request = urllib.request.Request(url)
-        response = urllib.request.urlopen(request)
-        json_text = response.read().decode(encoding = 'utf-8')
-        return json.loads(json_text)
-
-    finally:
-        if response != None:
-            response.close()
+    return youtube_client.get_data(url)
 
 
 def print_channel_names(channel_list: [Channel]) -> None:
@@ -0,0 +1,201 @@
+# Author: Douglas Hong
+# Version: 10/18/2026
+# youtube_stats_batch.py
+
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+import urllib.error
+from typing import Iterator, TextIO
+from api_key_pool import ApiKeyPool, read_api_keys
+from channel import Channel
+from ingestion_queue import IngestionQueue
+from youtube_channels import DEFAULT_MAX_WORKERS, MAX_IDS_PER_REQUEST, YouTubeChannels
+from rate_limiter import DEFAULT_BURST, DEFAULT_RATE, TokenBucket
+from youtube_client import BASE_YOUTUBE_URL, YouTubeClient
+
+
+CHANNEL_COLUMNS = ['channel_id', 'name', 'creation_date', 'subscriber_count', 'view_count', 'video_count']
+VIDEO_COLUMNS = ['most_popular_vid_title', 'most_popular_vid_date', 'most_popular_vid_views',
+                 'most_popular_vid_likes', 'most_popular_vid_dislikes', 'most_popular_vid_comments']
+
+
+def run() -> None:
+    arguments = parse_arguments()
+    key_pool = ApiKeyPool(read_api_keys(arguments.api_key_file))
+    client = YouTubeClient(rate_limiter = TokenBucket(arguments.rate, arguments.burst))
+    channels = YouTubeChannels(key_pool, max_workers = arguments.workers, client = client,
+                               base_url = arguments.base_url)
+    columns = CHANNEL_COLUMNS + (VIDEO_COLUMNS if arguments.videos else [])
+
+    queue = IngestionQueue(arguments.journal) if arguments.journal != None else None
+
+    # A resumed run adds to the output of the runs before it
+    resuming = queue != None and sum(queue.counts().values()) > 0
+
+    input_file = sys.stdin if arguments.input == '-' else open(arguments.input, encoding = 'utf-8')
+    output_file = sys.stdout if arguments.output == '-' else open(arguments.output, 'a' if resuming else 'w',
+                                                                   newline = '', encoding = 'utf-8')
+    write_row = make_row_writer(output_file, arguments.format, columns, write_header = not resuming)
+
+    chunk_size = MAX_IDS_PER_REQUEST * arguments.workers
+    written_count = 0
+    failed_count = 0
+    start = time.perf_counter()
+
+    def write_channels(channel_list: [Channel]) -> None:
+        nonlocal written_count
+
+        # Channels are removed once written, so memory does not grow with the input
+        for channel in channel_list:
+            write_row(channel_row(channel, columns))
+            channels.delete_channel_by_id(channel.channel_id())
+            written_count += 1
+
+        output_file.flush()
+
+    try:
+        for channel_urls in chunks(read_channel_urls(input_file), chunk_size):
+            channel_ids = []
+            resolved_urls = []
+
+            # Channels already in the journal were resolved by an earlier run
+            if queue != None:
+                known_urls = queue.known_sources(channel_urls)
+                channel_urls = [channel_url for channel_url in channel_urls if channel_url not in known_urls]
+
+            for channel_url in channel_urls:
+                channel_id = resolve_channel_id(channels, channel_url)
+
+                if channel_id == None:
+                    print('Could not resolve ' + channel_url, file = sys.stderr)
+                    failed_count += 1
+                else:
+                    channel_ids.append(channel_id)
+                    resolved_urls.append(channel_url)
+
+            if queue != None:
+                queue.enqueue(channel_ids, resolved_urls)
+                failed_ids = channels.ingest(queue, videos = arguments.videos, on_done = write_channels)
+            else:
+                failed_ids = channels.add_channels(channel_ids)
+
+            for channel_id in failed_ids:
+                print('Could not find channel ' + channel_id, file = sys.stderr)
+                failed_count += 1
+
+            if queue == None:
+                if arguments.videos:
+                    channels.load_most_popular_vids(channels.channel_list())
+
+                write_channels(channels.channel_list())
+
+            report_progress(written_count, failed_count, time.perf_counter() - start)
+
+            if key_pool.is_exhausted():
+                print('The daily quota of every API key has run out; stopping', file = sys.stderr)
+                break
+
+        if queue != None and queue.unfinished_count() > 0:
+            print(str(queue.unfinished_count()) + ' channels in the journal are unfinished or held by other runs; ' +
+                  'run again with the same journal to resume', file = sys.stderr)
+
+    finally:
+        if input_file != sys.stdin:
+            input_file.close()
+
+        if output_file != sys.stdout:
+            output_file.close()
+
+        if queue != None:
+            queue.close()
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = 'Write the statistics of many YouTube channels as CSV or JSON lines.')
+    parser.add_argument('input', nargs = '?', default = '-',
+                        help = 'file with one channel URL, ID or @handle per line (default: standard input)')
+    parser.add_argument('--api-key-file', required = True,
+                        help = 'text file with one or more API keys, one per line; requests are spread over them')
+    parser.add_argument('--output', default = '-', help = 'file to write to (default: standard output)')
+    parser.add_argument('--format', choices = ['csv', 'jsonl'], default = 'csv')
+    parser.add_argument('--workers', type = int, default = DEFAULT_MAX_WORKERS,
+                        help = 'number of concurrent requests')
+    parser.add_argument('--rate', type = float, default = DEFAULT_RATE,
+                        help = 'most requests per second to send on average (default: %(default)s)')
+    parser.add_argument('--burst', type = int, default = DEFAULT_BURST,
+                        help = 'most requests to send at once after a pause (default: %(default)s)')
+    parser.add_argument('--base-url', default = BASE_YOUTUBE_URL,
+                        help = 'YouTube Data API URL to send requests to (default: %(default)s)')
+    parser.add_argument('--videos', action = 'store_true',
+                        help = 'also write the statistics of each channel\'s most popular video')
+    parser.add_argument('--journal',
+                        help = 'SQLite file journaling the progress of every channel, so an interrupted run resumes '
+                               'where it stopped when run again with the same journal; several processes may share '
+                               'one journal, each writing its own output')
+
+    return parser.parse_args()
+
+
+def read_channel_urls(input_file: TextIO) -> Iterator[str]:
+    for line in input_file:
+        line = line.strip()
+
+        if line != '' and not line.startswith('#'):
+            yield line
+
+
+def chunks(items: Iterator[str], chunk_size: int) -> Iterator[list]:
+    items = iter(items)
+
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def resolve_channel_id(channels: YouTubeChannels, channel_url: str) -> str:
+    try:
+        return channels.resolve_channel_id(channel_url)
+    except urllib.error.HTTPError:
+        return None
+
+
+def make_row_writer(output_file: TextIO, output_format: str, columns: [str], write_header: bool = True) -> callable:
+    if output_format == 'jsonl':
+        return lambda row: output_file.write(json.dumps(dict(zip(columns, row))) + '\n')
+
+    writer = csv.writer(output_file)
+
+    if write_header:
+        writer.writerow(columns)
+
+    return writer.writerow
+
+
+def channel_row(channel: Channel, columns: [str]) -> list:
+    '''
+    This function returns the channel's value for each column, leaving the video
+    columns empty if its most popular video could not be found.
+    '''
+    has_most_popular_vid = channel.has_most_popular_vid()
+
+    return [getattr(channel, column)() if has_most_popular_vid or column not in VIDEO_COLUMNS else None
+            for column in columns]
+
+
+def report_progress(written_count: int, failed_count: int, elapsed: float) -> None:
+    print(str(written_count) + ' channels written, ' + str(failed_count) + ' failed, ' +
+          format(written_count / elapsed if elapsed > 0 else 0, '.1f') + ' channels/s',
+          file = sys.stderr)
+
+
+if __name__ == '__main__':
+    run()
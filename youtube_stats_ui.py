@@ -1,9 +1,20 @@
 # Author: Douglas Hong
-# Version: 12/23/2020
+# Version: 10/18/2026
 # youtube_stats_ui.py
 
 
-from youtube_channels import YouTubeChannels
+from api_key_pool import ApiKeyPool, mask_api_key, read_api_keys
+from channel_list_renderer import ChannelListRenderer
+from channel_store import ChannelStore
+from metrics import DURATION_BUCKETS, Metrics
+from rate_limiter import QuotaExceededError, TokenBucket
+from response_cache import ResponseCache
+from channel import Channel
+from youtube_channels import AmbiguousChannelNameError, YouTubeChannels
+from youtube_client import YouTubeClient
+
+
+REFRESH_AFTER = 60 * 60
 
 
 class YouTubeChannelsStats:
@@ -15,7 +26,10 @@ class YouTubeChannelsStats:
         # Google Maps API?
         # Upload to GitHub
         #
-        self._channels = YouTubeChannels(self._get_api_key())
+        client = YouTubeClient(cache = ResponseCache(), metrics = Metrics(enabled = True), rate_limiter = TokenBucket())
+        self._channels = YouTubeChannels(self._get_api_keys(), client = client, store = ChannelStore())
+        self._renderer = ChannelListRenderer()
+        self._first_row = 0
 
 
     def run(self):
@@ -39,6 +53,18 @@ class YouTubeChannelsStats:
                 self._print_channel_list_stats()
 
             elif command == '6':
+                self._refresh_channel_list()
+
+            elif command == '7':
+                self._print_metrics()
+
+            elif command == '8':
+                self._choose_rows()
+
+            elif command == '9':
+                self._print_top_vid_stats()
+
+            elif command == '10':
                 break
 
             else:
@@ -50,61 +76,156 @@ class YouTubeChannelsStats:
 
     def _add_channel(self) -> None:
         channel_url = input("Enter the YouTube channel's URL: ").strip()
-        channel_id = channel_url[channel_url.rfind('/') + 1:]
-        self._channels.add_channel(channel_id)
+
+        try:
+            channel_id = self._channels.resolve_channel_id(channel_url)
+
+            if channel_id == None:
+                print('No channel was found at ' + channel_url)
+                return
+
+            self._channels.add_channel(channel_id)
+
+        except QuotaExceededError:
+            print('The daily quota of every API key has run out; it resets at midnight Pacific Time')
 
 
     def _delete_channel(self) -> None:
         channel_name = input('Enter the name of the channel to delete: ').strip()
-        self._channels.delete_channel(channel_name)
+        channel = self._find_channel(channel_name)
+
+        if channel != None:
+            self._channels.delete_channel_by_id(channel.channel_id())
+
+
+    def _refresh_channel_list(self) -> None:
+        for channel_id in self._channels.refresh(stale_after = REFRESH_AFTER):
+            print('Channel ' + channel_id + ' could not be refreshed')
 
 
     def _print_channel_stats(self) -> None:
         channel_name = input('Enter the name of the channel: ').strip()
-        
-        for channel in self._channels.channel_list():
-            if channel.name().casefold() == channel_name.casefold():
-                print()
-                print('Channel name: ' + channel.name())
-                print('Creation date: ' + channel.creation_date())
-                print('Subscriber count:', channel.subscriber_count())
-                print('View count:', channel.view_count())
-                print('Video count:', channel.video_count())
-                print('Average views per video:', channel.average_views_per_video())
-                print()
-                print('Most popular video title: ' + channel.most_popular_vid_title())
-                print('Most popular video publish date: ' + channel.most_popular_vid_date())
-                print('Most popular video view count:', channel.most_popular_vid_views())
-                print('Most popular video likes/dislikes:', channel.most_popular_vid_likes(),
-                      '/', channel.most_popular_vid_dislikes(),
-                      '(' + str(channel.most_popular_vid_likes_ratio()) + '% likes)')
-                print('Most popular video comment count:', channel.most_popular_vid_comments())
-                break
+        channel = self._find_channel(channel_name)
+
+        if channel == None:
+            return
+
+        if not channel.has_most_popular_vid() and not channel.most_popular_vid_not_found():
+            self._channels.load_most_popular_vids([channel])
+
+        print()
+        print('Channel name: ' + channel.name())
+        print('Creation date: ' + channel.creation_date())
+        print('Subscriber count:', channel.subscriber_count())
+        print('View count:', channel.view_count())
+        print('Video count:', channel.video_count())
+        print('Average views per video:', channel.average_views_per_video())
+        print()
+
+        if not channel.has_most_popular_vid():
+            print('The most popular video of this channel could not be found')
+            return
+
+        print('Most popular video title: ' + channel.most_popular_vid_title())
+        print('Most popular video publish date: ' + channel.most_popular_vid_date())
+        print('Most popular video view count:', channel.most_popular_vid_views())
+        print('Most popular video likes/dislikes:', channel.most_popular_vid_likes(),
+              '/', channel.most_popular_vid_dislikes(),
+              '(' + str(channel.most_popular_vid_likes_ratio()) + '% likes)')
+        print('Most popular video comment count:', channel.most_popular_vid_comments())
+        print()
+
+        if channel.has_top_vids():
+            self._print_top_vids(channel)
+
+
+    def _print_top_vid_stats(self) -> None:
+        '''
+        This function prints the statistics of one channel's most viewed videos,
+        looking them up first if they were never looked up. The lookup costs a
+        search, so it is kept apart from the channel's other statistics.
+        '''
+        channel_name = input('Enter the name of the channel: ').strip()
+        channel = self._find_channel(channel_name)
+
+        if channel == None:
+            return
+
+        if not channel.has_top_vids():
+            self._channels.load_top_vids([channel])
+
+        print()
+
+        # The lookup can fail, for example when the quota runs out
+        if not channel.has_top_vids():
+            print('The top videos of this channel are unavailable')
+            return
+
+        self._print_top_vids(channel)
+
+
+    def _print_top_vids(self, channel: Channel) -> None:
+        print('Top', len(channel.top_vid_ids()), 'videos median view count:', channel.top_vids_median_views())
+        print('Top videos like ratio spread:', channel.top_vids_like_ratio_spread(), 'percentage points')
+        print('Top videos comments per 1000 views:', round(channel.top_vids_comments_per_view() * 1000, 2))
+
+
+    def _find_channel(self, channel_name: str) -> Channel:
+        '''
+        This function returns the channel with the given name, asking the user for
+        the channel's ID if several channels share that name. It returns None if no
+        channel matches.
+        '''
+        try:
+            channel = self._channels.find_channel(channel_name)
+
+        except AmbiguousChannelNameError as error:
+            print()
+            print('There is more than one channel named ' + channel_name + ':')
+
+            for match in error.channels:
+                print(match.channel_id() + ' (' + str(match.subscriber_count()) + ' subscribers)')
+
+            channel = self._channels.get_channel(input('Enter the ID of the channel: ').strip())
+
+        if channel == None:
+            print(channel_name + ' is not in your channel list')
+
+        return channel
 
 
     def _print_channel_list_stats(self) -> None:
-        channel_list = self._channels.channel_list()
+        aggregates = self._channels.aggregates()
 
-        subscriber_sum = sum([ch.subscriber_count() for ch in channel_list])
-        view_count_sum = sum([ch.view_count() for ch in channel_list])
-        creation_date_sort = sorted(channel_list, key = lambda ch: ch.creation_date())
-        like_ratio_sort = sorted(channel_list, key = lambda ch: ch.most_popular_vid_likes_ratio())
+        if aggregates.count('subscribers') == 0:
+            print()
+            print('Your channel list is empty')
+            return
+
+        self._channels.load_most_popular_vids(self._channels.channels_without_most_popular_vid())
 
         print()
-        print('Mean subscribers:', int(subscriber_sum / len(channel_list)))
-        print('Mean view count:', int(view_count_sum / len(channel_list)))
-        print('Total subscribers:', subscriber_sum)
-        print('Total view count:', view_count_sum)
-        print('Oldest channel:', creation_date_sort[0].name())
-        print('Newest channel:', creation_date_sort[-1].name())
+        print('Mean subscribers:', int(aggregates.mean('subscribers')))
+        print('Mean view count:', int(aggregates.mean('views')))
+        print('Total subscribers:', aggregates.total('subscribers'))
+        print('Total view count:', aggregates.total('views'))
+        print('Oldest channel:', self._channels.get_channel(aggregates.argmin('creation_date')).name())
+        print('Newest channel:', self._channels.get_channel(aggregates.argmax('creation_date')).name())
+
+        if aggregates.count('video_views') == 0:
+            return
+
+        highest_like_ratio = self._channels.get_channel(aggregates.argmax('like_ratio'))
+        lowest_like_ratio = self._channels.get_channel(aggregates.argmin('like_ratio'))
+
         print('Most popular video:',
-              sorted(channel_list, key = lambda ch: ch.most_popular_vid_views())[-1].most_popular_vid_title())
-        print('Highest like ratio (based on most popular video):', like_ratio_sort[-1].name(),
-              '(' + str(like_ratio_sort[-1].most_popular_vid_likes_ratio()) + '% likes)')
-        print('Lowest like ratio (based on most popular video):', like_ratio_sort[0].name(),
-              '(' + str(like_ratio_sort[0].most_popular_vid_likes_ratio()) + '% likes)')
+              self._channels.get_channel(aggregates.argmax('video_views')).most_popular_vid_title())
+        print('Highest like ratio (based on most popular video):', highest_like_ratio.name(),
+              '(' + str(aggregates.max_value('like_ratio')) + '% likes)')
+        print('Lowest like ratio (based on most popular video):', lowest_like_ratio.name(),
+              '(' + str(aggregates.min_value('like_ratio')) + '% likes)')
         print('Most commented video (based on most popular video):',
-              sorted(channel_list, key = lambda ch: ch.most_popular_vid_comments())[-1].most_popular_vid_title())
+              self._channels.get_channel(aggregates.argmax('comments')).most_popular_vid_title())
         
 
 
@@ -127,44 +248,115 @@ class YouTubeChannelsStats:
         elif command != '7': print('Invalid command')
 
 
-    def _print_channel_names(self) -> None:
-        channel_list = self._channels.channel_list()
-        
+    def _print_metrics(self) -> None:
+        '''
+        This function prints the requests sent to each endpoint and the time spent
+        in each stage since the program started, then offers to save every metric
+        as JSON or in the Prometheus text format.
+        '''
+        metrics = self._channels.metrics()
+        snapshot = metrics.snapshot()
+
         print()
-        print('Your current channel list: ')
+        print('  Endpoint     | Requests | Errors | Retries | Cache hits |    KB    | Quota | p50 ms | p95 ms | Parse ms |')
+        print('---------------|----------|--------|---------|------------|----------|-------|--------|--------|----------|')
+
+        for endpoint, endpoint_metrics in sorted(snapshot['endpoints'].items()):
+            latency = endpoint_metrics['latency']
+            parse = endpoint_metrics['parse']
+
+            print(endpoint.ljust(14), '|', str(endpoint_metrics['requests']).rjust(8), '|',
+                  str(endpoint_metrics['errors']).rjust(6), '|', str(endpoint_metrics['retries']).rjust(7), '|',
+                  str(endpoint_metrics['cache_hits']).rjust(10), '|',
+                  format(endpoint_metrics['response_bytes'] / 1024, '.1f').rjust(8), '|',
+                  str(endpoint_metrics['quota_units']).rjust(5), '|', self._format_bound(latency['p50']).rjust(6), '|',
+                  self._format_bound(latency['p95']).rjust(6), '|',
+                  format(parse['sum'] / parse['count'] * 1000 if parse['count'] > 0 else 0, '.2f').rjust(8), '|')
+
         print()
+        print('  Stage                  |  Count  | Mean ms | p95 ms |')
+        print('-------------------------|---------|---------|--------|')
 
-        print(' No. |          Name          |  Subscribers  |  Total Views  |')
-        print('-----|------------------------|---------------|---------------|')
-        
-        for i in range(len(channel_list)):
-            name = channel_list[i].name()
-            subscribers = str(channel_list[i].subscriber_count())
-            views = str(channel_list[i].view_count())
-
-            print(str(i + 1) + (' ' * (len(' No. ') - len(str(i + 1)))), end = '|')
-            print(name + (' ' * (len('          Name          ') - len(name))), end = '|')
-            print(subscribers + (' ' * (len('  Subscribers  ') - len(subscribers))), end = '|')
-            print(views + (' ' * (len('  Total Views  ') - len(views))), end = '|\n')
-
-            if i == len(channel_list) - 1:
-                print('---------------------------------------------------------------')
-            else:
-                print('-----|------------------------|---------------|---------------|')
+        for stage, histogram in sorted(snapshot['stages'].items()):
+            print(stage.ljust(24), '|', str(histogram['count']).rjust(7), '|',
+                  format(histogram['sum'] / histogram['count'] * 1000, '.2f').rjust(7), '|',
+                  self._format_bound(histogram['p95']).rjust(6), '|')
+
+        print()
+        print('  API key  | Quota used today | In rotation |')
+        print('-----------|------------------|-------------|')
+
+        for api_key, spent, is_available in self._channels.key_pool().usage():
+            print(mask_api_key(api_key).ljust(10), '|', str(spent).rjust(16), '|',
+                  ('yes' if is_available else 'no').rjust(11), '|')
+
+        print()
+        file_path = input('Enter a .json or .prom file to save the metrics to, or press Enter to skip: ').strip()
+
+        if file_path == '':
+            return
+
+        try:
+            with open(file_path, 'w', encoding = 'utf-8') as metrics_file:
+                metrics_file.write(metrics.to_prometheus() if file_path.endswith('.prom') else metrics.to_json())
+
+        except OSError:
+            print('The metrics could not be saved to ' + file_path)
+
+
+    def _format_bound(self, bound: object) -> str:
+        '''
+        This function formats a histogram bucket bound, in seconds, as milliseconds.
+        '''
+        if bound == None:
+            return '-'
 
+        if bound == '+Inf':
+            return '>' + format(DURATION_BUCKETS[-1] * 1000, 'g')
 
-    def _get_api_key(self) -> str:
+        return format(bound * 1000, 'g')
+
+
+    def _choose_rows(self) -> None:
+        channel_count = self._channels.channel_count()
+        first_row = input('Enter the number of the first row to show (1-' + str(channel_count) + '): ').strip()
+
+        if not first_row.isdigit() or not 1 <= int(first_row) <= max(channel_count, 1):
+            print('That is an invalid row number')
+            return
+
+        self._first_row = int(first_row) - 1
+
+
+    def _print_channel_names(self) -> None:
+        '''
+        This function shows the current page of the channel list, unless the
+        same page was drawn last time and nothing in the list has changed since.
+        '''
+        start = self._channels.metrics().start()
+        channel_count = self._channels.channel_count()
+
+        # Deleting channels can leave the page past the end of the list
+        if self._first_row >= channel_count:
+            self._first_row = max(channel_count - self._renderer.page_size, 0)
+
+        self._renderer.draw(self._channels, self._first_row)
+        self._channels.metrics().observe_stage('render', start)
+
+
+    def _get_api_keys(self) -> ApiKeyPool:
+        '''
+        This function reads the API keys, one per line, from a text file the user
+        names, asking again until one has at least one key.
+        '''
         while True:
-            file_path = input('Enter the path to the text file with your API key: ').strip()
+            file_path = input('Enter the path to the text file with your API keys, one per line: ').strip()
 
             try:
-                api_key = open(file_path).readline().rstrip('\n')
+                return ApiKeyPool(read_api_keys(file_path))
 
             except (ValueError, OSError):
-                print('That is an invalid API key')
-
-            else:
-                return api_key
+                print('That is an invalid API key file')
 
 
     def _print_commands(self) -> None:
@@ -178,7 +370,11 @@ class YouTubeChannelsStats:
         print('3: Sort my channel list')
         print('4: Remove channel from my channel list')
         print('5: Review the statistics of my whole channel list')
-        print('6: QUIT PROGRAM')
+        print('6: Refresh channels not updated in the last hour')
+        print('7: Review request and timing metrics')
+        print('8: Show other rows of my channel list')
+        print('9: Review the top videos of one channel in my channel list')
+        print('10: QUIT PROGRAM')
         print()
 
 